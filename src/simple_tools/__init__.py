@@ -1,38 +1,55 @@
 """simple-tools - 一个简单实用的Python工具集.
 
 专注解决日常工作中的实际问题，不追求架构完美，只追求功能实用。
+
+导入本包不会配置Logfire，只有命令行入口 simple_tools.cli.main 会自动配置。
+作为库使用或直接调用 cli 命令组（如用 CliRunner）时，请先自行调用
+logfire.configure()，或设置环境变量 LOGFIRE_IGNORE_NO_CONFIG=1 关闭未配置警告。
 """
 
 import os
 import sys
 
-import logfire
-
-# 初始化Logfire监控系统
-
-# 检查是否在格式化输出模式
-is_formatted_output = False
-if "--format" in sys.argv:
-    format_index = sys.argv.index("--format")
-    if format_index + 1 < len(sys.argv):
-        format_type = sys.argv[format_index + 1]
-        if format_type in ["json", "csv"]:
-            is_formatted_output = True
-
-# 检查环境变量
-if os.environ.get("LOGFIRE_CONSOLE", "").lower() == "false":
-    is_formatted_output = True
-
-# 配置 Logfire
-if is_formatted_output:
-    # 格式化输出时，禁用控制台日志
-    logfire.configure(
-        service_name="simple-tools",
-        console=False,  # 禁用控制台输出
-        send_to_logfire=False,  # 也禁用发送，避免重试日志
-    )
-else:
-    # 正常模式
-    logfire.configure(service_name="simple-tools")
-
 __version__ = "0.1.0"
+
+_logfire_configured = False
+
+
+def _is_formatted_output(argv: list[str]) -> bool:
+    """检查是否在格式化输出模式（json/csv输出时不能混入控制台日志）."""
+    # 检查环境变量
+    if os.environ.get("LOGFIRE_CONSOLE", "").lower() == "false":
+        return True
+
+    # 检查命令行参数，单次遍历相邻参数对
+    for arg, value in zip(argv, argv[1:]):
+        if arg == "--format":
+            return value in ("json", "csv")
+    return False
+
+
+def _ensure_logfire_configured() -> None:
+    """按需初始化Logfire监控系统.
+
+    只由CLI入口调用，导入simple_tools本身不会产生配置副作用。
+    不在cli命令组回调中配置：CliRunner调用时控制台日志会写入被捕获的输出。
+    """
+    global _logfire_configured
+    if _logfire_configured:
+        return
+
+    import logfire
+
+    if _is_formatted_output(sys.argv):
+        # 格式化输出时，禁用控制台日志
+        logfire.configure(
+            service_name="simple-tools",
+            console=False,  # 禁用控制台输出
+            send_to_logfire=False,  # 也禁用发送，避免重试日志
+            inspect_arguments=False,  # 不解析调用方源码，降低每次记录的开销
+        )
+    else:
+        # 正常模式
+        logfire.configure(service_name="simple-tools", inspect_arguments=False)
+
+    _logfire_configured = True
@@ -4,68 +4,114 @@
 """
 
 import asyncio
+import contextlib
 import json
 import mimetypes
-import re
-from datetime import datetime
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional, cast
+from typing import Any, Optional, Union, cast
 
 import logfire
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
 
 from ..utils.errors import ToolError
 from .deepseek_client import DeepSeekClient
 from .prompts import PromptManager
 
 
-class FileInfo(BaseModel):
-    """文件信息模型."""
-
-    path: Path = Field(..., description="文件路径")
-    name: str = Field(..., description="文件名")
-    extension: str = Field(..., description="文件扩展名")
-    size: int = Field(..., description="文件大小（字节）")
-    size_human: str = Field(..., description="人类可读的文件大小")
-    modified_time: datetime = Field(..., description="修改时间")
-    mime_type: Optional[str] = Field(None, description="MIME类型")
-    content_preview: Optional[str] = Field(None, description="内容预览")
-
-    @field_validator("size_human", mode="before")
-    @classmethod
-    def format_size(cls, v: Any, info: Any) -> str:
-        """格式化文件大小为人类可读格式."""
-        if isinstance(v, str) and v:  # 如果已经是字符串且非空，直接返回
-            return v
-
-        # 从Pydantic v2的info.data中获取size
-        if hasattr(info, "data"):
-            size = info.data.get("size", 0)
-        else:
-            # 如果没有data属性，尝试从init参数中获取
-            return ""  # 返回空字符串，在__init__后处理
-
-        # 转换为浮点数以便计算
-        size = float(size)
-        for unit in ["B", "KB", "MB", "GB"]:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
-
-    def __init__(self, **data: Any) -> None:
-        """初始化FileInfo并确保size_human被正确设置."""
-        super().__init__(**data)
-        # 如果size_human为空，重新计算
+@lru_cache(maxsize=256)
+def _lower_ext(suffix: str) -> str:
+    """规范化扩展名为小写，扩展名种类有限，缓存并驻留结果避免重复分配."""
+    return sys.intern(suffix.lower())
+
+
+@lru_cache(maxsize=256)
+def _guess_mime_type_by_extension(extension: str) -> Optional[str]:
+    """按扩展名猜测MIME类型，扩展名种类有限，结果可以缓存."""
+    mime_type, _ = mimetypes.guess_type(f"file{extension}")
+    return mime_type
+
+
+def _guess_mime_type(file_path: Path, extension: str) -> Optional[str]:
+    """猜测文件的MIME类型，extension为已规范化的小写扩展名."""
+    if extension in mimetypes.encodings_map:
+        # .tar.gz等压缩后缀需要结合前一个后缀判断，不走缓存
+        mime_type, _ = mimetypes.guess_type(str(file_path))
+        return mime_type
+    return _guess_mime_type_by_extension(extension)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str, opener: str) -> Any:
+    """从文本中提取第一个以opener开头的完整JSON值，找不到时返回None.
+
+    使用raw_decode从候选位置直接解码，可以正确处理嵌套结构。
+    """
+    start = text.find(opener)
+    while start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, start)
+            return value
+        except json.JSONDecodeError:
+            start = text.find(opener, start + 1)
+    return None
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+def _format_size(size: int) -> str:
+    """格式化文件大小为人类可读格式."""
+    if size < 1024:
+        return f"{size:.1f} B"
+    # 单位序号即floor(log1024(size))，由整数位长直接得出，只需一次除法
+    unit = min((size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (unit * 10)):.1f} {_SIZE_UNITS[unit]}"
+
+
+def _format_mtime(timestamp: float) -> str:
+    """格式化修改时间，仅在生成prompt时调用."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def _coerce_confidence(value: Any) -> int:
+    """把AI返回的置信度转换为0-100的整数.
+
+    接受整数、小数和数字字符串（如 "85"、"85%"），无法转换时抛出ValueError。
+    """
+    if not value:
+        return 0
+    if isinstance(value, str):
+        value = value.strip().rstrip("%")
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"无效的置信度: {value!r}")
+    return max(0, min(100, round(float(value))))
+
+
+@dataclass(slots=True, frozen=True)
+class FileInfo:
+    """文件信息（仅在分类流程内部使用，不做Pydantic校验）."""
+
+    path: Path  # 文件路径
+    name: str  # 文件名
+    extension: str  # 文件扩展名
+    size: int  # 文件大小（字节）
+    size_human: str  # 人类可读的文件大小，传入空字符串时自动计算
+    modified_time: float  # 修改时间（时间戳），需要时再格式化
+    mime_type: Optional[str] = None  # MIME类型
+    content_preview: Optional[str] = None  # 内容预览
+
+    def __post_init__(self) -> None:
+        """确保size_human被正确设置."""
         if not self.size_human:
-            size = float(self.size)
-            for unit in ["B", "KB", "MB", "GB"]:
-                if size < 1024.0:
-                    self.size_human = f"{size:.1f} {unit}"
-                    break
-                size /= 1024.0
-            else:
-                self.size_human = f"{size:.1f} TB"
+            object.__setattr__(self, "size_human", _format_size(self.size))
 
 
 class ClassificationResult(BaseModel):
@@ -95,34 +141,43 @@ class FileClassifier:
 
     # 支持内容提取的文本文件扩展名
     TEXT_EXTENSIONS = {
-        ".txt",
-        ".md",
-        ".rst",
-        ".log",
-        ".csv",
-        ".json",
-        ".xml",
-        ".yaml",
-        ".yml",
-        ".ini",
-        ".cfg",
-        ".conf",
-        ".py",
-        ".js",
-        ".java",
-        ".c",
-        ".cpp",
-        ".h",
-        ".html",
-        ".css",
-        ".sh",
-        ".bat",
-        ".sql",
+        sys.intern(extension)
+        for extension in (
+            ".txt",
+            ".md",
+            ".rst",
+            ".log",
+            ".csv",
+            ".json",
+            ".xml",
+            ".yaml",
+            ".yml",
+            ".ini",
+            ".cfg",
+            ".conf",
+            ".py",
+            ".js",
+            ".java",
+            ".c",
+            ".cpp",
+            ".h",
+            ".html",
+            ".css",
+            ".sh",
+            ".bat",
+            ".sql",
+        )
     }
 
     # 最大内容预览长度
     MAX_PREVIEW_LENGTH = 500
 
+    # 批量分类时每次API请求包含的文件数
+    BATCH_CHUNK_SIZE = 10
+
+    # 同一扩展名连续得到相同高置信度分类的次数达到该值后，直接按扩展名分类
+    EXT_CACHE_MIN_HITS = 3
+
     def __init__(self, client: Optional[DeepSeekClient] = None):
         """初始化分类器.
 
@@ -132,36 +187,43 @@ class FileClassifier:
         """
         self.client = client or DeepSeekClient()
         self._category_cache: dict[str, str] = {}
+        # 扩展名 -> (分类, 命中次数)，命中次数为-1表示该扩展名分类不唯一
+        self._ext_category_cache: dict[str, tuple[str, int]] = {}
         logfire.info("初始化智能文件分类器")
 
-    def extract_file_info(self, file_path: Path) -> FileInfo:
+    def extract_file_info(self, file_path: Union[Path, "os.DirEntry[str]"]) -> FileInfo:
         """提取文件信息.
 
         Args:
-            file_path: 文件路径
+            file_path: 文件路径，也可以是os.scandir返回的目录项（复用其缓存的stat）
 
         Returns:
             FileInfo: 文件信息对象
 
         """
+        entry = None
+        if isinstance(file_path, os.DirEntry):
+            entry, file_path = file_path, Path(file_path.path)
+
         try:
-            stat = file_path.stat()
+            stat = entry.stat() if entry is not None else file_path.stat()
+            extension = _lower_ext(file_path.suffix)
 
             # 获取MIME类型
-            mime_type, _ = mimetypes.guess_type(str(file_path))
+            mime_type = _guess_mime_type(file_path, extension)
 
             # 提取内容预览（仅文本文件）
             content_preview = None
-            if file_path.suffix.lower() in self.TEXT_EXTENSIONS:
+            if extension in self.TEXT_EXTENSIONS:
                 content_preview = self._extract_content_preview(file_path)
 
             return FileInfo(
                 path=file_path,
                 name=file_path.name,
-                extension=file_path.suffix.lower(),
+                extension=extension,
                 size=stat.st_size,
-                size_human="",  # 将由validator自动计算
-                modified_time=datetime.fromtimestamp(stat.st_mtime),
+                size_human=_format_size(stat.st_size),
+                modified_time=stat.st_mtime,
                 mime_type=mime_type,
                 content_preview=content_preview,
             )
@@ -174,15 +236,15 @@ class FileClassifier:
     def _extract_content_preview(self, file_path: Path) -> Optional[str]:
         """提取文件内容预览."""
         try:
-            with open(file_path, encoding="utf-8", errors="ignore") as f:
-                content = f.read(
-                    self.MAX_PREVIEW_LENGTH + 100
-                )  # 读取稍多一点以判断是否需要截断
-                # 清理内容，移除多余空白
-                content = re.sub(r"\s+", " ", content).strip()
-                if len(content) > self.MAX_PREVIEW_LENGTH:
-                    content = content[: self.MAX_PREVIEW_LENGTH] + "..."
-                return content
+            # 按UTF-8单字符最多4字节读取，保证至少有MAX_PREVIEW_LENGTH+100个字符，
+            # 读取稍多一点以判断是否需要截断
+            with open(file_path, "rb") as f:
+                raw = f.read((self.MAX_PREVIEW_LENGTH + 100) * 4)
+            # 清理内容，移除多余空白
+            content = " ".join(raw.decode("utf-8", errors="ignore").split())
+            if len(content) > self.MAX_PREVIEW_LENGTH:
+                content = content[: self.MAX_PREVIEW_LENGTH] + "..."
+            return content
         except Exception as e:
             logfire.warning(f"无法提取文件内容: {file_path} - {e}")
             return None
@@ -201,131 +263,338 @@ class FileClassifier:
 
         """
         try:
-            # 提取文件信息
-            file_info = self.extract_file_info(file_path)
+            # 扩展名分类已确定时无需读取文件
+            if use_cache:
+                ext_category = self._lookup_extension(file_path)
+                if ext_category is not None:
+                    logfire.debug(f"使用扩展名缓存分类: {file_path}")
+                    return self._cached_result(file_path, ext_category)
+
+            # 提取文件信息（磁盘I/O放到线程池，不阻塞事件循环）
+            file_info = await asyncio.to_thread(self.extract_file_info, file_path)
 
             # 检查缓存
-            cache_key = f"{file_info.extension}:{file_info.size}"
+            cache_key = self._cache_key(file_info)
             if use_cache and cache_key in self._category_cache:
-                logfire.info(f"使用缓存分类: {file_path}")
-                return ClassificationResult(
-                    file_path=file_path,
-                    category=self._category_cache[cache_key],
-                    confidence=90,  # 缓存结果给予较高置信度
-                    reason="基于相似文件的历史分类",
-                    cached=True,
-                )
+                logfire.debug(f"使用缓存分类: {file_path}")
+                return self._cached_result(file_path, self._category_cache[cache_key])
+
+        except Exception as e:
+            logfire.error(f"文件分类失败: {file_path} - {e}")
+            return self._error_result(file_path, e)
 
+        return await self._classify_single(file_info, use_cache)
+
+    async def _classify_single(
+        self, file_info: FileInfo, use_cache: bool = True
+    ) -> ClassificationResult:
+        """通过一次API请求分类单个已提取信息的文件."""
+        try:
             # 生成分类prompt
             prompt = PromptManager.format(
                 "file_classify",
                 filename=file_info.name,
                 extension=file_info.extension,
                 file_size=file_info.size_human,
-                modified_time=file_info.modified_time.strftime("%Y-%m-%d %H:%M:%S"),
+                modified_time=_format_mtime(file_info.modified_time),
                 content_preview=file_info.content_preview or "（无法提取内容预览）",
             )
 
-            # 调用AI进行分类
-            with logfire.span(
-                "classify_file",
-                attributes={"file": str(file_path), "extension": file_info.extension},
-            ):
-                response = await self.client.simple_chat(prompt)
-
-                # 解析JSON响应
-                result = self._parse_classification_response(response)
-
-                # 更新缓存
-                confidence_value = cast(int, result.get("confidence", 0))
-                if use_cache and confidence_value >= 80:
-                    self._category_cache[cache_key] = cast(str, result["category"])
-
-                return ClassificationResult(
-                    file_path=file_path,
-                    category=cast(str, result.get("category", "其他")),
-                    confidence=cast(int, result.get("confidence", 0)),
-                    reason=cast(str, result.get("reason", "无法确定分类原因")),
-                    cached=False,
-                )
+            # 调用AI进行分类（单文件不再单独开span，由批量span和API调用span覆盖）
+            response = await self.client.simple_chat(prompt)
 
-        except Exception as e:
-            logfire.error(f"文件分类失败: {file_path} - {e}")
-            return ClassificationResult(
-                file_path=file_path,
-                category="其他",
-                confidence=0,
-                reason="分类失败",
-                error=str(e),
+            # 解析JSON响应
+            result = self._parse_classification_response(response)
+            return self._build_result(
+                file_info.path, self._cache_key(file_info), result, use_cache
             )
 
+        except Exception as e:
+            logfire.error(f"文件分类失败: {file_info.path} - {e}")
+            return self._error_result(file_info.path, e)
+
+    def _cache_key(self, file_info: FileInfo) -> str:
+        """生成分类缓存键（扩展名+大小）."""
+        return f"{file_info.extension}:{file_info.size}"
+
+    def _lookup_extension(self, file_path: Path) -> Optional[str]:
+        """查询扩展名缓存，扩展名分类已确定时返回分类."""
+        entry = self._ext_category_cache.get(_lower_ext(file_path.suffix))
+        if entry is not None and entry[1] >= self.EXT_CACHE_MIN_HITS:
+            return entry[0]
+        return None
+
+    def _record_extension(self, extension: str, category: str) -> None:
+        """记录扩展名的高置信度分类."""
+        if not extension:
+            return
+        entry = self._ext_category_cache.get(extension)
+        if entry is None:
+            self._ext_category_cache[extension] = (category, 1)
+        elif entry[1] >= 0:
+            if entry[0] == category:
+                self._ext_category_cache[extension] = (category, entry[1] + 1)
+            else:
+                # 同一扩展名出现不同分类，不再按扩展名短路
+                self._ext_category_cache[extension] = (entry[0], -1)
+
+    def _cached_result(self, file_path: Path, category: str) -> ClassificationResult:
+        """根据缓存生成分类结果."""
+        return ClassificationResult(
+            file_path=file_path,
+            category=category,
+            confidence=90,  # 缓存结果给予较高置信度
+            reason="基于相似文件的历史分类",
+            cached=True,
+        )
+
+    def _error_result(self, file_path: Path, error: Exception) -> ClassificationResult:
+        """生成分类失败的结果."""
+        return ClassificationResult(
+            file_path=file_path,
+            category="其他",
+            confidence=0,
+            reason="分类失败",
+            error=str(error),
+        )
+
+    def _build_result(
+        self,
+        file_path: Path,
+        cache_key: str,
+        result: dict[str, Any],
+        use_cache: bool,
+    ) -> ClassificationResult:
+        """根据解析后的AI响应生成分类结果，并更新缓存."""
+        # 每个字段只取一次
+        category = result.get("category") or "其他"
+        confidence = _coerce_confidence(result.get("confidence"))
+        reason = result.get("reason") or "无法确定分类原因"
+
+        # 更新缓存
+        if use_cache and confidence >= 80:
+            self._category_cache[cache_key] = category
+            self._record_extension(_lower_ext(file_path.suffix), category)
+
+        return ClassificationResult(
+            file_path=file_path,
+            category=category,
+            confidence=confidence,
+            reason=reason,
+            cached=False,
+        )
+
     def _parse_classification_response(self, response: str) -> dict[str, Any]:
         """解析AI分类响应."""
         try:
             # 尝试直接解析JSON
-            return cast(dict[str, Any], json.loads(response))
+            data = json.loads(response)
         except json.JSONDecodeError:
             # 尝试提取JSON部分
-            json_match = re.search(r"\{[^{}]*\}", response)
-            if json_match:
-                try:
-                    return cast(dict[str, Any], json.loads(json_match.group()))
-                except json.JSONDecodeError:
-                    pass
+            data = _extract_json(response, "{")
+
+        if isinstance(data, dict):
+            return data
 
-            # 返回默认值
-            logfire.warning(f"无法解析分类响应: {response[:100]}...")
-            return {"category": "其他", "confidence": 0, "reason": "AI响应格式错误"}
+        # 返回默认值
+        logfire.warning(f"无法解析分类响应: {response[:100]}...")
+        return {"category": "其他", "confidence": 0, "reason": "AI响应格式错误"}
 
     async def classify_batch(
-        self, file_paths: list[Path], max_concurrent: int = 5, use_cache: bool = True
+        self,
+        file_paths: list[Path],
+        max_concurrent: int = 5,
+        use_cache: bool = True,
+        chunk_size: Optional[int] = None,
     ) -> BatchClassificationResult:
         """批量分类文件.
 
+        文件按chunk_size分组，每组通过一次API请求完成分类，
+        响应无法解析的组会回退为逐个文件分类。
+        文件读取在线程池中进行且不占用并发名额，信号量只限制API请求，
+        因此后续分组的磁盘I/O可以与正在进行的请求重叠。
+
         Args:
             file_paths: 文件路径列表
-            max_concurrent: 最大并发数
+            max_concurrent: 最大并发请求数
             use_cache: 是否使用缓存
+            chunk_size: 每次请求包含的文件数，默认为BATCH_CHUNK_SIZE
 
         Returns:
             BatchClassificationResult: 批量分类结果
 
         """
         result = BatchClassificationResult(total=len(file_paths))
+        size = chunk_size or self.BATCH_CHUNK_SIZE
+        chunks = [file_paths[i : i + size] for i in range(0, len(file_paths), size)]
 
         # 使用信号量控制并发
         semaphore = asyncio.Semaphore(max_concurrent)
 
-        async def classify_with_limit(file_path: Path) -> ClassificationResult:
-            async with semaphore:
-                return await self.classify_file(file_path, use_cache)
+        async def classify_with_limit(
+            chunk: list[Path],
+        ) -> list[ClassificationResult]:
+            return await self._classify_paths(chunk, use_cache, semaphore)
 
         # 并发分类
         with logfire.span(
             "batch_classify",
             attributes={
                 "file_count": len(file_paths),
+                "chunk_count": len(chunks),
                 "max_concurrent": max_concurrent,
             },
         ):
-            tasks = [classify_with_limit(fp) for fp in file_paths]
-            classifications = await asyncio.gather(*tasks)
+            tasks = [classify_with_limit(chunk) for chunk in chunks]
+            chunk_results = await asyncio.gather(*tasks)
 
             # 统计结果
-            for classification in classifications:
-                result.results.append(classification)
-                if classification.error:
-                    result.failed += 1
-                else:
-                    result.success += 1
+            for classifications in chunk_results:
+                for classification in classifications:
+                    result.results.append(classification)
+                    if classification.error:
+                        result.failed += 1
+                    else:
+                        result.success += 1
 
             logfire.info(f"批量分类完成: 成功={result.success}, 失败={result.failed}")
 
         return result
 
+    async def _classify_paths(
+        self,
+        file_paths: list[Path],
+        use_cache: bool,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> list[ClassificationResult]:
+        """分类一组文件，结果顺序与输入一致.
+
+        semaphore只包住API请求，文件信息提取在此之前于线程池中完成。
+        """
+        results: dict[int, ClassificationResult] = {}
+        to_extract: list[tuple[int, Path]] = []
+        for index, file_path in enumerate(file_paths):
+            if use_cache:
+                ext_category = self._lookup_extension(file_path)
+                if ext_category is not None:
+                    results[index] = self._cached_result(file_path, ext_category)
+                    continue
+            to_extract.append((index, file_path))
+
+        extracted = await asyncio.to_thread(
+            self._extract_file_infos, [file_path for _, file_path in to_extract]
+        )
+
+        pending: list[tuple[int, FileInfo]] = []
+        for (index, file_path), file_info in zip(to_extract, extracted):
+            if isinstance(file_info, Exception):
+                logfire.error(f"文件分类失败: {file_path} - {file_info}")
+                results[index] = self._error_result(file_path, file_info)
+                continue
+
+            cache_key = self._cache_key(file_info)
+            if use_cache and cache_key in self._category_cache:
+                results[index] = self._cached_result(
+                    file_path, self._category_cache[cache_key]
+                )
+            else:
+                pending.append((index, file_info))
+
+        if pending:
+            files = [file_info for _, file_info in pending]
+            async with semaphore or contextlib.nullcontext():
+                if len(files) == 1:
+                    classified = [await self._classify_single(files[0], use_cache)]
+                else:
+                    classified = await self._classify_chunk(files, use_cache)
+            for (index, _), classification in zip(pending, classified):
+                results[index] = classification
+
+        return [results[index] for index in range(len(file_paths))]
+
+    def _extract_file_infos(
+        self, file_paths: list[Path]
+    ) -> list[Union[FileInfo, Exception]]:
+        """依次提取多个文件的信息，失败的文件返回异常对象（在线程池中执行）."""
+        infos: list[Union[FileInfo, Exception]] = []
+        for file_path in file_paths:
+            try:
+                infos.append(self.extract_file_info(file_path))
+            except Exception as e:
+                infos.append(e)
+        return infos
+
+    async def _classify_chunk(
+        self, files: list[FileInfo], use_cache: bool = True
+    ) -> list[ClassificationResult]:
+        """通过一次API请求分类多个文件."""
+        files_data = [
+            {
+                "index": index,
+                "filename": file_info.name,
+                "extension": file_info.extension,
+                "file_size": file_info.size_human,
+                "modified_time": _format_mtime(file_info.modified_time),
+                "content_preview": file_info.content_preview or "（无法提取内容预览）",
+            }
+            for index, file_info in enumerate(files)
+        ]
+        prompt = PromptManager.format(
+            "file_classify_batch",
+            files=json.dumps(files_data, ensure_ascii=False, indent=2),
+        )
+
+        try:
+            response = await self.client.simple_chat(prompt)
+        except Exception as e:
+            logfire.error(f"批量分类请求失败: {len(files)}个文件 - {e}")
+            return [self._error_result(file_info.path, e) for file_info in files]
+
+        parsed = self._parse_batch_response(response, len(files))
+        if parsed is None:
+            # 批量响应无法解析时回退为逐个分类
+            logfire.warning(f"无法解析批量分类响应，逐个分类{len(files)}个文件")
+            return [
+                await self._classify_single(file_info, use_cache) for file_info in files
+            ]
+
+        results = []
+        for file_info, item in zip(files, parsed):
+            try:
+                results.append(
+                    self._build_result(
+                        file_info.path, self._cache_key(file_info), item, use_cache
+                    )
+                )
+            except Exception as e:
+                # 单个结果格式错误时只重新分类该文件，不影响同批其他文件
+                logfire.warning(
+                    f"批量分类结果无效，单独重新分类: {file_info.path} - {e}"
+                )
+                results.append(await self._classify_single(file_info, use_cache))
+        return results
+
+    def _parse_batch_response(
+        self, response: str, count: int
+    ) -> Optional[list[dict[str, Any]]]:
+        """解析批量分类响应，无法与输入文件一一对应时返回None."""
+        try:
+            data = json.loads(response)
+        except json.JSONDecodeError:
+            # 尝试提取JSON数组部分
+            data = _extract_json(response, "[")
+
+        if not isinstance(data, list) or len(data) != count:
+            return None
+        if not all(isinstance(item, dict) for item in data):
+            return None
+
+        # 优先按index对齐，否则按返回顺序对齐
+        by_index = {item.get("index"): item for item in data}
+        if set(by_index) == set(range(count)):
+            return [by_index[index] for index in range(count)]
+        return cast(list[dict[str, Any]], data)
+
     def get_category_stats(self) -> dict[str, int]:
         """获取缓存的分类统计."""
-        stats: dict[str, int] = {}
-        for category in self._category_cache.values():
-            stats[category] = stats.get(category, 0) + 1
-        return stats
+        return dict(Counter(self._category_cache.values()))
@@ -21,6 +21,8 @@ class AIConfig(BaseSettings):
         temperature: 生成温度
         timeout: API调用超时时间
         cache_ttl: 缓存有效期（秒）
+        version_cache: 是否把文件预览和版本分析结果缓存到本地磁盘
+        version_cache_ttl: 版本分析磁盘缓存有效期（秒）
         daily_limit: 每日费用限额（元）
         monthly_limit: 每月费用限额（元）
         smart_classify: 智能文件分类功能开关
@@ -48,6 +50,11 @@ class AIConfig(BaseSettings):
     temperature: float = Field(0.7, description="生成温度")
     timeout: float = Field(60.0, description="API调用超时时间")
     cache_ttl: int = Field(3600, description="缓存有效期（秒）")
+    # 磁盘缓存会保存文件内容预览，默认关闭
+    version_cache: bool = Field(False, description="版本分析结果磁盘缓存")
+    version_cache_ttl: int = Field(
+        7 * 24 * 3600, description="版本分析磁盘缓存有效期（秒）"
+    )
 
     # 成本控制
     daily_limit: float = Field(10.0, description="每日费用限额（元）")
@@ -8,9 +8,11 @@
 - 成本统计
 """
 
+import asyncio
 import hashlib
-import json
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
 from typing import Any, NoReturn, Optional
 
 import httpx
@@ -38,49 +40,63 @@ class DeepSeekResponse(BaseModel):
 
 
 class AICache:
-    """AI响应缓存"""
+    """AI响应缓存（容量受限的LRU，按单调时钟过期）"""
 
-    def __init__(self, ttl: int = 3600):
+    def __init__(self, ttl: int = 3600, maxsize: int = 1024):
         """初始化缓存实例
 
         Args:
             ttl: 缓存存活时间（秒）
+            maxsize: 最大缓存条目数，超出后淘汰最久未使用的条目
 
         """
-        self.cache: dict[str, dict[str, Any]] = {}
+        self.cache: OrderedDict[str, tuple[float, DeepSeekResponse]] = OrderedDict()
         self.ttl = ttl
+        self.maxsize = maxsize
 
     def _generate_key(self, messages: list[DeepSeekMessage], **kwargs: Any) -> str:
-        """生成缓存键"""
-        data = {
-            "messages": [msg.model_dump() for msg in messages],
-            **kwargs,
-        }
-        return hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        """生成缓存键
+
+        直接拼接消息字段和排序后的参数，避免每次都做JSON序列化；
+        内容带长度前缀，保证不同消息组合不会拼出相同的字节串。
+        """
+        buf = bytearray()
+        for msg in messages:
+            content = msg.content.encode()
+            buf += b"%s\0%d\0%s\0" % (msg.role.encode(), len(content), content)
+        for name in sorted(kwargs):
+            buf += b"%s\0%r\0" % (name.encode(), kwargs[name])
+        return hashlib.blake2b(buf, digest_size=16).hexdigest()
 
     def get(
         self, messages: list[DeepSeekMessage], **kwargs: Any
     ) -> Optional[DeepSeekResponse]:
         """获取缓存的响应"""
         key = self._generate_key(messages, **kwargs)
-        if key in self.cache:
-            entry = self.cache[key]
-            if datetime.now() < entry["expires"]:
-                logfire.info("使用缓存的AI响应", attributes={"cache_key": key})
-                return DeepSeekResponse(**entry["response"])
-            else:
-                del self.cache[key]
-        return None
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+
+        expires, response = entry
+        if time.monotonic() >= expires:
+            del self.cache[key]
+            return None
+
+        self.cache.move_to_end(key)
+        logfire.info("使用缓存的AI响应", attributes={"cache_key": key})
+        # 返回副本，调用方修改响应不会影响后续命中
+        return response.model_copy(deep=True)
 
     def set(
         self, messages: list[DeepSeekMessage], response: DeepSeekResponse, **kwargs: Any
     ) -> None:
         """缓存响应"""
         key = self._generate_key(messages, **kwargs)
-        self.cache[key] = {
-            "response": response.model_dump(),
-            "expires": datetime.now() + timedelta(seconds=self.ttl),
-        }
+        # 保存副本（不经过重新校验），调用方之后修改原对象不会影响缓存
+        self.cache[key] = (time.monotonic() + self.ttl, response.model_copy(deep=True))
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
 
 
 class CostTracker:
@@ -93,17 +109,36 @@ class CostTracker:
         "deepseek-reasoner": {"input": 0.001, "output": 0.002},  # reasoner模型
     }
 
+    # 每个token的单价（元），由PRICING预先换算
+    _TOKEN_PRICES = {
+        model: (prices["input"] / 1000, prices["output"] / 1000)
+        for model, prices in PRICING.items()
+    }
+
     def __init__(self) -> None:
         """初始化成本追踪器"""
         self.usage: dict[str, dict[str, Any]] = {}
+        self._day_key = ""
+        self._day_rollover = 0.0
+
+    def _today_key(self) -> str:
+        """获取今日的日期键，跨过零点前复用已生成的字符串"""
+        if time.time() >= self._day_rollover:
+            today = date.today()
+            self._day_key = today.isoformat()
+            self._day_rollover = datetime.combine(
+                today + timedelta(days=1), datetime.min.time()
+            ).timestamp()
+        return self._day_key
 
     def track(
         self, model: str, prompt_tokens: int, completion_tokens: int
     ) -> dict[str, float]:
         """记录使用量并计算成本"""
-        today = datetime.now().date().isoformat()
-        if today not in self.usage:
-            self.usage[today] = {
+        today = self._today_key()
+        bucket = self.usage.get(today)
+        if bucket is None:
+            bucket = self.usage[today] = {
                 "prompt_tokens": 0,
                 "completion_tokens": 0,
                 "total_cost": 0.0,
@@ -111,18 +146,20 @@ class CostTracker:
             }
 
         # 计算成本
-        pricing = self.PRICING.get(model, self.PRICING["deepseek-chat"])
-        input_cost = (prompt_tokens / 1000) * pricing["input"]
-        output_cost = (completion_tokens / 1000) * pricing["output"]
+        input_price, output_price = self._TOKEN_PRICES.get(
+            model, self._TOKEN_PRICES["deepseek-chat"]
+        )
+        input_cost = prompt_tokens * input_price
+        output_cost = completion_tokens * output_price
         total_cost = input_cost + output_cost
 
         # 更新统计
-        self.usage[today]["prompt_tokens"] += prompt_tokens
-        self.usage[today]["completion_tokens"] += completion_tokens
-        self.usage[today]["total_cost"] += total_cost
-        self.usage[today]["requests"] += 1
+        bucket["prompt_tokens"] += prompt_tokens
+        bucket["completion_tokens"] += completion_tokens
+        bucket["total_cost"] += total_cost
+        bucket["requests"] += 1
 
-        logfire.info(
+        logfire.debug(
             "AI使用量统计",
             attributes={
                 "date": today,
@@ -141,16 +178,15 @@ class CostTracker:
 
     def get_today_usage(self) -> dict[str, Any]:
         """获取今日使用情况"""
-        today = datetime.now().date().isoformat()
-        return self.usage.get(
-            today,
-            {
-                "prompt_tokens": 0,
-                "completion_tokens": 0,
-                "total_cost": 0.0,
-                "requests": 0,
-            },
-        )
+        usage = self.usage.get(self._today_key())
+        if usage is not None:
+            return usage
+        return {
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_cost": 0.0,
+            "requests": 0,
+        }
 
     def check_limit(self, daily_limit: float) -> None:
         """检查是否超过限额"""
@@ -161,6 +197,46 @@ class CostTracker:
             )
 
 
+class RateLimiter:
+    """异步令牌桶限速器，限制单位时间内的API请求数"""
+
+    def __init__(self, max_rate: float, time_period: float = 60.0) -> None:
+        """初始化限速器
+
+        Args:
+            max_rate: 每个时间窗口允许的请求数（同时也是允许的突发量）
+            time_period: 时间窗口长度（秒）
+
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """获取一个令牌，令牌不足时等待补充"""
+        refill_rate = self.max_rate / self.time_period
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_rate, self._tokens + (now - self._updated) * refill_rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / refill_rate)
+
+    async def __aenter__(self) -> None:
+        """进入上下文时获取令牌"""
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """令牌按时间补充，退出时无需归还"""
+
+
 class DeepSeekClient:
     """DeepSeek API客户端"""
 
@@ -184,6 +260,45 @@ class DeepSeekClient:
         }
         self.cache = AICache(ttl=self.config.cache_ttl)
         self.cost_tracker: CostTracker = CostTracker()
+        # 连接池与事件循环绑定，每个事件循环各用一个客户端
+        self._http_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """获取当前事件循环复用的HTTP客户端
+
+        CLI中每次 asyncio.run 都会创建新的事件循环，同步调用则复用共享的事件循环。
+        切换循环时保留其他循环上的客户端，回到该循环时继续复用，
+        不会在未关闭的情况下丢弃仍可使用的连接池。
+        """
+        loop = asyncio.get_running_loop()
+        self._discard_dead_clients()
+        client = self._http_clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._http_clients[loop] = httpx.AsyncClient(
+                base_url=self.config.api_base,
+                headers=self.headers,
+                timeout=self.config.timeout,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+        return client
+
+    def _discard_dead_clients(self) -> None:
+        """丢弃所属事件循环已关闭的客户端
+
+        循环关闭后其上的连接无法再异步关闭，只能释放引用，由垃圾回收关闭套接字。
+        """
+        for loop in [loop for loop in self._http_clients if loop.is_closed()]:
+            client = self._http_clients.pop(loop)
+            if not client.is_closed:
+                logfire.debug("事件循环已关闭，丢弃未关闭的HTTP客户端")
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环上的HTTP连接池"""
+        client = self._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
+        self._discard_dead_clients()
 
     async def chat_completion(
         self,
@@ -224,10 +339,12 @@ class DeepSeekClient:
             if cached:
                 return cached
 
-        # 准备请求数据
+        # 准备请求数据（直接取字段，跳过Pydantic的model_dump序列化流程）
         request_data = {
             "model": model,
-            "messages": [msg.model_dump() for msg in messages],
+            "messages": [
+                {"role": msg.role, "content": msg.content} for msg in messages
+            ],
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
@@ -235,6 +352,7 @@ class DeepSeekClient:
         # 发送请求
         with logfire.span(
             "deepseek_api_call",
+            _level="debug",
             attributes={
                 "model": model,
                 "message_count": len(messages),
@@ -242,46 +360,41 @@ class DeepSeekClient:
             },
         ):
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        f"{self.config.api_base}/chat/completions",
-                        headers=self.headers,
-                        json=request_data,
-                        timeout=self.config.timeout,
+                client = self._get_http_client()
+                response = await client.post("/chat/completions", json=request_data)
+                response.raise_for_status()
+                data = response.json()
+
+                # 解析响应
+                choice = data["choices"][0]
+                usage = data.get("usage", {})
+
+                result = DeepSeekResponse(
+                    content=choice["message"]["content"],
+                    usage=usage,
+                    model=data.get("model", model),
+                    finish_reason=choice.get("finish_reason", ""),
+                )
+
+                # 记录成本
+                if usage:
+                    self.cost_tracker.track(
+                        model,
+                        usage.get("prompt_tokens", 0),
+                        usage.get("completion_tokens", 0),
                     )
-                    response.raise_for_status()
-                    data = response.json()
-
-                    # 解析响应
-                    choice = data["choices"][0]
-                    usage = data.get("usage", {})
-
-                    result = DeepSeekResponse(
-                        content=choice["message"]["content"],
-                        usage=usage,
-                        model=data.get("model", model),
-                        finish_reason=choice.get("finish_reason", ""),
+
+                # 缓存结果
+                if use_cache:
+                    self.cache.set(
+                        messages,
+                        result,
+                        model=model,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
                     )
 
-                    # 记录成本
-                    if usage:
-                        self.cost_tracker.track(
-                            model,
-                            usage.get("prompt_tokens", 0),
-                            usage.get("completion_tokens", 0),
-                        )
-
-                    # 缓存结果
-                    if use_cache:
-                        self.cache.set(
-                            messages,
-                            result,
-                            model=model,
-                            temperature=temperature,
-                            max_tokens=max_tokens,
-                        )
-
-                    return result
+                return result
 
             except httpx.HTTPStatusError as e:
                 self._handle_api_error(e)
@@ -3,7 +3,17 @@
 集中管理所有AI功能的prompt模板，确保提示词的一致性和可维护性。
 """
 
-from typing import Any
+import functools
+import string
+import sys
+from typing import Any, Callable, Optional
+
+_FORMATTER = string.Formatter()
+
+
+def _escape_braces(text: str) -> str:
+    """转义花括号，使文本在模板中按字面输出."""
+    return text.replace("{", "{{").replace("}", "}}")
 
 
 class PromptTemplate:
@@ -17,10 +27,49 @@ class PromptTemplate:
 
         """
         self.template = template
+        # 预先拆分为(字面文本, 占位符名)序列，格式化时无需重新解析模板
+        self._parts = self._parse(template)
+
+    @staticmethod
+    def _parse(template: str) -> Optional[tuple[tuple[str, Optional[str]], ...]]:
+        """拆分模板，含格式说明或复杂字段名的模板返回None."""
+        parts: list[tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in _FORMATTER.parse(template):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                return None
+            parts.append((sys.intern(literal), field))
+        return tuple(parts)
 
     def format(self, **kwargs: Any) -> str:
         """格式化模板"""
-        return self.template.format(**kwargs)
+        if self._parts is None:
+            return self.template.format(**kwargs)
+
+        pieces: list[str] = []
+        for literal, field in self._parts:
+            pieces.append(literal)
+            if field is not None:
+                pieces.append(format(kwargs[field]))
+        return "".join(pieces)
+
+    def partial(self, **fixed: Any) -> Callable[..., str]:
+        """预先填入固定参数，返回只需传入其余参数的格式化函数
+
+        固定参数被直接并入字面文本，后续每次格式化只替换剩余的占位符。
+        """
+        if self._parts is None:
+            return functools.partial(self.format, **fixed)
+
+        pieces: list[str] = []
+        for literal, field in self._parts:
+            pieces.append(_escape_braces(literal))
+            if field is None:
+                continue
+            if field in fixed:
+                pieces.append(_escape_braces(format(fixed[field])))
+            else:
+                pieces.append(f"{{{field}}}")
+        return PromptTemplate("".join(pieces)).format
 
 
 # 文件分类Prompt
@@ -55,6 +104,36 @@ FILE_CLASSIFY_PROMPT = PromptTemplate(
 注意：请严格返回JSON格式，不要包含其他说明文字。"""
 )
 
+# 批量文件分类Prompt（一次请求分类多个文件）
+FILE_CLASSIFY_BATCH_PROMPT = PromptTemplate(
+    """你是一个专业的文件分类助手。请根据以下文件信息，为每个文件建议最合适的分类。
+
+文件列表（JSON数组，index为文件序号）：
+{files}
+
+请返回JSON数组，每个文件对应一个元素，顺序与输入一致：
+[
+    {{
+        "index": 文件序号,
+        "category": "分类名称",
+        "confidence": 0-100的置信度整数,
+        "reason": "分类理由（不超过30字）"
+    }}
+]
+
+可选分类：
+- 工作文档：包含工作相关内容，如报告、计划、会议记录等
+- 个人文件：个人生活相关，如照片、日记、个人笔记等
+- 项目代码：源代码、配置文件、技术文档等
+- 学习资料：教程、电子书、课程资料等
+- 临时文件：临时生成的文件、缓存、下载的临时内容
+- 系统文件：系统配置、日志、程序生成的文件
+- 归档文件：需要长期保存的历史文件
+- 其他：无法明确分类的文件
+
+注意：请严格返回JSON数组，不要包含其他说明文字。"""
+)
+
 # 文档摘要Prompt
 DOCUMENT_SUMMARIZE_PROMPT = PromptTemplate(
     """请为以下文档生成一个{length}字左右的中文摘要。
@@ -175,6 +254,7 @@ class PromptManager:
 
     templates: dict[str, PromptTemplate] = {
         "file_classify": FILE_CLASSIFY_PROMPT,
+        "file_classify_batch": FILE_CLASSIFY_BATCH_PROMPT,
         "document_summarize": DOCUMENT_SUMMARIZE_PROMPT,
         "text_replace_analysis": TEXT_REPLACE_ANALYSIS_PROMPT,
         "file_version_analysis": FILE_VERSION_ANALYSIS_PROMPT,
@@ -194,6 +274,11 @@ class PromptManager:
         template = cls.get(name)
         return template.format(**kwargs)
 
+    @classmethod
+    def format_partial(cls, name: str, **fixed: Any) -> Callable[..., str]:
+        """获取预先填入固定参数的格式化函数（批量处理时只需生成一次）"""
+        return cls.get(name).partial(**fixed)
+
 
 # 创建全局实例
 prompt_manager = PromptManager()
@@ -5,10 +5,19 @@
 """
 
 import asyncio
+import codecs
+import hashlib
 import json
+import mmap
+import os
+import random
+import re
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Union
 
 import logfire
 from docx import Document
@@ -16,9 +25,14 @@ from pydantic import BaseModel, Field
 from pypdf import PdfReader
 
 from ..utils.errors import ToolError
-from .deepseek_client import DeepSeekClient
+from .deepseek_client import DeepSeekClient, RateLimiter
 from .prompts import PromptManager
 
+# 连续的中文字符，整段匹配以减少匹配次数
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]+")
+# 与str.isalnum一致的字符（\w去掉下划线），并排除中文
+_WORD_RE = re.compile(r"[^\W_\u4e00-\u9fff]+")
+
 
 class DocumentInfo(BaseModel):
     """文档信息模型"""
@@ -43,6 +57,17 @@ class SummaryResult(BaseModel):
     error: Optional[str] = Field(None, description="错误信息")
 
 
+@dataclass(slots=True, frozen=True)
+class _PreparedDocument:
+    """已提取并生成prompt的文档（不再持有文档全文）"""
+
+    file_path: Path
+    doc_type: str
+    word_count: int
+    cache_key: str
+    prompt: str
+
+
 class BatchSummaryResult(BaseModel):
     """批量摘要结果"""
 
@@ -54,6 +79,12 @@ class BatchSummaryResult(BaseModel):
     )
 
 
+# 批量摘要流水线的队列元素：(输入序号, 已提取的文档或提取失败的结果)，None为结束标记
+_PreparedQueue = asyncio.Queue[
+    Optional[tuple[int, Union[_PreparedDocument, SummaryResult]]]
+]
+
+
 class DocumentSummarizer:
     """文档摘要生成器"""
 
@@ -66,22 +97,45 @@ class DocumentSummarizer:
         ".doc": "word",
     }
 
+    # 文档类型 -> 内容提取方法名（按名称分派，子类可以覆盖提取方法）
+    EXTRACTORS = {
+        "text": "_extract_text_content",
+        "markdown": "_extract_text_content",
+        "restructuredtext": "_extract_text_content",
+        "pdf": "_extract_pdf_content",
+        "word": "_extract_docx_content",
+    }
+
     MAX_CONTENT_LENGTH = 10000
 
-    def __init__(self, client: Optional[DeepSeekClient] = None):
+    # 遇到API频率限制时的最大尝试次数和最长退避时间（秒）
+    RATE_LIMIT_RETRIES = 3
+    RATE_LIMIT_MAX_WAIT = 30
+
+    def __init__(
+        self, client: Optional[DeepSeekClient] = None, cache_maxsize: int = 1024
+    ):
         """初始化文档摘要生成器
 
         Args:
             client: 可选的DeepSeek客户端实例
+            cache_maxsize: 摘要缓存的最大条目数，超出时淘汰最久未使用的条目
 
         """
         self.client = client or DeepSeekClient()
-        self._summary_cache: dict[str, str] = {}
+        self.cache_maxsize = cache_maxsize
+        self._summary_cache: OrderedDict[str, str] = OrderedDict()
+        # 正在生成中的摘要（缓存键 -> 请求任务），相同内容的并发请求共享同一次API调用
+        self._pending_summaries: dict[str, asyncio.Future[str]] = {}
+        # 目标长度 -> 已填入长度的摘要模板，同一批次只生成一次
+        self._prompt_formatters: dict[int, Callable[..., str]] = {}
         logfire.info("初始化文档摘要生成器")
 
     def extract_document_content(self, file_path: Path) -> DocumentInfo:
         """提取文档内容
 
+        只使用局部状态，可以在线程池中并发调用。
+
         Args:
             file_path: 需要处理的文件路径
 
@@ -96,22 +150,17 @@ class DocumentSummarizer:
             raise ToolError(f"文件不存在: {file_path}", "FILE_NOT_FOUND")
 
         extension = file_path.suffix.lower()
-        if extension not in self.SUPPORTED_FORMATS:
+        doc_type = self.SUPPORTED_FORMATS.get(extension)
+        if doc_type is None:
             raise ToolError(
                 f"不支持的文档格式: {extension}",
                 "UNSUPPORTED_FORMAT",
             )
 
-        doc_type = self.SUPPORTED_FORMATS[extension]
-
-        if doc_type in ["text", "markdown", "restructuredtext"]:
-            content = self._extract_text_content(file_path)
-        elif doc_type == "pdf":
-            content = self._extract_pdf_content(file_path)
-        elif doc_type == "word":
-            content = self._extract_docx_content(file_path)
-        else:
+        extractor_name = self.EXTRACTORS.get(doc_type)
+        if extractor_name is None:
             raise ToolError(f"未实现的文档类型处理: {doc_type}", "NOT_IMPLEMENTED")
+        content: str = getattr(self, extractor_name)(file_path)
 
         if len(content) > self.MAX_CONTENT_LENGTH:
             content = content[: self.MAX_CONTENT_LENGTH] + "\n...(内容已截断)"
@@ -127,23 +176,47 @@ class DocumentSummarizer:
         )
 
     def _extract_text_content(self, file_path: Path) -> str:
-        """提取文本文件内容"""
+        """提取文本文件内容
+
+        通过mmap只访问文件开头足以覆盖最大长度的字节（UTF-8单字符最多4字节），
+        大文件的其余部分不会被读入内存。
+        """
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                raw = mm[: (self.MAX_CONTENT_LENGTH + 1) * 4]
+
+        # 截取位置可能落在多字节字符中间，只有读到文件末尾时才要求完整解码
+        is_complete = len(raw) == size
         try:
-            with open(file_path, encoding="utf-8") as f:
-                return f.read()
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            content = decoder.decode(raw, final=is_complete)
         except UnicodeDecodeError:
-            with open(file_path, encoding="gbk", errors="ignore") as f:
-                return f.read()
+            content = raw.decode("gbk", errors="ignore")
+
+        # 与文本模式读取一致，统一换行符
+        return content.replace("\r\n", "\n").replace("\r", "\n")
 
     def _extract_pdf_content(self, file_path: Path) -> str:
-        """提取PDF文件内容"""
+        """提取PDF文件内容
+
+        按顺序逐页解析，累计长度超过 MAX_CONTENT_LENGTH 后即停止，
+        通常只需解析前几页。
+        """
         try:
             reader = PdfReader(file_path)
             content = []
+            total_length = 0
             for page in reader.pages:
                 text = page.extract_text()
                 if text:
                     content.append(text)
+                    total_length += len(text) + 1
+                    # 超过最大长度后的页面会被截断，无需继续解析
+                    if total_length > self.MAX_CONTENT_LENGTH:
+                        break
             return "\n".join(content)
         except Exception as e:
             logfire.error(f"PDF内容提取失败: {file_path} - {e}")
@@ -154,9 +227,14 @@ class DocumentSummarizer:
         try:
             doc = Document(str(file_path))
             content = []
+            total_length = 0
             for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    content.append(paragraph.text)
+                text = paragraph.text
+                if text.strip():
+                    content.append(text)
+                    total_length += len(text) + 1
+                    if total_length > self.MAX_CONTENT_LENGTH:
+                        break
             return "\n".join(content)
         except Exception as e:
             logfire.error(f"Word文档内容提取失败: {file_path} - {e}")
@@ -164,23 +242,80 @@ class DocumentSummarizer:
 
     def _count_words(self, text: str) -> int:
         """混合中英文字数统计"""
-        chinese_chars = 0
-        non_chinese_text = []
-
-        for char in text:
-            if "\u4e00" <= char <= "\u9fff":
-                chinese_chars += 1
-                non_chinese_text.append(" ")
-            else:
-                non_chinese_text.append(char)
-
-        english_text = "".join(non_chinese_text)
-        english_text = "".join(
-            [c if c.isalnum() or c.isspace() else " " for c in english_text]
+        # 中文按字计数：删除中文后减少的长度即中文字数
+        chinese_chars = len(text) - len(_CJK_RE.sub("", text))
+        # 其余按连续的字母数字（不含下划线）计词，只取匹配次数，不构造单词列表
+        english_words = _WORD_RE.subn("", text)[1]
+        return chinese_chars + english_words
+
+    def _cache_key(self, content: str, target_length: int, language: str) -> str:
+        """按文档内容哈希生成缓存键，文件内容变化后缓存自动失效"""
+        digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{digest}:{target_length}:{language}"
+
+    def _get_cached_summary(self, cache_key: str) -> Optional[str]:
+        """获取缓存的摘要，并标记为最近使用"""
+        summary = self._summary_cache.get(cache_key)
+        if summary is not None:
+            self._summary_cache.move_to_end(cache_key)
+        return summary
+
+    def _set_cached_summary(self, cache_key: str, summary: str) -> None:
+        """缓存摘要，超出容量时淘汰最久未使用的条目"""
+        self._summary_cache[cache_key] = summary
+        self._summary_cache.move_to_end(cache_key)
+        while len(self._summary_cache) > self.cache_maxsize:
+            self._summary_cache.popitem(last=False)
+
+    def _prompt_formatter(self, target_length: int) -> Callable[..., str]:
+        """获取指定目标长度的摘要prompt格式化函数"""
+        formatter = self._prompt_formatters.get(target_length)
+        if formatter is None:
+            formatter = PromptManager.format_partial(
+                "document_summarize", length=target_length
+            )
+            self._prompt_formatters[target_length] = formatter
+        return formatter
+
+    def _success_result(
+        self, doc: _PreparedDocument, summary: str, cached: bool
+    ) -> SummaryResult:
+        """生成成功的摘要结果
+
+        各字段均来自已校验的DocumentInfo和字符串摘要，
+        使用model_construct跳过重复的Pydantic校验。
+        """
+        return SummaryResult.model_construct(
+            file_path=doc.file_path,
+            summary=summary,
+            word_count=doc.word_count,
+            summary_length=len(summary),
+            doc_type=doc.doc_type,
+            cached=cached,
+            error=None,
         )
-        english_words = len([word for word in english_text.split() if word])
 
-        return chinese_chars + english_words
+    async def _generate_summary(self, prompt: str) -> str:
+        """调用AI生成摘要并清理首尾的引号和空白"""
+        summary = await self._chat_with_retry(prompt)
+        return summary.strip().strip('"').strip("'")
+
+    async def _chat_with_retry(self, prompt: str) -> str:
+        """调用AI生成摘要，遇到频率限制时按指数退避（随机抖动）重试"""
+        attempt = 0
+        while True:
+            try:
+                return await self.client.simple_chat(prompt)
+            except ToolError as e:
+                attempt += 1
+                if (
+                    e.error_code != "AI_RATE_LIMIT"
+                    or attempt >= self.RATE_LIMIT_RETRIES
+                ):
+                    raise
+                delay = random.uniform(0, min(self.RATE_LIMIT_MAX_WAIT, 2**attempt))
+                logfire.warning(f"API调用频率超限，{delay:.1f}秒后重试")
+                await asyncio.sleep(delay)
 
     async def summarize_document(
         self,
@@ -191,62 +326,85 @@ class DocumentSummarizer:
     ) -> SummaryResult:
         """生成单个文档摘要"""
         try:
-            doc_info = self.extract_document_content(file_path)
-
-            cache_key = f"{file_path}:{target_length}:{language}"
-            if use_cache and cache_key in self._summary_cache:
-                logfire.info(f"使用缓存摘要: {file_path}")
-                return SummaryResult(
-                    file_path=file_path,
-                    summary=self._summary_cache[cache_key],
-                    word_count=doc_info.word_count,
-                    summary_length=len(self._summary_cache[cache_key]),
-                    doc_type=doc_info.doc_type,
-                    cached=True,
-                )
-
-            prompt = PromptManager.format(
-                "document_summarize",
+            prepared = await self._prepare_document(file_path, target_length, language)
+        except Exception as e:
+            return self._error_result(file_path, e)
+        return await self._summarize_prepared(prepared, use_cache)
+
+    async def _prepare_document(
+        self, file_path: Path, target_length: int, language: str
+    ) -> _PreparedDocument:
+        """提取文档内容并生成prompt，之后只保留生成摘要所需的字段"""
+        # PDF/Word解析可能耗时数秒，放到线程池避免阻塞其他并发请求
+        doc_info = await asyncio.to_thread(self.extract_document_content, file_path)
+        return _PreparedDocument(
+            file_path=file_path,
+            doc_type=doc_info.doc_type,
+            word_count=doc_info.word_count,
+            cache_key=self._cache_key(doc_info.content, target_length, language),
+            prompt=self._prompt_formatter(target_length)(
                 title=doc_info.title,
                 doc_type=doc_info.doc_type,
                 word_count=doc_info.word_count,
                 content=doc_info.content,
-                length=target_length,
+            ),
+        )
+
+    async def _summarize_prepared(
+        self, doc: _PreparedDocument, use_cache: bool
+    ) -> SummaryResult:
+        """为已提取的文档生成摘要（依次查询缓存、进行中的请求，最后调用API）"""
+        try:
+            cached_summary = (
+                self._get_cached_summary(doc.cache_key) if use_cache else None
             )
+            if cached_summary is not None:
+                logfire.info(f"使用缓存摘要: {doc.file_path}")
+                return self._success_result(doc, cached_summary, cached=True)
+
+            pending = self._pending_summaries.get(doc.cache_key) if use_cache else None
+            if pending is not None:
+                # 相同内容的文档正在生成摘要（如批量中的重复文件），等待其结果即可
+                logfire.info(f"复用相同内容文档的摘要: {doc.file_path}")
+                summary = await asyncio.shield(pending)
+                return self._success_result(doc, summary, cached=True)
 
             with logfire.span(
                 "summarize_document",
                 attributes={
-                    "file": str(file_path),
-                    "doc_type": doc_info.doc_type,
-                    "word_count": doc_info.word_count,
+                    "file": str(doc.file_path),
+                    "doc_type": doc.doc_type,
+                    "word_count": doc.word_count,
                 },
             ):
-                summary = await self.client.simple_chat(prompt)
-                summary = summary.strip().strip('"').strip("'")
+                request = asyncio.ensure_future(self._generate_summary(doc.prompt))
+                if use_cache:
+                    self._pending_summaries[doc.cache_key] = request
+                try:
+                    summary = await request
+                finally:
+                    if use_cache:
+                        self._pending_summaries.pop(doc.cache_key, None)
 
                 if use_cache:
-                    self._summary_cache[cache_key] = summary
-
-                return SummaryResult(
-                    file_path=file_path,
-                    summary=summary,
-                    word_count=doc_info.word_count,
-                    summary_length=len(summary),
-                    doc_type=doc_info.doc_type,
-                    cached=False,
-                )
+                    self._set_cached_summary(doc.cache_key, summary)
+
+                return self._success_result(doc, summary, cached=False)
 
         except Exception as e:
-            logfire.error(f"文档摘要生成失败: {file_path} - {e}")
-            return SummaryResult(
-                file_path=file_path,
-                summary="",
-                word_count=0,
-                summary_length=0,
-                doc_type="unknown",
-                error=str(e),
-            )
+            return self._error_result(doc.file_path, e)
+
+    def _error_result(self, file_path: Path, error: Exception) -> SummaryResult:
+        """生成失败的摘要结果"""
+        logfire.error(f"文档摘要生成失败: {file_path} - {error}")
+        return SummaryResult(
+            file_path=file_path,
+            summary="",
+            word_count=0,
+            summary_length=0,
+            doc_type="unknown",
+            error=str(error),
+        )
 
     async def summarize_batch(
         self,
@@ -255,40 +413,68 @@ class DocumentSummarizer:
         language: str = "zh",
         max_concurrent: int = 3,
         use_cache: bool = True,
+        requests_per_minute: int = 500,
     ) -> BatchSummaryResult:
         """批量生成文档摘要
 
+        文档提取与摘要请求流水线执行：提取任务把处理好的文档放入有界队列，
+        摘要任务从队列取出后只负责调用API，等待响应期间后续文档已在提取。
+
         Args:
             file_paths: 需要处理的文件路径列表
             target_length: 目标摘要长度
             language: 生成语言
-            max_concurrent: 最大并发数
+            max_concurrent: 同时进行的摘要请求数，默认保守取值，按API额度调高
             use_cache: 是否使用缓存
+            requests_per_minute: 每分钟最多发起的摘要请求数
 
         Returns:
             BatchSummaryResult: 批量处理结果
 
         """
         result = BatchSummaryResult(total=len(file_paths))
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def summarize_with_limit(file_path: Path) -> SummaryResult:
-            async with semaphore:
-                return await self.summarize_document(
-                    file_path, target_length, language, use_cache
+        if not file_paths:
+            return result
+
+        # 摘要任务数即同时进行的请求数，令牌桶限制请求速率
+        summarize_workers = min(max_concurrent, len(file_paths))
+        extract_workers = min(summarize_workers, os.cpu_count() or 1)
+        limiter = RateLimiter(requests_per_minute, 60)
+        queue: _PreparedQueue = asyncio.Queue(maxsize=max_concurrent * 2)
+        pending_paths = iter(enumerate(file_paths))
+        # 结果按输入顺序放回，保持输出顺序稳定
+        summaries: list[Optional[SummaryResult]] = [None] * len(file_paths)
+
+        async def extract_all() -> None:
+            await asyncio.gather(
+                *(
+                    self._extract_worker(pending_paths, queue, target_length, language)
+                    for _ in range(extract_workers)
                 )
+            )
+            # 提取完成后通知每个摘要任务结束
+            for _ in range(summarize_workers):
+                await queue.put(None)
 
         with logfire.span(
             "batch_summarize",
             attributes={
                 "file_count": len(file_paths),
                 "max_concurrent": max_concurrent,
+                "requests_per_minute": requests_per_minute,
             },
         ):
-            tasks = [summarize_with_limit(fp) for fp in file_paths]
-            summaries = await asyncio.gather(*tasks)
+            await asyncio.gather(
+                extract_all(),
+                *(
+                    self._summarize_worker(queue, limiter, use_cache, summaries)
+                    for _ in range(summarize_workers)
+                ),
+            )
 
             for summary in summaries:
+                if summary is None:
+                    continue
                 result.results.append(summary)
                 if summary.error:
                     result.failed += 1
@@ -299,6 +485,42 @@ class DocumentSummarizer:
 
         return result
 
+    async def _extract_worker(
+        self,
+        pending_paths: Iterator[tuple[int, Path]],
+        queue: _PreparedQueue,
+        target_length: int,
+        language: str,
+    ) -> None:
+        """批量摘要的提取任务：依次取出待处理文件，提取后放入队列"""
+        for index, file_path in pending_paths:
+            prepared: Union[_PreparedDocument, SummaryResult]
+            try:
+                prepared = await self._prepare_document(
+                    file_path, target_length, language
+                )
+            except Exception as e:
+                prepared = self._error_result(file_path, e)
+            await queue.put((index, prepared))
+
+    async def _summarize_worker(
+        self,
+        queue: _PreparedQueue,
+        limiter: RateLimiter,
+        use_cache: bool,
+        summaries: list[Optional[SummaryResult]],
+    ) -> None:
+        """批量摘要的请求任务：从队列取出已提取的文档生成摘要，直到收到结束标记"""
+        while (item := await queue.get()) is not None:
+            index, prepared = item
+            del item
+            if isinstance(prepared, SummaryResult):
+                summaries[index] = prepared
+                continue
+            async with limiter:
+                summaries[index] = await self._summarize_prepared(prepared, use_cache)
+            del prepared
+
     def save_summaries(
         self, results: list[SummaryResult], output_path: Path, format: str = "json"
     ) -> None:
@@ -331,8 +553,10 @@ class DocumentSummarizer:
                     }
                 )
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 先整体序列化再一次写入，json.dump会把输出拆成大量小块逐个写入
+        output_path.write_text(
+            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
 
     def _save_as_markdown(
         self, results: list[SummaryResult], output_path: Path
@@ -1,15 +1,66 @@
 """文本替换智能分析器 - 提供替换操作的风险分析和建议."""
 
 import asyncio
+import atexit
+import json
 import re
+import threading
 from typing import Optional
 
 import logfire
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from .config import AIConfig, get_ai_config
 from .deepseek_client import DeepSeekClient, DeepSeekResponse
 
+# 基础分析用到的常量，模块加载时构建一次
+_SPECIAL_CHAR_RE = re.compile(r"[^\w\s]")
+
+# 常见的"作为其他单词子串"的词及受影响的示例
+_COMMON_WORDS_WITH_SUBSTRING = {
+    "bug": ["debug", "bugfix", "debugger"],
+    "test": ["testing", "tested", "contest"],
+    "class": ["classname", "classification", "subclass"],
+    "log": ["login", "dialog", "catalog"],
+    "port": ["import", "export", "support"],
+}
+
+
+# 同步调用使用的事件循环，每个线程各有一个，多个线程同时调用时互不干扰
+_sync_local = threading.local()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """获取当前线程同步调用共用的事件循环，首次使用时创建并在进程退出时关闭."""
+    loop: Optional[asyncio.AbstractEventLoop] = getattr(_sync_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _sync_local.loop = asyncio.new_event_loop()
+        atexit.register(_close_sync_loop, loop)
+    return loop
+
+
+def _close_sync_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """先关闭共享客户端在该循环上的HTTP连接池，再关闭循环."""
+    if not loop.is_closed():
+        for client in list(_shared_clients.values()):
+            loop.run_until_complete(client.aclose())
+        loop.close()
+
+
+# 按配置共享的DeepSeek客户端，多个分析器实例复用同一个HTTP连接池
+_shared_clients: dict[tuple[Optional[str], str], DeepSeekClient] = {}
+
+
+def _get_shared_client(config: AIConfig) -> DeepSeekClient:
+    """获取与配置对应的共享客户端，配置相同的分析器共用一个实例."""
+    # SecretStr序列化时会被掩码，密钥需要单独取出参与比较
+    api_key = config.api_key.get_secret_value() if config.api_key else None
+    key = (api_key, config.model_dump_json(exclude={"api_key"}))
+    client = _shared_clients.get(key)
+    if client is None:
+        client = _shared_clients[key] = DeepSeekClient(config)
+    return client
+
 
 class ReplacePattern(BaseModel):
     """替换模式信息."""
@@ -32,6 +83,10 @@ class ReplaceRisk(BaseModel):
     suggestion: Optional[str] = Field(None, description="改进建议")
 
 
+# AI返回的风险列表一次性校验，避免逐个构造模型
+_RISK_LIST_ADAPTER = TypeAdapter(list[ReplaceRisk])
+
+
 class ReplaceAnalysis(BaseModel):
     """替换分析结果."""
 
@@ -66,7 +121,7 @@ class TextAnalyzer:
     def __init__(self, ai_config: Optional[AIConfig] = None):
         """初始化文本分析器."""
         self.ai_config = ai_config or get_ai_config()
-        self.client = DeepSeekClient(self.ai_config)
+        self.client = _get_shared_client(self.ai_config)
 
     async def analyze_replace_pattern(
         self,
@@ -140,16 +195,8 @@ class TextAnalyzer:
             )
 
         if pattern.old_text.isalnum():
-            common_words_with_substring = {
-                "bug": ["debug", "bugfix", "debugger"],
-                "test": ["testing", "tested", "contest"],
-                "class": ["classname", "classification", "subclass"],
-                "log": ["login", "dialog", "catalog"],
-                "port": ["import", "export", "support"],
-            }
-
-            if pattern.old_text.lower() in common_words_with_substring:
-                affected = common_words_with_substring[pattern.old_text.lower()]
+            affected = _COMMON_WORDS_WITH_SUBSTRING.get(pattern.old_text.lower())
+            if affected is not None:
                 risks.append(
                     ReplaceRisk(
                         level="high",
@@ -159,7 +206,7 @@ class TextAnalyzer:
                     )
                 )
 
-        special_chars = set(re.findall(r"[^\w\s]", pattern.old_text))
+        special_chars = set(_SPECIAL_CHAR_RE.findall(pattern.old_text))
         if special_chars:
             risks.append(
                 ReplaceRisk(
@@ -235,23 +282,23 @@ class TextAnalyzer:
             )
 
             try:
-                import json
-
                 data = json.loads(content)
             except json.JSONDecodeError:
                 logfire.warning("无法解析AI响应为JSON")
                 return self._basic_analysis(pattern)
 
-            risks = []
-            for risk_data in data.get("risks", []):
-                risks.append(
-                    ReplaceRisk(
-                        level=risk_data.get("level", "medium"),
-                        reason=risk_data.get("reason", "未知风险"),
-                        example=risk_data.get("example"),
-                        suggestion=risk_data.get("suggestion"),
-                    )
-                )
+            # 先补齐默认值，再对整个列表做一次批量校验
+            risks = _RISK_LIST_ADAPTER.validate_python(
+                [
+                    {
+                        "level": risk_data.get("level", "medium"),
+                        "reason": risk_data.get("reason", "未知风险"),
+                        "example": risk_data.get("example"),
+                        "suggestion": risk_data.get("suggestion"),
+                    }
+                    for risk_data in data.get("risks", [])
+                ]
+            )
 
             return ReplaceAnalysis(
                 pattern=pattern,
@@ -272,17 +319,16 @@ class TextAnalyzer:
         sample_content: Optional[str] = None,
         file_extensions: Optional[list[str]] = None,
     ) -> ReplaceAnalysis:
-        """同步版本的分析方法（供CLI使用）."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(
-                self.analyze_replace_pattern(
-                    old_text, new_text, sample_content, file_extensions
-                )
+        """同步版本的分析方法（供CLI使用）.
+
+        复用当前线程的事件循环，多次调用时不再重复创建循环，
+        客户端的HTTP连接池也能跨调用复用。
+        """
+        return _get_sync_loop().run_until_complete(
+            self.analyze_replace_pattern(
+                old_text, new_text, sample_content, file_extensions
             )
-        finally:
-            loop.close()
+        )
 
 
 def format_risk_display(analysis: ReplaceAnalysis) -> str:
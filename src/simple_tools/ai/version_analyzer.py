@@ -3,76 +3,133 @@
 用于分析重复文件之间的版本关系，提供智能保留建议。
 """
 
+import asyncio
+import json
+import os
 import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from itertools import combinations
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Optional
 
 import logfire
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field, field_serializer
 
 from ..ai.config import AIConfig
 from ..ai.deepseek_client import DeepSeekClient, DeepSeekMessage
 from ..ai.prompts import prompt_manager
+from ..utils.version_cache import VersionCache
+
+# 文件名解析用到的正则，模块加载时编译一次
+_VERSION_STRIP_RE = re.compile(r"[_-]?v?\d+(?:\.\d+)?", re.IGNORECASE)
+_DATE_STRIP_RE = re.compile(r"\d{4}[-_]?\d{2}[-_]?\d{2}")
+_PAREN_RE = re.compile(r"\([^)]+\)")
+_BRACKET_RE = re.compile(r"\[[^\]]+\]")
+_VERSION_SEARCH_RE = re.compile(r"v?(\d+(?:\.\d+)?)", re.IGNORECASE)
+_DATE_SEARCH_RE = re.compile(r"(\d{4}[-_]?\d{2}[-_]?\d{2})")
+_VERSION_NUMBER_RE = re.compile(r"v?(\d+)(?:\.(\d+))?")
+
+# 特殊版本标识，按优先级排列；一次扫描找出全部命中后取优先级最高的
+_VERSION_KEYWORDS = (
+    "final",
+    "最终",
+    "latest",
+    "最新",
+    "new",
+    "old",
+    "备份",
+    "backup",
+    "copy",
+    "副本",
+)
+_KEYWORD_PRIORITY = {keyword: i for i, keyword in enumerate(_VERSION_KEYWORDS)}
+_KEYWORD_RE = re.compile("|".join(_VERSION_KEYWORDS))
+
+# 可以读取内容预览发给AI的文本文件类型
+_PREVIEW_EXTENSIONS = frozenset({".txt", ".md", ".json", ".yml", ".yaml"})
+_PREVIEW_CHARS = 200
+
+
+def _read_preview(path: Path) -> Optional[str]:
+    """读取文件开头作为预览，读取失败时返回None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read(_PREVIEW_CHARS)
+    except Exception:
+        return None
 
 
-class FileVersion(BaseModel):
-    """文件版本信息."""
+@dataclass(slots=True, frozen=True)
+class FileVersion:
+    """文件版本信息（数据来自本地stat，不做Pydantic校验）."""
 
     path: Path
     size: int
     modified_time: float
-    name_pattern: str = Field(default="", description="文件名模式")
-    version_indicator: Optional[str] = Field(None, description="版本标识")
-    content_preview: Optional[str] = Field(None, description="内容预览")
+    name_pattern: str = ""  # 文件名模式
+    version_indicator: Optional[str] = None  # 版本标识
+    content_preview: Optional[str] = None  # 内容预览
+    # 版本评分（越高越可能是最新版本），构造时计算一次
+    version_score: float = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """计算版本评分."""
+        object.__setattr__(self, "version_score", self._compute_version_score())
 
-    @computed_field
     @property
     def modified_datetime(self) -> datetime:
-        """修改时间的datetime对象."""
+        """修改时间的datetime对象（按需构造）."""
         return datetime.fromtimestamp(self.modified_time)
 
-    @computed_field
-    @property
-    def version_score(self) -> float:
-        """版本评分（越高越可能是最新版本）."""
+    def _compute_version_score(self) -> float:
+        """计算版本评分."""
         score = 0.0
 
         # 时间分数（越新分数越高）
         time_score = self.modified_time / 1e10  # 归一化
         score += time_score * 0.3
 
-        # 版本标识分数
+        # 版本标识分数（标识和文件名模式各只转一次小写）
         if self.version_indicator:
-            if "final" in self.version_indicator.lower():
+            indicator = self.version_indicator.lower()
+            if "final" in indicator:
                 score += 1.0
-            elif "v" in self.version_indicator.lower():
+            elif "v" in indicator:
                 # 提取版本号
-                match = re.search(r"v?(\d+)(?:\.(\d+))?", self.version_indicator)
+                match = _VERSION_NUMBER_RE.search(self.version_indicator)
                 if match:
                     major = int(match.group(1))
                     minor = int(match.group(2) or 0)
                     score += (major * 10 + minor) / 100.0
-            elif any(
-                word in self.version_indicator.lower()
-                for word in ["new", "latest", "最新"]
-            ):
+            elif any(word in indicator for word in ("new", "latest", "最新")):
                 score += 0.8
-            elif any(
-                word in self.version_indicator.lower()
-                for word in ["old", "backup", "备份"]
-            ):
+            elif any(word in indicator for word in ("old", "backup", "备份")):
                 score -= 0.5
 
-        # 文件名模式分数
-        if "副本" in self.name_pattern or "copy" in self.name_pattern.lower():
+        # 文件名模式分数（中文不受大小写转换影响，统一在小写串中查找）
+        pattern = self.name_pattern.lower()
+        if "副本" in pattern or "copy" in pattern:
             score -= 0.3
-        if "backup" in self.name_pattern.lower() or "备份" in self.name_pattern:
+        if "backup" in pattern or "备份" in pattern:
             score -= 0.5
 
         return score
 
 
+# 排序键：直接读取预先计算好的版本评分
+_VERSION_SCORE = attrgetter("version_score")
+
+
+# FileVersion的输入字段，版本评分在构造时计算，序列化时与修改时间一起追加在末尾
+_FILE_VERSION_FIELDS = tuple(
+    f.name for f in fields(FileVersion) if f.name != "version_score"
+)
+
+
 class VersionRelation(BaseModel):
     """版本关系."""
 
@@ -94,22 +151,50 @@ class VersionAnalysis(BaseModel):
     recommended_keep: Optional[Path] = None
     confidence: float = Field(0.0, description="建议置信度 0-1")
 
+    @field_serializer("files")
+    def _serialize_files(self, files: list[FileVersion]) -> list[dict[str, Any]]:
+        """序列化文件列表，输出中保留修改时间和版本评分."""
+        return [
+            {
+                **{name: getattr(fv, name) for name in _FILE_VERSION_FIELDS},
+                "modified_datetime": fv.modified_datetime,
+                "version_score": fv.version_score,
+            }
+            for fv in files
+        ]
+
 
 class VersionAnalyzer:
     """文件版本分析器."""
 
-    def __init__(self, ai_config: Optional[AIConfig] = None):
-        """初始化版本分析器."""
+    def __init__(
+        self,
+        ai_config: Optional[AIConfig] = None,
+        cache: Optional[VersionCache] = None,
+    ):
+        """初始化版本分析器.
+
+        Args:
+            ai_config: AI配置
+            cache: 可选的磁盘缓存，用于跨运行复用文件预览和AI分析结果
+
+        """
         self.ai_config = ai_config or AIConfig()
+        self.cache = cache
         self.ai_client = None
         if self.ai_config.enabled and self.ai_config.api_key:
             self.ai_client = DeepSeekClient(self.ai_config)
 
-    def analyze_file_group(self, file_paths: list[Path]) -> VersionAnalysis:
+    def analyze_file_group(
+        self,
+        file_paths: list[Path],
+        stats: Optional[dict[Path, os.stat_result]] = None,
+    ) -> VersionAnalysis:
         """分析一组文件的版本关系.
 
         Args:
             file_paths: 文件路径列表
+            stats: 调用方扫描时已获取的文件状态，命中时不再重复stat
 
         Returns:
             版本分析结果
@@ -119,7 +204,17 @@ class VersionAnalyzer:
             "analyze_file_group", attributes={"file_count": len(file_paths)}
         ):
             # 收集文件信息
-            file_versions = self._collect_file_info(file_paths)
+            file_versions = self._collect_file_info(file_paths, stats)
+
+            # 不足两个文件时不存在版本关系，无需计算相似度
+            if len(file_versions) < 2:
+                return VersionAnalysis(
+                    files=file_versions,
+                    similarity_score=0.0,
+                    has_version_relation=False,
+                    recommended_keep=file_versions[0].path if file_versions else None,
+                    confidence=1.0,
+                )
 
             # 计算文件名相似度
             similarity_score = self._calculate_name_similarity(file_versions)
@@ -143,31 +238,31 @@ class VersionAnalyzer:
 
             return analysis
 
-    async def analyze_with_ai(self, file_paths: list[Path]) -> VersionAnalysis:
+    async def analyze_with_ai(
+        self,
+        file_paths: list[Path],
+        stats: Optional[dict[Path, os.stat_result]] = None,
+    ) -> VersionAnalysis:
         """使用AI分析文件版本关系.
 
         Args:
             file_paths: 文件路径列表
+            stats: 调用方扫描时已获取的文件状态，命中时不再重复stat
 
         Returns:
             增强的版本分析结果
 
         """
         # 先进行基础分析
-        analysis = self.analyze_file_group(file_paths)
+        analysis = self.analyze_file_group(file_paths, stats)
 
-        if not self.ai_client:
+        # 单个文件无需比较，不请求AI
+        if not self.ai_client or len(analysis.files) < 2:
             return analysis
 
         try:
-            # 准备AI分析数据
-            files_info = self._prepare_ai_files_info(analysis.files)
-
-            # 构建AI提示
-            prompt = self._build_ai_prompt(files_info, analysis)
-
-            # 调用AI获取响应
-            ai_result = await self._call_ai_for_analysis(prompt)
+            # 获取AI分析结果（文件未变化时复用缓存）
+            ai_result = await self._get_ai_result(analysis)
 
             # 更新分析结果
             self._update_analysis_with_ai_result(analysis, ai_result)
@@ -187,12 +282,44 @@ class VersionAnalyzer:
 
         return analysis
 
-    def _collect_file_info(self, file_paths: list[Path]) -> list[FileVersion]:
-        """收集文件信息."""
+    async def _get_ai_result(self, analysis: VersionAnalysis) -> dict[str, Any]:
+        """获取AI分析结果，文件未变化时直接使用磁盘缓存."""
+        group_key = None
+        if self.cache:
+            group_key = VersionCache.group_key(
+                ((fv.path, fv.size, fv.modified_time) for fv in analysis.files),
+                salt=self.ai_config.model,
+            )
+            cached = self.cache.get_ai_result(group_key)
+            if cached is not None:
+                logfire.info("使用缓存的AI版本分析结果")
+                return cached
+
+        # 准备AI分析数据
+        files_info = await self._prepare_ai_files_info(analysis.files)
+
+        # 构建AI提示
+        prompt = self._build_ai_prompt(files_info, analysis)
+
+        # 调用AI获取响应
+        ai_result = await self._call_ai_for_analysis(prompt)
+
+        if self.cache and group_key and ai_result:
+            self.cache.set_ai_result(group_key, ai_result)
+        return ai_result
+
+    def _collect_file_info(
+        self,
+        file_paths: list[Path],
+        stats: Optional[dict[Path, os.stat_result]] = None,
+    ) -> list[FileVersion]:
+        """收集文件信息（优先使用调用方提供的文件状态）."""
         versions = []
         for path in file_paths:
             try:
-                stat = path.stat()
+                stat = stats.get(path) if stats else None
+                if stat is None:
+                    stat = path.stat()
                 version = FileVersion(
                     path=path,
                     size=stat.st_size,
@@ -211,40 +338,28 @@ class VersionAnalyzer:
     def _extract_name_pattern(self, filename: str) -> str:
         """提取文件名模式."""
         # 移除版本号
-        pattern = re.sub(r"[_-]?v?\d+(?:\.\d+)?", "", filename, flags=re.IGNORECASE)
+        pattern = _VERSION_STRIP_RE.sub("", filename)
         # 移除日期
-        pattern = re.sub(r"\d{4}[-_]?\d{2}[-_]?\d{2}", "", pattern)
+        pattern = _DATE_STRIP_RE.sub("", pattern)
         # 移除括号内容
-        pattern = re.sub(r"\([^)]+\)", "", pattern)
-        pattern = re.sub(r"\[[^\]]+\]", "", pattern)
+        pattern = _PAREN_RE.sub("", pattern)
+        pattern = _BRACKET_RE.sub("", pattern)
         return pattern.strip()
 
     def _extract_version_indicator(self, filename: str) -> Optional[str]:
         """提取版本标识."""
         # 查找版本号
-        version_match = re.search(r"v?(\d+(?:\.\d+)?)", filename, re.IGNORECASE)
+        version_match = _VERSION_SEARCH_RE.search(filename)
         if version_match:
             return version_match.group(0)
 
-        # 查找特殊标识
-        indicators = [
-            "final",
-            "最终",
-            "latest",
-            "最新",
-            "new",
-            "old",
-            "备份",
-            "backup",
-            "copy",
-            "副本",
-        ]
-        for indicator in indicators:
-            if indicator in filename.lower():
-                return indicator
+        # 查找特殊标识（多个命中时按优先级返回）
+        keywords: list[str] = _KEYWORD_RE.findall(filename.lower())
+        if keywords:
+            return min(keywords, key=_KEYWORD_PRIORITY.__getitem__)
 
         # 查找日期
-        date_match = re.search(r"(\d{4}[-_]?\d{2}[-_]?\d{2})", filename)
+        date_match = _DATE_SEARCH_RE.search(filename)
         if date_match:
             return date_match.group(0)
 
@@ -255,20 +370,32 @@ class VersionAnalyzer:
         if len(versions) < 2:
             return 0.0
 
-        # 获取所有文件名模式
-        patterns = [v.name_pattern for v in versions]
+        # 同组文件去掉版本号后模式大多相同，按不同模式及其出现次数计算
+        pattern_counts = Counter(v.name_pattern.lower() for v in versions)
 
-        # 计算平均相似度
-        total_similarity = 0.0
-        comparisons = 0
+        # 相同模式之间相似度为1（空模式为0）
+        total_similarity = float(
+            sum(
+                count * (count - 1) // 2
+                for pattern, count in pattern_counts.items()
+                if pattern
+            )
+        )
 
-        for i in range(len(patterns)):
-            for j in range(i + 1, len(patterns)):
-                similarity = self._string_similarity(patterns[i], patterns[j])
-                total_similarity += similarity
-                comparisons += 1
+        # 每个不同模式只统计一次字符频次，两两比较时直接求多重集交集
+        # （与_string_similarity的算法一致）
+        profiles = [
+            (Counter(pattern), len(pattern), count)
+            for pattern, count in pattern_counts.items()
+        ]
+        for (chars1, len1, count1), (chars2, len2, count2) in combinations(profiles, 2):
+            avg_len = (len1 + len2) / 2
+            if avg_len > 0:
+                common_len = (chars1 & chars2).total()
+                total_similarity += count1 * count2 * common_len / avg_len
 
-        return total_similarity / comparisons if comparisons > 0 else 0.0
+        comparisons = len(versions) * (len(versions) - 1) // 2
+        return total_similarity / comparisons
 
     def _string_similarity(self, s1: str, s2: str) -> float:
         """计算字符串相似度（简单实现）."""
@@ -282,10 +409,8 @@ class VersionAnalyzer:
         if s1 == s2:
             return 1.0
 
-        # 计算公共子串长度
-        common_len = 0
-        for char in set(s1):
-            common_len += min(s1.count(char), s2.count(char))
+        # 公共字符数：两个字符频次的多重集交集大小，各统计一次即可
+        common_len = (Counter(s1) & Counter(s2)).total()
 
         # 相似度 = 公共字符数 / 平均长度
         avg_len = (len(s1) + len(s2)) / 2
@@ -304,7 +429,7 @@ class VersionAnalyzer:
             return False, None
 
         # 按版本分数排序
-        sorted_versions = sorted(versions, key=lambda v: v.version_score, reverse=True)
+        sorted_versions = sorted(versions, key=_VERSION_SCORE, reverse=True)
 
         # 确定基础文件（分数最高的）
         base_file = sorted_versions[0]
@@ -314,19 +439,16 @@ class VersionAnalyzer:
         relation_type = "version"  # 默认为版本关系
         confidence = 0.7
 
+        # 派生文件路径只转一次小写，供下面两项检查共用
+        derived_paths = [str(f.path).lower() for f in derived_files]
+
         # 检查是否为备份关系
-        if any(
-            "backup" in str(f.path).lower() or "备份" in str(f.path)
-            for f in derived_files
-        ):
+        if any("backup" in p or "备份" in p for p in derived_paths):
             relation_type = "backup"
             confidence = 0.9
 
         # 检查是否为副本关系
-        elif any(
-            "copy" in str(f.path).lower() or "副本" in str(f.path)
-            for f in derived_files
-        ):
+        elif any("copy" in p or "副本" in p for p in derived_paths):
             relation_type = "copy"
             confidence = 0.85
 
@@ -341,26 +463,48 @@ class VersionAnalyzer:
 
         return True, relation
 
-    def _prepare_ai_files_info(self, files: list[FileVersion]) -> list[dict[str, Any]]:
-        """准备AI分析所需的文件信息."""
+    async def _prepare_ai_files_info(
+        self, files: list[FileVersion]
+    ) -> list[dict[str, Any]]:
+        """准备AI分析所需的文件信息（文件预览在线程中并发读取）."""
+        previews = await asyncio.gather(
+            *(
+                self._load_preview(fv)
+                for fv in files
+                if fv.path.suffix in _PREVIEW_EXTENSIONS
+            )
+        )
+        preview_iter = iter(previews)
+
         files_info = []
         for fv in files:
-            info = {
+            info: dict[str, Any] = {
                 "name": fv.path.name,
                 "size": fv.size,
-                "modified": fv.modified_datetime.isoformat(),
+                "modified": time.strftime(
+                    "%Y-%m-%dT%H:%M:%S", time.localtime(fv.modified_time)
+                ),
                 "version_indicator": fv.version_indicator or "无",
             }
-            # 如果可能，读取文件开头
-            if fv.path.suffix in [".txt", ".md", ".json", ".yml", ".yaml"]:
-                try:
-                    with open(fv.path, encoding="utf-8") as f:
-                        info["preview"] = f.read(200)
-                except Exception:
-                    pass
+            if fv.path.suffix in _PREVIEW_EXTENSIONS:
+                preview = next(preview_iter)
+                if preview is not None:
+                    info["preview"] = preview
             files_info.append(info)
         return files_info
 
+    async def _load_preview(self, fv: FileVersion) -> Optional[str]:
+        """读取文件预览，文件未变化时使用磁盘缓存."""
+        if self.cache:
+            cached = self.cache.get_preview(fv.path, fv.size, fv.modified_time)
+            if cached is not None:
+                return cached
+
+        preview = await asyncio.to_thread(_read_preview, fv.path)
+        if self.cache and preview is not None:
+            self.cache.set_preview(fv.path, fv.size, fv.modified_time, preview)
+        return preview
+
     def _build_ai_prompt(
         self, files_info: list[dict[str, Any]], analysis: VersionAnalysis
     ) -> str:
@@ -389,8 +533,6 @@ class VersionAnalyzer:
         )
 
         # 解析AI响应
-        import json
-
         try:
             # 响应可能直接包含analysis字段，或者需要从content中解析
             if hasattr(response, "content"):
@@ -435,9 +577,8 @@ class VersionAnalyzer:
 
     def _generate_basic_recommendation(self, versions: list[FileVersion]) -> Path:
         """生成基础推荐."""
-        # 按版本分数排序，选择分数最高的
-        sorted_versions = sorted(versions, key=lambda v: v.version_score, reverse=True)
-        return sorted_versions[0].path
+        # 选择版本分数最高的（并列时取靠前的），只需线性扫描无需排序
+        return max(versions, key=_VERSION_SCORE).path
 
     def format_analysis_result(self, analysis: VersionAnalysis) -> str:
         """格式化分析结果为友好的展示文本."""
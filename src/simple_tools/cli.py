@@ -1,44 +1,79 @@
 """CLI主模块."""
 
 # 修改 src/simple_tools/cli.py
-from typing import Optional
+import importlib
+from typing import Any, Optional
 
 import click
 import logfire
 
+from simple_tools import _ensure_logfire_configured
 from simple_tools._typing import group, option, pass_context
 
 from .config import get_config
-from .core.batch_rename import rename_cmd
-from .core.duplicate_finder import duplicates_cmd
-from .core.file_organizer import organize_cmd
-from .core.file_tool import list_cmd
-from .core.summarize_cmd import summarize
-from .core.text_replace import replace_cmd
 from .utils.config_loader import ConfigLoader
-from .utils.smart_interactive import (
-    command_suggester,
-    operation_history,
-)
+
+# 子命令名 → (模块, 命令对象名)，只有执行到该命令时才导入对应模块
+LAZY_COMMANDS = {
+    "list": (".core.file_tool", "list_cmd"),
+    "duplicates": (".core.duplicate_finder", "duplicates_cmd"),
+    "rename": (".core.batch_rename", "rename_cmd"),
+    "replace": (".core.text_replace", "replace_cmd"),
+    "organize": (".core.file_organizer", "organize_cmd"),
+    "summarize": (".core.summarize_cmd", "summarize"),
+}
 
 
 # 自定义命令不存在时的错误处理
 class SmartGroup(click.Group):
-    """增强的命令组，提供智能命令建议."""
+    """增强的命令组，按需导入子命令并提供智能命令建议."""
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_commands: Optional[dict[str, tuple[str, str]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """初始化命令组.
+
+        Args:
+            *args: 传给click.Group的位置参数
+            lazy_commands: 延迟导入的子命令，命令名 → (模块, 命令对象名)
+            **kwargs: 传给click.Group的关键字参数
+
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """列出已注册和延迟导入的全部命令."""
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
 
     def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
         """获取命令，如果不存在则提供建议."""
         rv = click.Group.get_command(self, ctx, cmd_name)
+        if rv is None and cmd_name in self.lazy_commands:
+            rv = self._load_command(cmd_name)
         if rv is not None:
             return rv
 
         # 命令不存在，提供建议
+        from .utils.smart_interactive import command_suggester
+
         command_suggester.show_help(cmd_name, f"命令 '{cmd_name}' 不存在")
         ctx.fail(f"未知命令: {cmd_name}")
 
+    def _load_command(self, cmd_name: str) -> click.Command:
+        """导入子命令模块并注册命令，之后直接从已注册命令中获取."""
+        module_name, attr_name = self.lazy_commands[cmd_name]
+        module = importlib.import_module(module_name, __package__)
+        command: click.Command = getattr(module, attr_name)
+        self.add_command(command, name=cmd_name)
+        return command
+
 
 # 定义主 CLI
-@group(cls=SmartGroup)
+@group(cls=SmartGroup, lazy_commands=LAZY_COMMANDS)
 @option("-v", "--verbose", is_flag=True, help="显示详细日志信息")
 @option("-c", "--config", type=click.Path(exists=True), help="指定配置文件路径")
 @pass_context
@@ -68,9 +103,8 @@ def cli(ctx: click.Context, verbose: bool, config: Optional[str]) -> None:
     app_config = get_config()
     app_config.verbose = tool_config.verbose
 
-    # 使用Logfire记录命令执行
-    with logfire.span("cli_command", attributes={"verbose": tool_config.verbose}):
-        pass  # 实际操作在子命令中执行
+    # 使用Logfire记录命令执行（实际操作在子命令中执行，只需一条记录）
+    logfire.info("cli_command", attributes={"verbose": tool_config.verbose})
 
 
 # 定义 history 命令
@@ -85,6 +119,8 @@ def history_cmd(count: int, clear: bool) -> None:
       tools history -n 20        # 显示最近20条记录
       tools history --clear      # 清空历史记录
     """
+    from .utils.smart_interactive import operation_history
+
     if clear:
         if click.confirm("确定要清空所有历史记录吗？"):
             operation_history.clear()
@@ -95,15 +131,15 @@ def history_cmd(count: int, clear: bool) -> None:
         operation_history.show_recent(count)
 
 
-# 注册命令到CLI
-cli.add_command(list_cmd, name="list")
-cli.add_command(duplicates_cmd, name="duplicates")
-cli.add_command(rename_cmd, name="rename")
-cli.add_command(replace_cmd, name="replace")
-cli.add_command(organize_cmd, name="organize")
-cli.add_command(summarize, name="summarize")
+# 注册命令到CLI（其余子命令见 LAZY_COMMANDS，按需导入）
 cli.add_command(history_cmd, name="history")
 
 
-if __name__ == "__main__":
+def main() -> None:
+    """命令行入口：初始化Logfire后运行CLI."""
+    _ensure_logfire_configured()
     cli()
+
+
+if __name__ == "__main__":
+    main()
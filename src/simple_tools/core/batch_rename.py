@@ -1,11 +1,20 @@
 """批量重命名工具模块."""
 
+import ctypes
+import errno
+import fnmatch
 import os
 import re
 import shutil
+import sys
+import unicodedata
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 import click
 from rich.console import Console
@@ -15,6 +24,129 @@ from ..utils.errors import ToolError
 from ..utils.progress import ProgressTracker
 from ..utils.smart_interactive import smart_confirm_sync
 
+# 收集文件时跳过的目录
+_EXCLUDED_DIRS = frozenset(
+    {
+        ".venv",
+        "venv",
+        "env",  # 虚拟环境
+        ".git",
+        ".svn",
+        ".hg",  # 版本控制
+        "__pycache__",
+        ".pytest_cache",
+        ".mypy_cache",  # 缓存
+        "node_modules",
+        "dist",
+        "build",  # 构建目录
+        ".idea",
+        ".vscode",  # IDE配置
+        "site-packages",  # Python包目录
+    }
+)
+
+# 大小写转换用到的分隔符
+_CAMEL_SPLIT_RE = re.compile(r"[_\s-]+")
+_SNAKE_SUB_RE = re.compile(r"[\s-]+")
+
+
+@lru_cache(maxsize=64)
+def _compile_regex(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """编译用户提供的正则表达式，按 (模式, 标志) 缓存."""
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=64)
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """将通配符模式编译为匹配文件名的正则（Windows下忽略大小写，与glob一致）.
+
+    编译结果按模式缓存，长期运行的进程中重复使用同一过滤器时无需重新翻译。
+    """
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile(fnmatch.translate(pattern), flags)
+
+
+def _split_ext(filename: str) -> tuple[str, str]:
+    """拆分文件名和扩展名，结果与 os.path.splitext 一致.
+
+    参数只是文件名，不含目录，省去 splitext 对路径分隔符的处理。
+    以点开头的部分（如 .bashrc）不视为扩展名。
+    """
+    dot = filename.rfind(".")
+    if dot <= 0 or not filename[:dot].lstrip("."):
+        return filename, ""
+    return filename[:dot], filename[dot:]
+
+
+def _sort_paths(files: list[Path]) -> None:
+    """按与 Path 自身比较一致的顺序原地排序.
+
+    直接比较 Path 会在每次比较时调用Python层的 __lt__；以各级名称元组作为
+    排序键只需取N次，比较在C中完成。Windows 下 Path 比较忽略大小写。
+    """
+    if os.name == "nt":
+        files.sort(key=lambda path: tuple(part.lower() for part in path.parts))
+    else:
+        files.sort(key=attrgetter("parts"))
+
+
+def _load_renameat2() -> Optional[Any]:
+    """加载 Linux 的 renameat2，不可用时返回None."""
+    if sys.platform != "linux":
+        return None
+    try:
+        func = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_uint,
+    ]
+    func.restype = ctypes.c_int
+    return func
+
+
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+_renameat2 = _load_renameat2()
+
+
+def _try_rename_noreplace(src: Path, dst: Path) -> bool:
+    """重命名文件但不覆盖已存在的目标.
+
+    检查目标和重命名在一次系统调用中完成：Linux 使用
+    renameat2(RENAME_NOREPLACE)，Windows 的 os.rename 本身不会覆盖目标。
+
+    Returns:
+        已完成重命名时返回True；目标已存在或当前平台、文件系统不支持时
+        返回False，文件保持不变，由调用方先检查再重命名
+
+    """
+    if os.name == "nt":
+        try:
+            os.rename(src, dst)
+        except FileExistsError:
+            return False
+        return True
+
+    if _renameat2 is None:
+        return False
+    if (
+        _renameat2(
+            _AT_FDCWD, os.fsencode(src), _AT_FDCWD, os.fsencode(dst), _RENAME_NOREPLACE
+        )
+        == 0
+    ):
+        return True
+    err = ctypes.get_errno()
+    if err in (errno.EEXIST, errno.EINVAL, errno.ENOSYS):
+        # 目标已存在，或文件系统不支持 RENAME_NOREPLACE
+        return False
+    raise OSError(err, os.strerror(err), str(src), None, str(dst))
+
 
 @dataclass
 class RenameConfig:
@@ -35,9 +167,10 @@ class RenameConfig:
     exclude_pattern: Optional[str] = None
     max_depth: int = 10
     interactive: bool = True
+    parallel: bool = True  # 文件较多时并发执行重命名
 
 
-@dataclass
+@dataclass(slots=True)
 class RenameItem:
     """重命名项."""
 
@@ -62,6 +195,9 @@ class RenameResult:
 class BatchRename:
     """批量重命名工具."""
 
+    # 重命名项不少于该数量时用线程池并发执行
+    PARALLEL_MIN_ITEMS = 32
+
     def __init__(self, console: Optional[Console] = None):
         """初始化 BatchRename."""
         self.console = console or Console()
@@ -84,6 +220,7 @@ class BatchRename:
         exclude_pattern: Optional[str] = None,
         max_depth: int = 10,
         interactive: bool = True,
+        parallel: bool = True,
         **kwargs: Any,
     ) -> RenameResult:
         """批量重命名文件."""
@@ -103,6 +240,7 @@ class BatchRename:
             exclude_pattern,
             max_depth,
             interactive,
+            parallel,
         )
 
         # 获取文件列表
@@ -157,6 +295,7 @@ class BatchRename:
         exclude_pattern: Optional[str],
         max_depth: int,
         interactive: bool,
+        parallel: bool = True,
     ) -> RenameConfig:
         """创建重命名配置."""
         # 修复数字模式的参数处理
@@ -183,6 +322,7 @@ class BatchRename:
             exclude_pattern=exclude_pattern,
             max_depth=max_depth,
             interactive=interactive,
+            parallel=parallel,
         )
 
     def _confirm_operation(self, rename_plan: list[RenameItem]) -> bool:
@@ -205,99 +345,93 @@ class BatchRename:
             raise ToolError(f"目录不存在: {directory}")
 
         excluded_dirs = self._get_excluded_dirs()
+        # 排除模式在收集时直接应用，不再额外遍历一遍文件列表
+        exclude = (
+            _compile_regex(config.exclude_pattern).search
+            if config.exclude_pattern
+            else None
+        )
 
-        if config.recursive:
-            files = self._collect_files_recursive(dir_path, config, excluded_dirs)
-        else:
-            files = self._collect_files_non_recursive(dir_path, config, excluded_dirs)
-
-        # 应用排除模式过滤
-        files = self._apply_exclude_pattern(files, config.exclude_pattern)
+        max_depth = config.max_depth if config.recursive else 1
+        files = self._collect_files(dir_path, max_depth, config, excluded_dirs, exclude)
 
-        return sorted(files)
+        _sort_paths(files)
+        return files
 
-    def _get_excluded_dirs(self) -> set[str]:
+    def _get_excluded_dirs(self) -> frozenset[str]:
         """获取排除的目录列表."""
-        return {
-            ".venv",
-            "venv",
-            "env",  # 虚拟环境
-            ".git",
-            ".svn",
-            ".hg",  # 版本控制
-            "__pycache__",
-            ".pytest_cache",
-            ".mypy_cache",  # 缓存
-            "node_modules",
-            "dist",
-            "build",  # 构建目录
-            ".idea",
-            ".vscode",  # IDE配置
-            "site-packages",  # Python包目录
-        }
-
-    def _should_exclude_file(self, file_path: Path, excluded_dirs: set[str]) -> bool:
-        """检查是否应该排除文件."""
-        return any(excluded in file_path.parts for excluded in excluded_dirs)
+        return _EXCLUDED_DIRS
 
-    def _collect_files_recursive(
-        self, dir_path: Path, config: RenameConfig, excluded_dirs: set[str]
+    def _collect_files(
+        self,
+        dir_path: Path,
+        max_depth: int,
+        config: RenameConfig,
+        excluded_dirs: frozenset[str],
+        exclude: Optional[Callable[[str], object]] = None,
     ) -> list[Path]:
-        """递归收集文件."""
-        files = []
-        pattern = "**/*" if config.file_filter is None else f"**/{config.file_filter}"
+        """收集目录下不超过 max_depth 层的文件（直接位于目录下的文件为第1层）.
 
-        for file_path in dir_path.glob(pattern):
-            if self._should_exclude_file(file_path, excluded_dirs):
-                continue
-            if file_path.is_file():
-                relative_path = file_path.relative_to(dir_path)
-                if len(relative_path.parts) <= config.max_depth:
-                    files.append(file_path)
+        用 os.scandir 按栈遍历：排除目录在进入前整棵跳过，文件类型判断复用
+        目录项自带的信息，不再对每个文件单独 stat。与 Path.glob("**") 一样
+        不进入指向目录的符号链接，无法读取的目录直接跳过。
+        """
+        # 目标目录本身位于排除目录中时，其下所有文件都被排除
+        if max_depth < 1 or not excluded_dirs.isdisjoint(dir_path.parts):
+            return []
 
-        return files
-
-    def _collect_files_non_recursive(
-        self, dir_path: Path, config: RenameConfig, excluded_dirs: set[str]
-    ) -> list[Path]:
-        """非递归收集文件."""
+        match = _compile_glob(config.file_filter).match if config.file_filter else None
         files = []
-        pattern = "*" if config.file_filter is None else config.file_filter
-
-        for file_path in dir_path.glob(pattern):
-            if self._should_exclude_file(file_path, excluded_dirs):
+        stack = [(os.fspath(dir_path), 1)]
+        while stack:
+            current, depth = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name in excluded_dirs:
+                            continue
+                        if depth < max_depth and entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, depth + 1))
+                            continue
+                        if match and not match(name):
+                            continue
+                        if exclude and exclude(name):
+                            continue
+                        if entry.is_file():
+                            files.append(Path(entry.path))
+            except OSError:
                 continue
-            if file_path.is_file():
-                files.append(file_path)
 
         return files
 
-    def _apply_exclude_pattern(
-        self, files: list[Path], exclude_pattern: Optional[str]
-    ) -> list[Path]:
-        """应用排除模式过滤."""
-        if not exclude_pattern:
-            return files
-
-        exclude_regex = re.compile(exclude_pattern)
-        return [f for f in files if not exclude_regex.search(f.name)]
-
     def _generate_rename_plan(
         self, files: list[Path], config: RenameConfig
     ) -> list[RenameItem]:
         """生成重命名计划."""
-        rename_plan = []
+        rename_plan: list[RenameItem] = []
+        mode_handler = self._get_mode_handler(config)
+        if mode_handler is None:
+            return rename_plan
+
+        # 前缀和后缀每批确定一次（number模式的前缀已包含在编号中）
+        if config.mode == "number":
+            prefix = suffix = ""
+        else:
+            prefix, suffix = config.prefix, config.suffix
 
         for i, file_path in enumerate(files):
+            old_name = file_path.name
             try:
-                new_name = self._generate_new_name(file_path.name, i, config)
-                if new_name and new_name != file_path.name:
-                    new_path = file_path.parent / new_name
+                new_name = self._generate_new_name(
+                    old_name, i, mode_handler, prefix, suffix
+                )
+                if new_name and new_name != old_name:
                     rename_plan.append(
                         RenameItem(
                             old_path=file_path,
-                            new_path=new_path,
-                            old_name=file_path.name,
+                            new_path=file_path.with_name(new_name),
+                            old_name=old_name,
                             new_name=new_name,
                         )
                     )
@@ -305,93 +439,99 @@ class BatchRename:
                 # 让 ToolError 直接传播出去
                 raise
             except Exception as e:
-                self.console.print(
-                    f"[red]生成重命名计划失败 {file_path.name}: {e}[/red]"
-                )
+                self.console.print(f"[red]生成重命名计划失败 {old_name}: {e}[/red]")
 
         return rename_plan
 
     def _generate_new_name(
-        self, filename: str, index: int, config: RenameConfig
+        self,
+        filename: str,
+        index: int,
+        mode_handler: Callable[[str, int], Optional[str]],
+        prefix: str,
+        suffix: str,
     ) -> Optional[str]:
         """生成新文件名."""
-        name, ext = os.path.splitext(filename)
+        name, ext = _split_ext(filename)
 
         # 根据模式生成新名称
-        new_name = self._apply_rename_mode(name, index, config)
+        new_name = mode_handler(name, index)
         if new_name is None:
             return None
 
-        # 添加前缀和后缀（除了number模式）
-        if config.mode != "number":
-            new_name = self._apply_prefix_suffix(new_name, config)
+        # 前缀或后缀为空时拼接不会复制字符串
+        return prefix + new_name + suffix + ext
 
-        return new_name + ext
+    def _get_mode_handler(
+        self, config: RenameConfig
+    ) -> Optional[Callable[[str, int], Optional[str]]]:
+        """解析重命名模式，返回 (文件名, 序号) -> 新名称 的处理函数.
 
-    def _apply_rename_mode(
-        self, name: str, index: int, config: RenameConfig
-    ) -> Optional[str]:
-        """应用重命名模式."""
+        模式和大小写转换方式每批只解析一次，无效时返回None。
+
+        Raises:
+            ToolError: 文本模式指定了替换文本但没有搜索文本，或正则表达式无效
+
+        """
         if config.mode == "text":
-            return self._apply_text_mode(name, config)
-        elif config.mode == "regex":
-            return self._apply_regex_mode(name, config)
-        elif config.mode == "number":
-            return self._apply_number_mode(index, config)
-        elif config.mode == "case":
-            return self._apply_case_mode(name, config)
-        else:
-            return None
+            if not config.pattern:
+                # 空的搜索文本会匹配每个字符之间的位置，不能用于替换
+                if config.replacement:
+                    raise ToolError("文本模式需要指定要替换的文本")
+                # 只添加前缀和后缀
+                return lambda name, index: name
+            if config.case_sensitive:
+                return lambda name, index: self._apply_text_mode(name, config)
+            # 忽略大小写时把搜索文本转义为正则，替换文本中的反斜杠按原样保留
+            regex = _compile_regex(re.escape(config.pattern), re.IGNORECASE)
+            replacement = config.replacement.replace("\\", "\\\\")
+            return lambda name, index: self._apply_case_insensitive_replace(
+                name, regex, replacement
+            )
+        if config.mode == "regex":
+            if not config.pattern:
+                return None
+            regex = self._compile_rename_regex(config)
+            return lambda name, index: self._apply_regex_mode(name, regex, config)
+        if config.mode == "number":
+            return lambda name, index: self._apply_number_mode(index, config)
+        if config.mode == "case":
+            convert = self._get_case_converter(config.case_mode)
+            if convert is None:
+                return None
+            return lambda name, index: self._apply_case_mode(name, convert)
+        return None
 
     def _apply_text_mode(self, name: str, config: RenameConfig) -> Optional[str]:
-        """应用文本替换模式."""
-        if config.case_sensitive:
-            if config.pattern in name:
-                return name.replace(config.pattern, config.replacement)
-            else:
-                return None
-        else:
-            return self._apply_case_insensitive_replace(name, config)
+        """应用文本替换模式（区分大小写）."""
+        if config.pattern in name:
+            return name.replace(config.pattern, config.replacement)
+        return None
 
     def _apply_case_insensitive_replace(
-        self, name: str, config: RenameConfig
+        self, name: str, regex: re.Pattern[str], replacement: str
     ) -> Optional[str]:
         """应用大小写不敏感的文本替换."""
-        pattern_lower = config.pattern.lower()
-        name_lower = name.lower()
-
-        if pattern_lower not in name_lower:
-            return None
-
-        # 找到所有匹配位置并替换
-        start = 0
-        new_name = name
-        while True:
-            pos = name_lower.find(pattern_lower, start)
-            if pos == -1:
-                break
-            # 替换原始字符串中对应位置的文本
-            new_name = (
-                new_name[:pos]
-                + config.replacement
-                + new_name[pos + len(config.pattern) :]
-            )
-            # 更新搜索位置和小写版本
-            name_lower = new_name.lower()
-            start = pos + len(config.replacement)
+        new_name, count = regex.subn(replacement, name)
+        return new_name if count else None
 
-        return new_name
+    def _compile_rename_regex(self, config: RenameConfig) -> re.Pattern[str]:
+        """编译正则模式的搜索表达式，每批只编译一次."""
+        try:
+            flags = 0 if config.case_sensitive else re.IGNORECASE
+            return _compile_regex(config.pattern, flags)
+        except re.error as e:
+            raise ToolError(f"无效的正则表达式 '{config.pattern}': {str(e)}")
 
-    def _apply_regex_mode(self, name: str, config: RenameConfig) -> Optional[str]:
+    def _apply_regex_mode(
+        self, name: str, regex: re.Pattern[str], config: RenameConfig
+    ) -> Optional[str]:
         """应用正则表达式模式."""
-        if not config.pattern:
-            return None
-
         try:
-            flags = 0 if config.case_sensitive else re.IGNORECASE
-            new_name = re.sub(config.pattern, config.replacement, name, flags=flags)
+            new_name = regex.sub(config.replacement, name)
             return new_name if new_name != name else None
         except re.error as e:
+            # 替换文本中的分组引用在替换时才会校验
             raise ToolError(f"无效的正则表达式 '{config.pattern}': {str(e)}")
 
     def _apply_number_mode(self, index: int, config: RenameConfig) -> str:
@@ -399,39 +539,32 @@ class BatchRename:
         number = config.start_number + index
         return f"{config.prefix}{number:03d}"
 
-    def _apply_case_mode(self, name: str, config: RenameConfig) -> Optional[str]:
-        """应用大小写转换模式."""
-        case_handlers = {
-            "lower": lambda n: n.lower(),
-            "upper": lambda n: n.upper(),
-            "title": lambda n: n.title(),
+    def _get_case_converter(self, case_mode: str) -> Optional[Callable[[str], str]]:
+        """获取大小写转换函数."""
+        case_handlers: dict[str, Callable[[str], str]] = {
+            "lower": str.lower,
+            "upper": str.upper,
+            "title": str.title,
             "camel": self._to_camel_case,
             "snake": self._to_snake_case,
         }
+        return case_handlers.get(case_mode)
 
-        handler = case_handlers.get(config.case_mode)
-        if not handler:
-            return None
-
-        new_name = handler(name)
+    def _apply_case_mode(
+        self, name: str, convert: Callable[[str], str]
+    ) -> Optional[str]:
+        """应用大小写转换模式."""
+        new_name = convert(name)
         return new_name if new_name != name else None
 
     def _to_camel_case(self, name: str) -> str:
         """转换为驼峰命名."""
-        words = re.split(r"[_\s-]+", name.lower())
+        words = _CAMEL_SPLIT_RE.split(name.lower())
         return words[0] + "".join(word.capitalize() for word in words[1:])
 
     def _to_snake_case(self, name: str) -> str:
         """转换为蛇形命名."""
-        return re.sub(r"[\s-]+", "_", name.lower())
-
-    def _apply_prefix_suffix(self, name: str, config: RenameConfig) -> str:
-        """应用前缀和后缀."""
-        if config.prefix:
-            name = config.prefix + name
-        if config.suffix:
-            name = name + config.suffix
-        return name
+        return _SNAKE_SUB_RE.sub("_", name.lower())
 
     def _show_preview(self, rename_plan: list[RenameItem]) -> None:
         """显示重命名预览."""
@@ -456,27 +589,107 @@ class BatchRename:
     def _execute_rename(
         self, rename_plan: list[RenameItem], config: RenameConfig, result: RenameResult
     ) -> RenameResult:
-        """执行重命名操作."""
+        """执行重命名操作.
+
+        重命名主要耗时在文件系统的元数据操作上，数量较多时用线程池并发。
+        相互影响的项（目标相同或链式重命名）分在同一组内按顺序执行，结果与
+        逐个执行一致，也避免并发时两个文件同时通过存在性检查而互相覆盖；
+        各组结果按计划顺序合并。
+        """
         with ProgressTracker(
             total=len(rename_plan), description="重命名文件"
         ) as progress:
-            for item in rename_plan:
-                try:
-                    self._rename_single_file(item, config, result)
-                except Exception as e:
-                    result.failed_renames += 1
-                    result.errors.append(f"重命名失败 {item.old_name}: {str(e)}")
-                progress.update(1)
+            if not config.parallel or len(rename_plan) < self.PARALLEL_MIN_ITEMS:
+                for item in rename_plan:
+                    self._rename_group([item], config, result)
+                    progress.update(1)
+                return result
+
+            groups = self._group_by_target(rename_plan)
+            with ThreadPoolExecutor() as executor:
+                futures = {
+                    executor.submit(
+                        self._rename_group, group, config, RenameResult()
+                    ): len(group)
+                    for group in groups
+                }
+                for future in as_completed(futures):
+                    progress.update(futures[future])
+
+            for future in futures:
+                self._merge_result(result, future.result())
 
         return result
 
+    def _group_by_target(self, rename_plan: list[RenameItem]) -> list[list[RenameItem]]:
+        """把会相互影响的重命名项分到同一组，组内保持计划顺序.
+
+        目标相同，或一项的目标是另一项的源文件（链式重命名，如重新编号）时，
+        结果取决于执行顺序，这些项必须在同一组内按顺序执行。路径比较忽略
+        大小写和Unicode规范化差异。
+        """
+        parent: dict[str, str] = {}
+
+        def find(key: str) -> str:
+            root = parent.setdefault(key, key)
+            while root != parent[root]:
+                root = parent[root]
+            # 路径压缩
+            while key != root:
+                parent[key], key = root, parent[key]
+            return root
+
+        def path_key(path: Union[Path, str]) -> str:
+            return unicodedata.normalize("NFC", str(path)).casefold()
+
+        item_keys = []
+        for item in rename_plan:
+            target = path_key(item.new_path)
+            # 源文件、目标和备份文件涉及的路径连在一起
+            for key in (path_key(item.old_path), path_key(f"{item.old_path}.bak")):
+                parent[find(key)] = find(target)
+            item_keys.append(target)
+
+        groups: dict[str, list[RenameItem]] = {}
+        for item, key in zip(rename_plan, item_keys):
+            groups.setdefault(find(key), []).append(item)
+        return list(groups.values())
+
+    def _rename_group(
+        self, items: list[RenameItem], config: RenameConfig, result: RenameResult
+    ) -> RenameResult:
+        """按顺序重命名一组文件，结果记录到result中."""
+        for item in items:
+            try:
+                self._rename_single_file(item, config, result)
+            except Exception as e:
+                result.failed_renames += 1
+                result.errors.append(f"重命名失败 {item.old_name}: {str(e)}")
+        return result
+
+    def _merge_result(self, result: RenameResult, partial: RenameResult) -> None:
+        """合并一组重命名的结果."""
+        result.successful_renames += partial.successful_renames
+        result.failed_renames += partial.failed_renames
+        result.skipped_files += partial.skipped_files
+        result.errors.extend(partial.errors)
+        result.renamed_files.extend(partial.renamed_files)
+
     def _rename_single_file(
         self, item: RenameItem, config: RenameConfig, result: RenameResult
     ) -> None:
         """重命名单个文件."""
+        # 不需要备份时直接尝试不覆盖的重命名，目标不存在时无需额外stat
+        if not config.backup and _try_rename_noreplace(item.old_path, item.new_path):
+            result.successful_renames += 1
+            result.renamed_files.append((item.old_name, item.new_name))
+            return
+
         # 检查是否是大小写不同的同一文件（macOS文件系统问题）
-        if item.new_path.exists():
-            if item.old_path.samefile(item.new_path):
+        # 目标不存在时只需一次lstat；存在时再取源文件状态比较inode
+        target_stat = self._lstat_or_none(item.new_path)
+        if target_stat is not None:
+            if os.path.samestat(os.lstat(item.old_path), target_stat):
                 # 这是同一个文件，只是大小写不同，需要特殊处理
                 self._handle_case_only_rename(item, result)
             else:
@@ -486,18 +699,24 @@ class BatchRename:
             return
 
         if config.backup:
-            backup_path = item.old_path.with_suffix(item.old_path.suffix + ".bak")
-            shutil.copy2(item.old_path, backup_path)
+            shutil.copy2(item.old_path, f"{item.old_path}.bak")
 
-        item.old_path.rename(item.new_path)
+        os.rename(item.old_path, item.new_path)
         result.successful_renames += 1
         result.renamed_files.append((item.old_name, item.new_name))
 
+    def _lstat_or_none(self, path: Path) -> Optional[os.stat_result]:
+        """获取路径自身的状态（不跟随符号链接），不存在时返回None."""
+        try:
+            return os.lstat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
     def _handle_case_only_rename(self, item: RenameItem, result: RenameResult) -> None:
         """处理仅大小写不同的重命名."""
         temp_path = item.old_path.with_name(f"_temp_{item.old_name}")
-        item.old_path.rename(temp_path)
-        temp_path.rename(item.new_path)
+        os.rename(item.old_path, temp_path)
+        os.rename(temp_path, item.new_path)
         result.successful_renames += 1
         result.renamed_files.append((item.old_name, item.new_name))
 
@@ -715,8 +934,9 @@ def _output_plain_results(console: Console, result: RenameResult) -> None:
     ):
         console.print("[yellow]没有找到匹配的文件[/yellow]")
 
-    for error in result.errors:
-        console.print(f"[red]错误: {error}[/red]")
+    # 所有错误合并为一次输出，避免文件很多时逐行写入
+    if result.errors:
+        console.print("\n".join(f"[red]错误: {error}[/red]" for error in result.errors))
 
 
 def _record_operation_history(
@@ -3,9 +3,12 @@
 import asyncio
 import hashlib
 import os
+import stat
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Optional
 
 import click
 import logfire
@@ -18,6 +21,7 @@ from ..ai.config import AIConfig
 from ..ai.version_analyzer import VersionAnalyzer
 from ..utils.formatter import DuplicateData, format_output
 from ..utils.progress import process_with_progress
+from ..utils.version_cache import VersionCache
 
 
 class DuplicateConfig(BaseModel):
@@ -50,12 +54,21 @@ class DuplicateGroup(BaseModel):
 class DuplicateFinder:
     """重复文件检测器."""
 
+    # 同一大小组内文件不超过该数量时直接逐块比较内容，否则逐个计算哈希
+    COMPARE_MAX_FILES = 32
+    # 逐块比较时每次读取的字节数
+    COMPARE_CHUNK_SIZE = 64 * 1024
+    # 预哈希读取的文件首尾块大小
+    PREHASH_BLOCK_SIZE = 64 * 1024
+
     def __init__(self, config: DuplicateConfig):
         """初始化重复文件检测器.
 
         参数：config - 检测配置对象
         """
         self.config = config
+        # 扫描时获取的文件状态，供后续版本分析复用
+        self.file_stats: dict[Path, os.stat_result] = {}
         logfire.info("初始化重复文件检测器", attributes={"config": config.model_dump()})
 
     def _calculate_file_hash(self, file_path: Path) -> str:
@@ -138,16 +151,20 @@ class DuplicateFinder:
                 ],
             )
 
-    def _should_include_file(self, file_path: Path) -> bool:
+    def _should_include_file(
+        self, file_path: Path, file_stat: Optional[os.stat_result] = None
+    ) -> bool:
         """判断文件是否应该包含在检测范围内.
 
         参数：file_path - 文件路径对象
+              file_stat - 已获取的文件状态（可选，避免重复stat）
         返回：布尔值，True表示应该包含
         """
         # 检查文件大小是否满足最小要求
         try:
-            file_size = file_path.stat().st_size
-            if file_size < self.config.min_size:
+            if file_stat is None:
+                file_stat = file_path.stat()
+            if file_stat.st_size < self.config.min_size:
                 return False
         except OSError:
             return False
@@ -159,6 +176,23 @@ class DuplicateFinder:
 
         return True
 
+    def _stat_included_file(self, file_path: Path) -> Optional[os.stat_result]:
+        """获取应包含在检测范围内的普通文件的状态.
+
+        每个文件只stat一次，结果同时用于过滤和后续的版本分析；
+        不是普通文件、无法访问或不符合条件时返回None。
+        """
+        try:
+            file_stat = file_path.stat()
+        except OSError:
+            return None
+
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+        if not self._should_include_file(file_path, file_stat):
+            return None
+        return file_stat
+
     def _scan_files(self) -> list[FileInfo]:
         """扫描目录获取所有符合条件的文件信息.
 
@@ -166,6 +200,7 @@ class DuplicateFinder:
         """
         with logfire.span("scan_files", attributes={"path": self.config.path}):
             files = []
+            self.file_stats = {}
             scan_path = Path(self.config.path)
 
             # 检查路径是否存在
@@ -232,19 +267,14 @@ class DuplicateFinder:
                     if any(excluded in file_path.parts for excluded in excluded_dirs):
                         continue
 
-                    # 只处理文件，跳过目录
-                    if not file_path.is_file():
+                    # 只处理符合条件的文件，跳过目录
+                    file_stat = self._stat_included_file(file_path)
+                    if file_stat is None:
                         continue
 
-                    # 检查是否应该包含此文件
-                    if not self._should_include_file(file_path):
-                        continue
-
-                    # 获取文件大小
-                    file_size = file_path.stat().st_size
-
                     # 创建文件信息对象
-                    files.append(FileInfo(path=file_path, size=file_size))
+                    self.file_stats[file_path] = file_stat
+                    files.append(FileInfo(path=file_path, size=file_stat.st_size))
 
                 logfire.info(f"扫描完成，找到 {len(files)} 个文件")
                 return files
@@ -309,12 +339,30 @@ class DuplicateFinder:
                     "可能包含重复文件"
                 )
 
-                # 第三步：组装哈希任务
-                all_files_to_hash = self._collect_files_to_hash(potential_duplicates)
-                logfire.info(f"需要计算 {len(all_files_to_hash)} 个文件的哈希值")
+                # 第三步：文件数不多的大小组逐块比较内容，其余组装哈希任务
+                compare_groups = {
+                    size: files
+                    for size, files in potential_duplicates.items()
+                    if len(files) <= self.COMPARE_MAX_FILES
+                }
+                # 大组先按首尾块预哈希筛掉明显不同的文件，只对剩余文件完整哈希
+                all_files_to_hash = self._collect_files_to_hash(
+                    self._filter_by_prehash(
+                        {
+                            size: files
+                            for size, files in potential_duplicates.items()
+                            if len(files) > self.COMPARE_MAX_FILES
+                        }
+                    )
+                )
+                logfire.info(
+                    f"逐块比较 {len(compare_groups)} 个大小组，"
+                    f"需要计算 {len(all_files_to_hash)} 个文件的哈希值"
+                )
 
-                # 第四步：批量计算哈希并分组
+                # 第四步：比较内容、批量计算哈希并分组
                 size_hash_groups = self._group_files_by_hash(all_files_to_hash)
+                size_hash_groups.update(self._group_files_by_content(compare_groups))
 
                 # 第五步：组装最终重复组
                 duplicate_groups = self._assemble_duplicate_groups(size_hash_groups)
@@ -354,6 +402,57 @@ class DuplicateFinder:
             groups[file_info.size].append(file_info)
         return groups
 
+    def _prehash_file(self, file_info: FileInfo) -> Optional[bytes]:
+        """只读取文件首尾各一块计算预哈希，读取失败时返回None."""
+        try:
+            with open(file_info.path, "rb") as f:
+                digest = hashlib.blake2b(f.read(self.PREHASH_BLOCK_SIZE))
+                f.seek(-self.PREHASH_BLOCK_SIZE, os.SEEK_END)
+                digest.update(f.read(self.PREHASH_BLOCK_SIZE))
+            return digest.digest()
+        except OSError as e:
+            logfire.warning(f"跳过文件 {file_info.path}: {str(e)}")
+            return None
+
+    def _filter_by_prehash(
+        self, size_groups: dict[int, list[FileInfo]]
+    ) -> dict[int, list[FileInfo]]:
+        """按首尾块预哈希细分大小组，丢弃预哈希唯一的文件.
+
+        不超过两块大小的文件预哈希等于读取全部内容，直接保留交给完整哈希。
+        """
+        small = {
+            size: files
+            for size, files in size_groups.items()
+            if size <= self.PREHASH_BLOCK_SIZE * 2
+        }
+        candidates = [
+            file_info
+            for size, files in size_groups.items()
+            if size > self.PREHASH_BLOCK_SIZE * 2
+            for file_info in files
+        ]
+        if not candidates:
+            return small
+
+        # 预哈希只读少量数据，主要耗时在I/O等待，用线程池并发
+        with ThreadPoolExecutor() as executor:
+            prehashes = list(executor.map(self._prehash_file, candidates))
+
+        prehash_groups: dict[tuple[int, bytes], list[FileInfo]] = defaultdict(list)
+        for file_info, prehash in zip(candidates, prehashes):
+            if prehash is not None:
+                prehash_groups[(file_info.size, prehash)].append(file_info)
+
+        filtered: dict[int, list[FileInfo]] = defaultdict(list, small)
+        for (size, _), files in prehash_groups.items():
+            if len(files) > 1:
+                filtered[size].extend(files)
+        logfire.info(
+            f"预哈希后剩余 {sum(len(files) for files in filtered.values())} 个文件"
+        )
+        return dict(filtered)
+
     def _collect_files_to_hash(
         self, potential_duplicates: dict[int, list["FileInfo"]]
     ) -> list[tuple[int, "FileInfo"]]:
@@ -396,6 +495,69 @@ class DuplicateFinder:
         # 转为常规 dict 返回，保证类型一致
         return {size: dict(hash_group) for size, hash_group in size_hash_groups.items()}
 
+    def _group_files_by_content(
+        self, size_groups: dict[int, list[FileInfo]]
+    ) -> dict[int, dict[str, list[FileInfo]]]:
+        """逐块比较每个大小组内的文件并按内容分组."""
+        results = process_with_progress(
+            size_groups.items(),
+            lambda item: (item[0], self._compare_same_size_files(item[1])),
+            label="比较文件内容",
+            threshold=100,
+        )
+        return {size: hash_groups for size, hash_groups in results if hash_groups}
+
+    def _compare_same_size_files(
+        self, files: list[FileInfo]
+    ) -> dict[str, list[FileInfo]]:
+        """同时逐块读取同样大小的文件，按已读内容不断细分.
+
+        与其他文件都不同的文件立即停止读取，不必像计算哈希那样读完整个文件；
+        内容一致的文件共用一个MD5对象增量计算，得到的组哈希与
+        _calculate_file_hash 的结果相同。
+
+        返回：哈希值 → 内容完全相同的文件列表
+        """
+        identical: dict[str, list[FileInfo]] = {}
+        with ExitStack() as stack:
+            handles: list[tuple[FileInfo, BinaryIO]] = []
+            for file_info in files:
+                try:
+                    handles.append(
+                        (file_info, stack.enter_context(open(file_info.path, "rb")))
+                    )
+                except OSError as e:
+                    logfire.warning(f"跳过文件 {file_info.path}: {str(e)}")
+
+            pending = [(hashlib.md5(), handles)]
+            while pending:
+                digest, members = pending.pop()
+                partitions: dict[bytes, list[tuple[FileInfo, BinaryIO]]] = defaultdict(
+                    list
+                )
+                for file_info, handle in members:
+                    try:
+                        partitions[handle.read(self.COMPARE_CHUNK_SIZE)].append(
+                            (file_info, handle)
+                        )
+                    except OSError as e:
+                        logfire.warning(f"跳过文件 {file_info.path}: {str(e)}")
+
+                for chunk, group in partitions.items():
+                    if len(group) < 2:
+                        continue
+                    if not chunk:
+                        # 同时读到末尾，内容完全相同
+                        file_hash = digest.hexdigest()
+                        for file_info, _ in group:
+                            file_info.hash = file_hash
+                        identical[file_hash] = [file_info for file_info, _ in group]
+                        continue
+                    next_digest = digest.copy()
+                    next_digest.update(chunk)
+                    pending.append((next_digest, group))
+        return identical
+
     def _assemble_duplicate_groups(
         self, size_hash_groups: dict[int, dict[str, list["FileInfo"]]]
     ) -> list["DuplicateGroup"]:
@@ -648,24 +810,19 @@ def _handle_formatted_output(
 
 
 # 新增：执行AI分析的异步函数
-async def _perform_ai_analysis(
-    duplicate_groups: list[DuplicateGroup],
-    ai_config: AIConfig,
-) -> dict[str, Any]:
-    """对重复文件组执行AI版本分析.
-
-    Args:
-        duplicate_groups: 重复文件组列表
-        ai_config: AI配置
+async def _analyze_group_with_ai(
+    analyzer: VersionAnalyzer,
+    group: DuplicateGroup,
+    file_stats: Optional[dict[Path, os.stat_result]],
+    semaphore: asyncio.Semaphore,
+) -> Optional[tuple[str, dict[str, Any]]]:
+    """分析单个重复文件组，失败时返回None.
 
     Returns:
-        AI分析结果字典
+        (格式化的分析文本, 用于命令建议的原始数据)
 
     """
-    analyzer = VersionAnalyzer(ai_config)
-    analyses: dict[str, Any] = {}
-
-    for group in duplicate_groups:
+    async with semaphore:
         try:
             with logfire.span(
                 "ai_version_analysis",
@@ -675,14 +832,13 @@ async def _perform_ai_analysis(
                 },
             ):
                 # 执行AI分析
-                analysis = await analyzer.analyze_with_ai(group.files)
+                analysis = await analyzer.analyze_with_ai(group.files, file_stats)
 
                 # 格式化分析结果
                 formatted_result = analyzer.format_analysis_result(analysis)
-                analyses[group.hash] = formatted_result
 
                 # 保存原始数据用于命令建议
-                analyses[f"{group.hash}_data"] = {
+                data = {
                     "recommended_keep": (
                         analysis.recommended_keep if analysis.recommended_keep else None
                     ),
@@ -690,15 +846,70 @@ async def _perform_ai_analysis(
                 }
 
                 logfire.info(f"AI分析完成：{group.count}个文件")
+                return formatted_result, data
         except Exception as e:
             logfire.error(f"AI分析失败: {e}")
-            # 继续处理其他组
+            return None
+
+
+async def _perform_ai_analysis(
+    duplicate_groups: list[DuplicateGroup],
+    ai_config: AIConfig,
+    file_stats: Optional[dict[Path, os.stat_result]] = None,
+    max_concurrent: int = 4,
+) -> dict[str, Any]:
+    """对重复文件组执行AI版本分析.
+
+    Args:
+        duplicate_groups: 重复文件组列表
+        ai_config: AI配置
+        file_stats: 扫描时获取的文件状态，避免重复stat
+        max_concurrent: 同时进行的AI请求数上限
+
+    Returns:
+        AI分析结果字典
+
+    """
+    # 磁盘缓存让重复运行时跳过未变化文件组的预览读取和AI请求；
+    # 缓存会保存文件内容预览，仅在配置开启时使用
+    version_cache = (
+        VersionCache(max_age=ai_config.version_cache_ttl)
+        if ai_config.version_cache
+        else None
+    )
+    analyzer = VersionAnalyzer(ai_config, cache=version_cache)
+    analyses: dict[str, Any] = {}
+
+    try:
+        # 各组并发请求AI，总耗时接近 组数/并发数 个往返而不是逐组累加
+        semaphore = asyncio.Semaphore(max_concurrent)
+        results = await asyncio.gather(
+            *(
+                _analyze_group_with_ai(analyzer, group, file_stats, semaphore)
+                for group in duplicate_groups
+            )
+        )
+
+        # 按分组顺序汇总，失败的组跳过
+        for group, result in zip(duplicate_groups, results):
+            if result is not None:
+                analyses[group.hash], analyses[f"{group.hash}_data"] = result
+    finally:
+        # 无论是否出错都释放AI客户端的连接池和缓存数据库
+        try:
+            if analyzer.ai_client:
+                await analyzer.ai_client.aclose()
+        finally:
+            if version_cache is not None:
+                version_cache.close()
 
     return analyses
 
 
 def _handle_ai_analysis(
-    duplicate_groups: list[DuplicateGroup], ai_analyze: bool
+    duplicate_groups: list[DuplicateGroup],
+    ai_analyze: bool,
+    file_stats: Optional[dict[Path, os.stat_result]] = None,
 ) -> Optional[dict[str, Any]]:
     """处理AI分析."""
     if not ai_analyze or not duplicate_groups:
@@ -712,7 +923,9 @@ def _handle_ai_analysis(
 
     click.echo("\n🤖 正在进行AI版本分析...")
     # 运行异步AI分析
-    ai_analyses = asyncio.run(_perform_ai_analysis(duplicate_groups, ai_config))
+    ai_analyses = asyncio.run(
+        _perform_ai_analysis(duplicate_groups, ai_config, file_stats)
+    )
     click.echo("✅ AI分析完成\n")
     return ai_analyses
 
@@ -853,7 +1066,9 @@ def duplicates_cmd(
         duplicate_groups, all_files = _execute_duplicate_finder(finder)
 
         # 处理AI分析
-        ai_analyses = _handle_ai_analysis(duplicate_groups, ai_analyze)
+        ai_analyses = _handle_ai_analysis(
+            duplicate_groups, ai_analyze, finder.file_stats
+        )
 
         # 根据格式选择输出方式
         if format != "plain":
@@ -335,42 +335,49 @@ class FileOrganizerTool:
         # 显示AI分析进度
         click.echo(f"\n🤖 正在使用AI分析 {len(files)} 个文件...")
 
-        # 批量AI分类（带进度显示）
-        with ProgressTracker(total=len(files), description="AI智能分类") as progress:
-            for file_path in files:
-                try:
-                    category = await self.classify_file_with_ai(file_path)
-                    target_path = self.generate_target_path(file_path, category)
-                    status = "pending"
-                    error = None
-                    if target_path.exists():
-                        status = "skipped"
-                        error = "目标文件已存在"
-                    items.append(
-                        OrganizeItem(
-                            source_path=file_path,
-                            target_path=target_path,
-                            category=category.name,
-                            status=status,
-                            error=error,
+        try:
+            # 批量AI分类（带进度显示）
+            with ProgressTracker(
+                total=len(files), description="AI智能分类"
+            ) as progress:
+                for file_path in files:
+                    try:
+                        category = await self.classify_file_with_ai(file_path)
+                        target_path = self.generate_target_path(file_path, category)
+                        status = "pending"
+                        error = None
+                        if target_path.exists():
+                            status = "skipped"
+                            error = "目标文件已存在"
+                        items.append(
+                            OrganizeItem(
+                                source_path=file_path,
+                                target_path=target_path,
+                                category=category.name,
+                                status=status,
+                                error=error,
+                            )
                         )
-                    )
-                except Exception as e:
-                    logfire.error(f"AI分类文件失败: {file_path} - {e}")
-                    # 失败时使用传统分类
-                    category = self.classify_file(file_path)
-                    target_path = self.generate_target_path(file_path, category)
-                    items.append(
-                        OrganizeItem(
-                            source_path=file_path,
-                            target_path=target_path,
-                            category=category.name,
-                            status="pending",
-                            error=None,
+                    except Exception as e:
+                        logfire.error(f"AI分类文件失败: {file_path} - {e}")
+                        # 失败时使用传统分类
+                        category = self.classify_file(file_path)
+                        target_path = self.generate_target_path(file_path, category)
+                        items.append(
+                            OrganizeItem(
+                                source_path=file_path,
+                                target_path=target_path,
+                                category=category.name,
+                                status="pending",
+                                error=None,
+                            )
                         )
-                    )
 
-                progress.update(1)
+                    progress.update(1)
+        finally:
+            # 整理计划生成完毕或中途出错，都要释放AI客户端的连接池
+            if self.ai_classifier:
+                await self.ai_classifier.client.aclose()
 
         click.echo("✅ AI分析完成\n")
         return items
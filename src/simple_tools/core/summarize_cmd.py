@@ -1,8 +1,9 @@
 """文档摘要命令模块."""
 
 import asyncio
+from collections.abc import Coroutine
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, TypeVar
 
 import click
 import logfire
@@ -15,6 +16,18 @@ from ..utils.errors import ToolError, handle_errors
 from ..utils.progress import ProgressTracker
 from ..utils.smart_interactive import operation_history
 
+T = TypeVar("T")
+
+
+async def _run_and_close(
+    summarizer: DocumentSummarizer, coro: Coroutine[Any, Any, T]
+) -> T:
+    """执行摘要协程，结束后释放AI客户端的连接池."""
+    try:
+        return await coro
+    finally:
+        await summarizer.client.aclose()
+
 
 def _get_format_type(ctx: click.Context, format: Optional[str]) -> str:
     """获取输出格式类型."""
@@ -119,11 +132,14 @@ def _handle_single_file_summary(
     """处理单文件摘要生成."""
     click.echo(f"\n正在生成文档摘要: {file.name}")
     result = asyncio.run(
-        summarizer.summarize_document(
-            file,
-            target_length=length,
-            language=language,
-            use_cache=not no_cache,
+        _run_and_close(
+            summarizer,
+            summarizer.summarize_document(
+                file,
+                target_length=length,
+                language=language,
+                use_cache=not no_cache,
+            ),
         )
     )
 
@@ -163,6 +179,7 @@ def _handle_batch_summary(
     format_type: str,
     output: Optional[str],
     path: str,
+    concurrency: int = 3,
 ) -> None:
     """处理批量摘要生成."""
     click.echo(f"\n正在批量生成 {len(files)} 个文档的摘要...")
@@ -170,12 +187,15 @@ def _handle_batch_summary(
     # 使用进度条
     with ProgressTracker(total=len(files), description="生成摘要") as progress:
         batch_result = asyncio.run(
-            summarizer.summarize_batch(
-                files,
-                target_length=length,
-                language=language,
-                max_concurrent=3,
-                use_cache=not no_cache,
+            _run_and_close(
+                summarizer,
+                summarizer.summarize_batch(
+                    files,
+                    target_length=length,
+                    language=language,
+                    max_concurrent=concurrency,
+                    use_cache=not no_cache,
+                ),
             )
         )
         progress.update(len(files))
@@ -230,6 +250,13 @@ def _handle_batch_summary(
     help="输出格式（plain/json/markdown）",
 )
 @option("--no-cache", is_flag=True, help="不使用缓存")
+@option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help="批量处理时同时进行的AI请求数",
+)
 @pass_context
 def summarize(
     ctx: click.Context,
@@ -240,6 +267,7 @@ def summarize(
     batch: bool,
     format: Optional[str],
     no_cache: bool,
+    concurrency: int,
 ) -> None:
     """生成文档摘要（需要配置AI功能）.
 
@@ -248,6 +276,7 @@ def summarize(
       tools summarize ~/Documents --batch           # 批量生成目录下所有文档摘要
       tools summarize doc.txt --length 300          # 指定摘要长度
       tools summarize . --batch -o summaries.json   # 批量摘要并保存
+      tools summarize . --batch --concurrency 8     # 提高批量请求并发数
     """
     try:
         # 检查AI功能是否启用
@@ -296,6 +325,7 @@ def summarize(
                     format_type,
                     output,
                     path,
+                    concurrency,
                 )
 
     except ToolError as e:
@@ -1,6 +1,7 @@
 """配置文件加载工具模块."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from re import Match
 from typing import Any, Optional
@@ -81,6 +82,18 @@ class ToolConfig(BaseModel):
         super().__init__(**data)
 
 
+@lru_cache(maxsize=16)
+def _parse_tools_config(content: str) -> dict[str, Any]:
+    """解析配置内容中的 tools 部分.
+
+    按展开环境变量后的内容缓存，同一进程内重复加载未变化的配置时不再解析YAML；
+    文件或环境变量变化后内容不同，自然不会命中旧结果。
+    """
+    data = yaml.safe_load(content) or {}
+    tools_config: dict[str, Any] = data.get("tools", {})
+    return tools_config
+
+
 def find_config_file(start_path: str = ".") -> Optional[Path]:
     """查找配置文件.
 
@@ -177,13 +190,10 @@ class ConfigLoader:
                 # 替换环境变量
                 content = self._expand_env_vars(content)
 
-                # 解析 YAML
-                data = yaml.safe_load(content) or {}
-
-                # 获取 tools 配置部分
-                tools_config = data.get("tools", {})
+                # 解析 YAML 并获取 tools 配置部分
+                tools_config = _parse_tools_config(content)
 
-                # 创建配置对象
+                # 每次创建新的配置对象，调用方修改它不会影响缓存
                 return ToolConfig(**tools_config)
 
         except yaml.YAMLError:
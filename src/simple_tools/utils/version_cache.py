@@ -0,0 +1,167 @@
+"""文件版本分析的磁盘缓存.
+
+以 (路径, 大小, 修改时间) 判断文件是否变化，跨运行复用文件预览和AI分析结果，
+重复分析同一目录时无需重新读取文件或请求AI。缓存会保存文件内容预览，
+因此默认不启用，需通过 AIConfig.version_cache 开启。
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+import logfire
+
+# 表结构变化时递增，旧版本的缓存表直接丢弃重建
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+DROP TABLE IF EXISTS previews;
+DROP TABLE IF EXISTS ai_results;
+CREATE TABLE previews (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    preview TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE ai_results (
+    group_key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+_TABLES = ("previews", "ai_results")
+
+
+class VersionCache:
+    """基于SQLite的版本分析缓存.
+
+    数据库在首次使用时才打开；任何数据库错误都只记录警告并按未命中处理，
+    不影响分析本身。超过有效期的记录视为未命中，打开和关闭数据库时清理过期记录，
+    并且每张表只保留最近写入的 max_entries 条。
+    """
+
+    DEFAULT_MAX_AGE = 7 * 24 * 3600
+    DEFAULT_MAX_ENTRIES = 5000
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        """初始化缓存.
+
+        Args:
+            db_path: 数据库文件路径，默认为 ~/.simple-tools/version_cache.db
+            max_age: 记录有效期（秒）
+            max_entries: 每张表最多保留的记录数
+
+        """
+        self.db_path = db_path or Path.home() / ".simple-tools" / "version_cache.db"
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """打开数据库连接（自动提交模式），失败后不再重试."""
+        if self._conn is None and not self._disabled:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, isolation_level=None)
+                if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                    conn.executescript(_SCHEMA)
+                    conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                self._conn = conn
+                self._prune()
+            except (OSError, sqlite3.Error) as e:
+                logfire.warning(f"版本缓存不可用: {e}")
+                self._disabled = True
+        return self._conn
+
+    def _cutoff(self) -> float:
+        """有效记录的最早写入时间."""
+        return time.time() - self.max_age
+
+    def _prune(self) -> None:
+        """删除过期记录，并只保留每张表最近写入的 max_entries 条."""
+        if self._conn is None:
+            return
+        cutoff = self._cutoff()
+        try:
+            for table in _TABLES:
+                self._conn.execute(f"DELETE FROM {table} WHERE created < ?", (cutoff,))
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE rowid NOT IN "
+                    f"(SELECT rowid FROM {table} ORDER BY created DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            logfire.warning(f"版本缓存清理失败: {e}")
+
+    def _execute(self, sql: str, params: tuple[Any, ...]) -> Optional[Any]:
+        """执行单条语句并返回第一行结果，出错时返回None."""
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            return conn.execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            logfire.warning(f"版本缓存读写失败: {e}")
+            return None
+
+    def get_preview(self, path: Path, size: int, mtime: float) -> Optional[str]:
+        """获取未变化文件的缓存预览."""
+        row = self._execute(
+            "SELECT preview FROM previews "
+            "WHERE path = ? AND size = ? AND mtime = ? AND created >= ?",
+            (str(path), size, mtime, self._cutoff()),
+        )
+        return row[0] if row else None
+
+    def set_preview(self, path: Path, size: int, mtime: float, preview: str) -> None:
+        """缓存文件预览."""
+        self._execute(
+            "INSERT OR REPLACE INTO previews VALUES (?, ?, ?, ?, ?)",
+            (str(path), size, mtime, preview, time.time()),
+        )
+
+    @staticmethod
+    def group_key(entries: Iterable[tuple[Path, int, float]], salt: str = "") -> str:
+        """根据一组文件的 (路径, 大小, 修改时间) 生成缓存键，与顺序无关."""
+        digest = hashlib.blake2b(salt.encode(), digest_size=16)
+        for path, size, mtime in sorted((str(p), s, m) for p, s, m in entries):
+            digest.update(f"\0{path}\0{size}\0{mtime!r}".encode())
+        return digest.hexdigest()
+
+    def get_ai_result(self, group_key: str) -> Optional[dict[str, Any]]:
+        """获取一组文件的缓存AI分析结果."""
+        row = self._execute(
+            "SELECT result FROM ai_results WHERE group_key = ? AND created >= ?",
+            (group_key, self._cutoff()),
+        )
+        if not row:
+            return None
+        try:
+            result = json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        return result if isinstance(result, dict) else None
+
+    def set_ai_result(self, group_key: str, result: dict[str, Any]) -> None:
+        """缓存一组文件的AI分析结果."""
+        self._execute(
+            "INSERT OR REPLACE INTO ai_results VALUES (?, ?, ?)",
+            (group_key, json.dumps(result, ensure_ascii=False), time.time()),
+        )
+
+    def close(self) -> None:
+        """清理过期和超出上限的记录后关闭数据库连接."""
+        if self._conn is not None:
+            self._prune()
+            self._conn.close()
+            self._conn = None
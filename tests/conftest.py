@@ -23,6 +23,7 @@ def configure_test_environment() -> Generator[None, None, None]:
         service_name=service_name,
         send_to_logfire=send_to_logfire,
         console=False,
+        inspect_arguments=False,
     )
 
     yield
@@ -1,7 +1,10 @@
 """智能文件分类器单元测试."""
 
+import asyncio
 import json
-from datetime import datetime
+import os
+import threading
+import time
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
@@ -25,7 +28,7 @@ class TestFileInfo:
             extension=".txt",
             size=1024,
             size_human="",
-            modified_time=datetime.now(),
+            modified_time=time.time(),
             mime_type="text/plain",
             content_preview="Hello world",
         )
@@ -40,11 +43,16 @@ class TestFileInfo:
         """测试文件大小格式化."""
         # 测试不同大小
         test_cases = [
+            (0, "0.0 B"),
             (100, "100.0 B"),
+            (1023, "1023.0 B"),
             (1024, "1.0 KB"),
+            (1536, "1.5 KB"),
+            (1024 * 1024 - 1, "1024.0 KB"),
             (1024 * 1024, "1.0 MB"),
             (1024 * 1024 * 1024, "1.0 GB"),
             (1024 * 1024 * 1024 * 1024, "1.0 TB"),
+            (1024**5, "1024.0 TB"),
         ]
 
         for size, expected in test_cases:
@@ -54,7 +62,7 @@ class TestFileInfo:
                 extension="",
                 size=size,
                 size_human="",
-                modified_time=datetime.now(),
+                modified_time=time.time(),
             )
             assert info.size_human == expected
 
@@ -88,6 +96,7 @@ class TestFileClassifier:
         assert info.name == "test.txt"
         assert info.extension == ".txt"
         assert info.size == len("Hello, this is a test file.")
+        assert info.modified_time == test_file.stat().st_mtime
         assert info.content_preview == "Hello, this is a test file."
 
     def test_extract_file_info_binary(
@@ -105,6 +114,28 @@ class TestFileClassifier:
         assert info.extension == ".jpg"
         assert info.content_preview is None  # 二进制文件无内容预览
 
+    def test_extract_file_info_from_dir_entry(
+        self, classifier: FileClassifier, tmp_path: Path
+    ) -> None:
+        """测试从os.scandir目录项提取文件信息."""
+        test_file = tmp_path / "notes.MD"
+        test_file.write_text("# Notes")
+        archive = tmp_path / "backup.tar.gz"
+        archive.write_bytes(b"\x1f\x8b")
+
+        entries = {entry.name: entry for entry in os.scandir(tmp_path)}
+        info = classifier.extract_file_info(entries["notes.MD"])
+
+        assert info.path == test_file
+        assert info.extension == ".md"
+        assert info.size == len("# Notes")
+        assert info.mime_type == "text/markdown"
+        assert info.content_preview == "# Notes"
+
+        # 压缩后缀仍按完整文件名识别
+        archive_info = classifier.extract_file_info(entries["backup.tar.gz"])
+        assert archive_info.mime_type == "application/x-tar"
+
     def test_extract_content_preview(
         self, classifier: FileClassifier, tmp_path: Path
     ) -> None:
@@ -120,6 +151,21 @@ class TestFileClassifier:
         assert len(preview) == 503  # 500 + "..."
         assert preview.endswith("...")
 
+    def test_extract_content_preview_whitespace(
+        self, classifier: FileClassifier, tmp_path: Path
+    ) -> None:
+        """测试内容预览合并空白并保留多字节字符."""
+        test_file = tmp_path / "notes.txt"
+        test_file.write_text("  第一行\r\n\n\t第二行   end  \n", encoding="utf-8")
+
+        assert classifier._extract_content_preview(test_file) == "第一行 第二行 end"
+
+        # 多字节文本同样按字符数截断
+        long_file = tmp_path / "long_cn.txt"
+        long_file.write_text("中" * 600, encoding="utf-8")
+        preview = classifier._extract_content_preview(long_file)
+        assert preview == "中" * 500 + "..."
+
     @pytest.mark.asyncio
     async def test_classify_file_success(
         self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
@@ -172,6 +218,51 @@ class TestFileClassifier:
         # 验证只调用了一次AI
         assert mock_client.simple_chat.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_classify_file_extension_cache(
+        self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
+    ) -> None:
+        """测试扩展名分类稳定后不再读取文件和调用AI."""
+        mock_client.simple_chat.return_value = json.dumps(
+            {"category": "系统文件", "confidence": 95, "reason": "日志"}
+        )
+
+        for i in range(classifier.EXT_CACHE_MIN_HITS):
+            log_file = tmp_path / f"app{i}.log"
+            log_file.write_text("x" * (i + 1))  # 大小不同，避免命中大小缓存
+            result = await classifier.classify_file(log_file)
+            assert not result.cached
+
+        extract_spy = MagicMock(wraps=classifier.extract_file_info)
+        classifier.extract_file_info = extract_spy  # type: ignore[method-assign]
+
+        new_log = tmp_path / "new.LOG"
+        new_log.write_text("y" * 100)
+        result = await classifier.classify_file(new_log)
+
+        assert result.cached
+        assert result.category == "系统文件"
+        extract_spy.assert_not_called()
+        assert mock_client.simple_chat.call_count == classifier.EXT_CACHE_MIN_HITS
+
+    @pytest.mark.asyncio
+    async def test_classify_file_extension_ambiguous(
+        self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
+    ) -> None:
+        """测试同一扩展名出现不同分类时不按扩展名短路."""
+        mock_client.simple_chat.side_effect = [
+            json.dumps({"category": "工作文档", "confidence": 90, "reason": "A"}),
+            json.dumps({"category": "个人文件", "confidence": 90, "reason": "B"}),
+        ] + [json.dumps({"category": "工作文档", "confidence": 90, "reason": "A"})] * 4
+
+        for i in range(6):
+            doc = tmp_path / f"doc{i}.txt"
+            doc.write_text("z" * (i + 1))
+            result = await classifier.classify_file(doc)
+            assert not result.cached
+
+        assert mock_client.simple_chat.call_count == 6
+
     @pytest.mark.asyncio
     async def test_classify_file_parse_error(
         self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
@@ -210,6 +301,21 @@ class TestFileClassifier:
         assert result.category == "个人文件"
         assert result.confidence == 75
 
+    def test_parse_classification_response_nested(
+        self, classifier: FileClassifier
+    ) -> None:
+        """测试从说明文字中提取嵌套JSON."""
+        response = (
+            "说明{不是JSON}，结果如下："
+            '{"category": "项目代码", "confidence": 88, '
+            '"reason": "源代码", "meta": {"lang": "python"}} 以上'
+        )
+
+        result = classifier._parse_classification_response(response)
+
+        assert result["category"] == "项目代码"
+        assert result["meta"] == {"lang": "python"}
+
     @pytest.mark.asyncio
     async def test_classify_batch(
         self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
@@ -235,7 +341,11 @@ class TestFileClassifier:
             {"category": "其他", "confidence": 60, "reason": "无法确定"},
         ]
 
-        mock_client.simple_chat.side_effect = [json.dumps(r) for r in responses]
+        # 批量响应乱序返回，应按index对齐
+        batch_response = [{"index": i, **r} for i, r in enumerate(responses)]
+        mock_client.simple_chat.return_value = json.dumps(
+            list(reversed(batch_response)), ensure_ascii=False
+        )
 
         # 执行批量分类
         result = await classifier.classify_batch(files, max_concurrent=3)
@@ -245,11 +355,145 @@ class TestFileClassifier:
         assert result.failed == 0
         assert len(result.results) == 5
 
+        # 所有文件通过一次请求完成分类
+        assert mock_client.simple_chat.call_count == 1
+
         # 验证分类结果
         for i, classification in enumerate(result.results):
+            assert classification.file_path == files[i]
             assert classification.category == responses[i]["category"]
             assert classification.confidence == responses[i]["confidence"]
 
+    @pytest.mark.asyncio
+    async def test_classify_batch_chunks(
+        self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
+    ) -> None:
+        """测试批量分类按chunk_size分组请求."""
+        classifier._category_cache.clear()
+
+        files = []
+        for i in range(5):
+            file = tmp_path / f"file{i}.txt"
+            file.write_text("x" * (i + 1))
+            files.append(file)
+
+        def respond(prompt: str) -> str:
+            count = prompt.count('"filename"')
+            if count == 0:  # 单文件分类
+                return json.dumps(
+                    {"category": "文档", "confidence": 60, "reason": "OK"}
+                )
+            return json.dumps(
+                [
+                    {"index": i, "category": "文档", "confidence": 60, "reason": "OK"}
+                    for i in range(count)
+                ]
+            )
+
+        mock_client.simple_chat.side_effect = respond
+
+        result = await classifier.classify_batch(files, chunk_size=2)
+
+        # 2 + 2 + 1，最后一个文件走单文件分类
+        assert mock_client.simple_chat.call_count == 3
+        assert result.success == 5
+        assert [r.file_path for r in result.results] == files
+
+    @pytest.mark.asyncio
+    async def test_classify_batch_fallback(
+        self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
+    ) -> None:
+        """测试批量响应无法解析时回退为逐个分类."""
+        classifier._category_cache.clear()
+
+        files = []
+        for i in range(2):
+            file = tmp_path / f"file{i}.txt"
+            file.write_text("y" * (i + 1))
+            files.append(file)
+
+        mock_client.simple_chat.side_effect = [
+            "这不是有效的JSON",
+            json.dumps({"category": "文档", "confidence": 70, "reason": "OK"}),
+            json.dumps({"category": "其他", "confidence": 50, "reason": "OK"}),
+        ]
+
+        result = await classifier.classify_batch(files)
+
+        assert mock_client.simple_chat.call_count == 3
+        assert result.success == 2
+        assert [r.category for r in result.results] == ["文档", "其他"]
+
+    @pytest.mark.asyncio
+    async def test_classify_batch_malformed_item(
+        self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
+    ) -> None:
+        """测试批量响应中单个结果格式错误时只影响该文件."""
+        classifier._category_cache.clear()
+
+        files = []
+        for i in range(3):
+            file = tmp_path / f"item{i}.txt"
+            file.write_text("m" * (i + 1))
+            files.append(file)
+
+        batch_response = [
+            {"index": 0, "category": "文档", "confidence": "85", "reason": "OK"},
+            {"index": 1, "category": "图片", "confidence": 90.5, "reason": "OK"},
+            {"index": 2, "category": "代码", "confidence": "很高", "reason": "OK"},
+        ]
+        mock_client.simple_chat.side_effect = [
+            json.dumps(batch_response, ensure_ascii=False),
+            json.dumps({"category": "代码", "confidence": 75, "reason": "重试"}),
+        ]
+
+        result = await classifier.classify_batch(files)
+
+        assert result.success == 3
+        assert [r.confidence for r in result.results] == [85, 90, 75]
+        assert result.results[2].reason == "重试"
+        assert mock_client.simple_chat.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_classify_batch_reads_off_loop(
+        self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
+    ) -> None:
+        """测试文件读取在线程池中进行，信号量只限制API请求."""
+        classifier._category_cache.clear()
+
+        files = []
+        for i in range(4):
+            file = tmp_path / f"file{i}.txt"
+            file.write_text("z" * (i + 1))
+            files.append(file)
+
+        main_thread = threading.get_ident()
+        extract_threads: list[int] = []
+        original_extract = classifier.extract_file_info
+
+        def extract(file_path: Path) -> FileInfo:
+            extract_threads.append(threading.get_ident())
+            return original_extract(file_path)
+
+        classifier.extract_file_info = extract  # type: ignore[method-assign]
+
+        extracted_during_call: list[int] = []
+
+        async def respond(prompt: str) -> str:
+            await asyncio.sleep(0.05)
+            extracted_during_call.append(len(extract_threads))
+            return json.dumps({"category": "文档", "confidence": 60, "reason": "OK"})
+
+        mock_client.simple_chat.side_effect = respond
+
+        result = await classifier.classify_batch(files, max_concurrent=1, chunk_size=1)
+
+        assert result.success == 4
+        assert len(extract_threads) == 4
+        assert main_thread not in extract_threads
+        # 第一个请求进行时，其余文件的读取不必等待信号量
+        assert extracted_during_call[0] == 4
+
     @pytest.mark.asyncio
     async def test_classify_batch_with_errors(
         self, classifier: FileClassifier, mock_client: MagicMock, tmp_path: Path
@@ -272,8 +516,8 @@ class TestFileClassifier:
             json.dumps({"category": "其他", "confidence": 80, "reason": "OK"}),
         ]
 
-        # 执行批量分类
-        result = await classifier.classify_batch(files)
+        # 执行批量分类（每组一个文件，逐个请求）
+        result = await classifier.classify_batch(files, chunk_size=1)
 
         assert result.total == 3
         assert result.success == 2
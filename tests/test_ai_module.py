@@ -1,8 +1,10 @@
 """AI模块单元测试"""
 
+import asyncio
 import os
-from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+import time
+from datetime import datetime
+from unittest.mock import ANY, MagicMock, patch
 
 import httpx
 import pytest
@@ -14,8 +16,9 @@ from simple_tools.ai.deepseek_client import (
     CostTracker,
     DeepSeekMessage,
     DeepSeekResponse,
+    RateLimiter,
 )
-from simple_tools.ai.prompts import PromptManager
+from simple_tools.ai.prompts import PromptManager, PromptTemplate
 from simple_tools.utils.errors import ToolError
 
 
@@ -66,6 +69,38 @@ class TestPromptManager:
         assert "test.txt" in formatted
         assert ".txt" in formatted
 
+    def test_preparsed_template_matches_str_format(self) -> None:
+        """测试预拆分模板与str.format结果一致"""
+        template = PromptTemplate('{{\n  "name": "{name}"\n}} 共{count}项')
+        assert template._parts is not None
+        assert template.format(name="a", count=3, extra="x") == (
+            template.template.format(name="a", count=3, extra="x")
+        )
+        with pytest.raises(KeyError):
+            template.format(name="a")
+
+        # 含格式说明的模板回退到str.format
+        spec_template = PromptTemplate("{value:.2f}")
+        assert spec_template._parts is None
+        assert spec_template.format(value=1.5) == "1.50"
+
+    def test_format_partial(self) -> None:
+        """测试预先填入固定参数的格式化函数"""
+        kwargs = {
+            "title": "报告{草稿}",
+            "doc_type": "text",
+            "word_count": 100,
+            "content": "内容包含花括号 {} 和 }{",
+        }
+        formatter = PromptManager.format_partial("document_summarize", length=200)
+        assert formatter(**kwargs) == PromptManager.format(
+            "document_summarize", length=200, **kwargs
+        )
+
+        # 复杂模板回退为普通的参数绑定
+        spec_template = PromptTemplate("{name}: {value:.1f}")
+        assert spec_template.partial(value=2)(name="x") == "x: 2.0"
+
     def test_unknown_template(self) -> None:
         """测试获取不存在的模板"""
         with pytest.raises(ValueError):
@@ -96,6 +131,46 @@ class TestAICache:
         assert cached is not None
         assert cached.content == "response"
 
+    def test_cache_returns_copies(self) -> None:
+        """测试修改存入或取出的响应不会影响缓存内容"""
+        cache = AICache(ttl=3600)
+        messages = [DeepSeekMessage(role="user", content="test")]
+        response = DeepSeekResponse(content="response", usage={"total_tokens": 3})
+        cache.set(messages, response)
+
+        response.content = "changed"
+        first = cache.get(messages)
+        assert first is not None
+        first.content = "changed"
+        first.usage["total_tokens"] = 0
+
+        second = cache.get(messages)
+        assert second is not None
+        assert second is not first
+        assert second.content == "response"
+        assert second.usage == {"total_tokens": 3}
+
+    def test_generate_key(self) -> None:
+        """测试缓存键的稳定性与区分度"""
+        cache = AICache()
+        messages = [DeepSeekMessage(role="user", content="test")]
+
+        key = cache._generate_key(messages, model="deepseek-chat", temperature=0.7)
+        assert key == cache._generate_key(
+            messages, temperature=0.7, model="deepseek-chat"
+        )
+        assert key != cache._generate_key(
+            messages, model="deepseek-chat", temperature=0.5
+        )
+        assert cache._generate_key(
+            [DeepSeekMessage(role="user", content="a\0user\0b")]
+        ) != cache._generate_key(
+            [
+                DeepSeekMessage(role="user", content="a"),
+                DeepSeekMessage(role="user", content="b"),
+            ]
+        )
+
     def test_cache_expiration(self) -> None:
         """测试缓存过期"""
         cache = AICache(ttl=1)  # 1秒过期
@@ -106,10 +181,30 @@ class TestAICache:
         cache.set(messages, response)
 
         # 模拟时间流逝
-        with patch("simple_tools.ai.deepseek_client.datetime") as mock_datetime:
-            mock_datetime.now.return_value = datetime.now() + timedelta(seconds=2)
+        expired_at = time.monotonic() + 2
+        with patch("simple_tools.ai.deepseek_client.time.monotonic") as mock_now:
+            mock_now.return_value = expired_at
             cached = cache.get(messages)
             assert cached is None
+        assert len(cache.cache) == 0
+
+    def test_cache_lru_eviction(self) -> None:
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = AICache(ttl=3600, maxsize=2)
+        first = [DeepSeekMessage(role="user", content="first")]
+        second = [DeepSeekMessage(role="user", content="second")]
+        third = [DeepSeekMessage(role="user", content="third")]
+
+        cache.set(first, DeepSeekResponse(content="1"))
+        cache.set(second, DeepSeekResponse(content="2"))
+        # 访问first使其成为最近使用
+        assert cache.get(first) is not None
+        cache.set(third, DeepSeekResponse(content="3"))
+
+        assert len(cache.cache) == 2
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+        assert cache.get(third) is not None
 
 
 class TestCostTracker:
@@ -126,6 +221,26 @@ class TestCostTracker:
         assert usage["completion_tokens"] == 50
         assert usage["requests"] == 1
 
+    def test_track_day_rollover(self) -> None:
+        """测试跨天后使用量记入新的日期"""
+        tracker = CostTracker()
+        tracker.track("deepseek-chat", prompt_tokens=100, completion_tokens=50)
+        tracker.track("unknown-model", prompt_tokens=1000, completion_tokens=0)
+
+        today = datetime.now().date().isoformat()
+        assert tracker.usage[today]["requests"] == 2
+        assert tracker.usage[today]["total_cost"] == pytest.approx(0.0012)
+
+        # 模拟到达第二天零点
+        tracker._day_rollover = 0.0
+        tracker._day_key = ""
+        with patch("simple_tools.ai.deepseek_client.date") as mock_date:
+            mock_date.today.return_value = datetime(2030, 1, 2).date()
+            tracker.track("deepseek-chat", prompt_tokens=10, completion_tokens=0)
+
+        assert tracker.usage["2030-01-02"]["requests"] == 1
+        assert tracker.usage[today]["requests"] == 2
+
     def test_check_limit(self) -> None:
         """测试限额检查"""
         tracker = CostTracker()
@@ -141,6 +256,26 @@ class TestCostTracker:
         assert exc_info.value.error_code == "AI_QUOTA_EXCEEDED"
 
 
+class TestRateLimiter:
+    """令牌桶限速器测试"""
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_when_empty(self) -> None:
+        """测试令牌用完后等待补充"""
+        limiter = RateLimiter(2, time_period=0.1)
+
+        start = time.monotonic()
+        async with limiter:
+            pass
+        async with limiter:
+            pass
+        assert time.monotonic() - start < 0.04
+
+        # 第三个请求需要等待约一个令牌的补充时间（0.05秒）
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.04
+
+
 class TestDeepSeekClient:
     """DeepSeek客户端测试"""
 
@@ -184,6 +319,57 @@ class TestDeepSeekClient:
         assert response.content == "Hello!"
         assert response.usage["total_tokens"] == 15
 
+    @patch("httpx.AsyncClient.post")
+    @pytest.mark.asyncio
+    async def test_http_client_reused(self, mock_post: MagicMock) -> None:
+        """测试多次调用复用同一个HTTP客户端"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": "Hello!"}, "finish_reason": "stop"}],
+        }
+        mock_post.return_value = mock_response
+
+        client = DeepSeekClient(AIConfig(api_key="test-key"))
+        messages = [DeepSeekMessage(role="user", content="Hi")]
+
+        await client.chat_completion(messages, use_cache=False)
+        http_client = client._get_http_client()
+        await client.chat_completion(messages, use_cache=False)
+
+        assert client._get_http_client() is http_client
+        mock_post.assert_called_with("/chat/completions", json=ANY)
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["messages"] == [{"role": "user", "content": "Hi"}]
+
+        await client.aclose()
+        assert http_client.is_closed
+        assert client._http_clients == {}
+
+    def test_http_client_per_event_loop(self) -> None:
+        """测试切换事件循环时保留旧循环的客户端，循环关闭后才丢弃"""
+        client = DeepSeekClient(AIConfig(api_key="test-key"))
+
+        async def get_http_client() -> httpx.AsyncClient:
+            return client._get_http_client()
+
+        sync_loop = asyncio.new_event_loop()
+        try:
+            sync_client = sync_loop.run_until_complete(get_http_client())
+            run_client = asyncio.run(get_http_client())
+
+            # 另一个循环的客户端没有被替换，回到原循环时继续复用
+            assert run_client is not sync_client
+            assert not sync_client.is_closed
+            assert sync_loop.run_until_complete(get_http_client()) is sync_client
+            # asyncio.run 的循环已关闭，其客户端被丢弃
+            assert list(client._http_clients.values()) == [sync_client]
+
+            sync_loop.run_until_complete(client.aclose())
+            assert sync_client.is_closed
+            assert client._http_clients == {}
+        finally:
+            sync_loop.close()
+
     @patch("httpx.AsyncClient.post")
     @pytest.mark.asyncio
     async def test_api_error_handling(self, mock_post: MagicMock) -> None:
@@ -1,12 +1,27 @@
 """批量重命名功能测试模块."""
 
+import os
 import tempfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
 from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
-from simple_tools.core.batch_rename import BatchRename, rename_cmd
+from simple_tools.core.batch_rename import (
+    BatchRename,
+    RenameConfig,
+    RenameItem,
+    _compile_glob,
+    _sort_paths,
+    _split_ext,
+    _try_rename_noreplace,
+    rename_cmd,
+)
+from simple_tools.utils.errors import ToolError
 
 
 class TestBatchRename:
@@ -265,6 +280,334 @@ class TestBatchRename:
             assert (temp_path / "renamed2.txt").exists()
             assert not (temp_path / "test2.txt").exists()
 
+    def test_non_recursive_collects_only_files(self) -> None:
+        """测试非递归收集只返回当前目录下匹配的文件."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            (temp_path / "a.txt").write_text("a")
+            (temp_path / "b.py").write_text("b")
+            (temp_path / "sub.txt").mkdir()
+            (temp_path / "sub.txt" / "c.txt").write_text("c")
+            renamer = BatchRename()
+
+            config = RenameConfig(file_filter="*.txt")
+            assert renamer._get_files(str(temp_path), config) == [temp_path / "a.txt"]
+
+            # 排除模式在收集时生效，递归和非递归一致
+            (temp_path / "a_old.txt").write_text("old")
+            config = RenameConfig(file_filter="*.txt", exclude_pattern="_old")
+            assert renamer._get_files(str(temp_path), config) == [temp_path / "a.txt"]
+            config.recursive = True
+            assert renamer._get_files(str(temp_path), config) == [
+                temp_path / "a.txt",
+                temp_path / "sub.txt" / "c.txt",
+            ]
+
+            # 位于排除目录中的目录不收集任何文件
+            build_dir = temp_path / "build"
+            build_dir.mkdir()
+            (build_dir / "d.txt").write_text("d")
+            assert renamer._get_files(str(build_dir), config) == []
+
+    def test_recursive_collect_depth_and_excluded_dirs(self) -> None:
+        """测试递归收集遵守最大深度并跳过排除目录和目录符号链接."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            (temp_path / "a" / "b").mkdir(parents=True)
+            (temp_path / "node_modules" / "pkg").mkdir(parents=True)
+            (temp_path / "top.txt").write_text("1")
+            (temp_path / "a" / "mid.txt").write_text("2")
+            (temp_path / "a" / "b" / "deep.txt").write_text("3")
+            (temp_path / "node_modules" / "pkg" / "index.txt").write_text("4")
+            (temp_path / "link").symlink_to(temp_path / "a")
+            renamer = BatchRename()
+
+            config = RenameConfig(recursive=True, max_depth=2)
+            assert renamer._get_files(str(temp_path), config) == [
+                temp_path / "a" / "mid.txt",
+                temp_path / "top.txt",
+            ]
+            config.max_depth = 10
+            assert renamer._get_files(str(temp_path), config) == [
+                temp_path / "a" / "b" / "deep.txt",
+                temp_path / "a" / "mid.txt",
+                temp_path / "top.txt",
+            ]
+
+    def test_compile_glob_cached(self) -> None:
+        """测试通配符模式编译结果被缓存."""
+        pattern = _compile_glob("*.txt")
+        assert pattern is _compile_glob("*.txt")
+        assert pattern.match("notes.txt")
+        assert not pattern.match("notes.txt.bak")
+
+    def test_text_mode_empty_pattern(self) -> None:
+        """测试文本模式未指定搜索文本时只添加前缀，指定替换文本则报错."""
+        renamer = BatchRename()
+        files = [Path("a.txt")]
+
+        config = RenameConfig(prefix="new_", case_sensitive=False)
+        plan = renamer._generate_rename_plan(files, config)
+        assert [item.new_name for item in plan] == ["new_a.txt"]
+
+        config = RenameConfig(replacement="x")
+        with pytest.raises(ToolError):
+            renamer._generate_rename_plan(files, config)
+
+    def test_prefix_and_suffix(self) -> None:
+        """测试前缀和后缀只在非number模式下添加."""
+        renamer = BatchRename()
+        files = [Path("a.txt")]
+
+        config = RenameConfig(pattern="a", replacement="b", prefix="p_", suffix="_s")
+        plan = renamer._generate_rename_plan(files, config)
+        assert [item.new_name for item in plan] == ["p_b_s.txt"]
+
+        config = RenameConfig(mode="number", prefix="doc", suffix="_s")
+        plan = renamer._generate_rename_plan(files, config)
+        assert [item.new_name for item in plan] == ["doc001.txt"]
+
+    def test_plan_rejects_names_with_separator(self) -> None:
+        """测试新文件名包含路径分隔符时不加入重命名计划."""
+        renamer = BatchRename()
+        files = [Path("dir/a_b.txt"), Path("dir/c.txt")]
+
+        config = RenameConfig(mode="regex", pattern="_", replacement="/")
+        assert renamer._generate_rename_plan(files, config) == []
+
+        config = RenameConfig(mode="regex", pattern="c", replacement="d")
+        plan = renamer._generate_rename_plan(files, config)
+        assert [item.new_path for item in plan] == [Path("dir/d.txt")]
+
+    def test_sort_paths_matches_path_order(self) -> None:
+        """测试文件排序与 Path 比较顺序一致."""
+        files = [
+            Path("d/a-b.txt"),
+            Path("d/a/b.txt"),
+            Path("d/B.txt"),
+            Path("d/a.txt"),
+            Path("d/a/a/z.txt"),
+        ]
+        expected = sorted(files)
+        _sort_paths(files)
+        assert files == expected
+
+    def test_case_insensitive_replace_is_literal(self) -> None:
+        """测试忽略大小写替换按字面文本处理搜索和替换内容."""
+        renamer = BatchRename()
+        files = [Path("Copy(1)_COPY(1).txt"), Path("other.txt")]
+
+        config = RenameConfig(
+            pattern="copy(1)", replacement=r"v\1", case_sensitive=False
+        )
+        plan = renamer._generate_rename_plan(files, config)
+        assert [item.new_name for item in plan] == [r"v\1_v\1.txt"]
+
+    def test_regex_mode_errors(self) -> None:
+        """测试无效的正则表达式或分组引用报错."""
+        renamer = BatchRename()
+        files = [Path("a1.txt"), Path("b2.txt")]
+
+        with pytest.raises(ToolError):
+            renamer._generate_rename_plan(
+                files, RenameConfig(mode="regex", pattern="(")
+            )
+        config = RenameConfig(mode="regex", pattern=r"\d", replacement=r"\2")
+        with pytest.raises(ToolError):
+            renamer._generate_rename_plan(files, config)
+
+        config = RenameConfig(mode="regex", pattern=r"(\d)", replacement=r"_\1")
+        plan = renamer._generate_rename_plan(files, config)
+        assert [item.new_name for item in plan] == ["a_1.txt", "b_2.txt"]
+
+    def test_camel_and_snake_case(self) -> None:
+        """测试驼峰和蛇形命名转换."""
+        renamer = BatchRename()
+        assert renamer._to_camel_case("My file-name_x") == "myFileNameX"
+        assert renamer._to_snake_case("My File-name") == "my_file_name"
+
+    def test_backup_rename_checks_target(self) -> None:
+        """测试备份模式下先检查目标，已存在时跳过且不留下备份."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            (temp_path / "a1.txt").write_text("1")
+            (temp_path / "a2.txt").write_text("2")
+            (temp_path / "b1.txt").write_text("existing")
+            renamer = BatchRename()
+            result = renamer.rename_files(
+                temp_path,
+                mode="text",
+                pattern="a",
+                replacement="b",
+                create_backup=True,
+                interactive=False,
+            )
+            assert result.successful_renames == 1
+            assert result.skipped_files == 1
+            assert (temp_path / "b1.txt").read_text() == "existing"
+            assert (temp_path / "b2.txt").read_text() == "2"
+            assert (temp_path / "a2.txt.bak").exists()
+            assert not (temp_path / "a1.txt.bak").exists()
+
+    def test_split_ext_matches_splitext(self) -> None:
+        """测试文件名拆分与 os.path.splitext 一致."""
+        names = ["a.txt", "a.tar.gz", ".bashrc", "..a", "a.", "a..b", "abc", "..."]
+        for name in names:
+            assert _split_ext(name) == os.path.splitext(name)
+
+    def test_rename_noreplace_keeps_existing_target(self) -> None:
+        """测试不覆盖的重命名不会替换已存在的目标文件."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            source = temp_path / "a.txt"
+            target = temp_path / "b.txt"
+            source.write_text("a")
+            target.write_text("b")
+
+            assert not _try_rename_noreplace(source, target)
+            assert source.read_text() == "a"
+            assert target.read_text() == "b"
+
+            if _try_rename_noreplace(source, temp_path / "c.txt"):
+                assert not source.exists()
+                assert (temp_path / "c.txt").read_text() == "a"
+
+    def test_parallel_chained_renames_match_serial(self) -> None:
+        """测试链式重命名（目标是另一项的源文件）并发执行时结果与逐个执行一致."""
+
+        class ReversedExecutor:
+            """按提交的相反顺序执行任务，模拟线程调度的乱序."""
+
+            def __init__(self) -> None:
+                self.tasks: list[tuple[Future[Any], Callable[[], Any]]] = []
+
+            def __enter__(self) -> "ReversedExecutor":
+                return self
+
+            def __exit__(self, *args: object) -> None:
+                pass
+
+            def submit(self, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+                future: Future[Any] = Future()
+                self.tasks.append((future, lambda: fn(*args)))
+                return future
+
+        executors: list[ReversedExecutor] = []
+
+        def make_executor() -> ReversedExecutor:
+            executors.append(ReversedExecutor())
+            return executors[-1]
+
+        def run_reversed(futures: Any) -> Iterator[Future[Any]]:
+            for future, task in reversed(executors[-1].tasks):
+                future.set_result(task())
+                yield future
+
+        def run(parallel: bool) -> tuple[Any, ...]:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_path = Path(temp_dir)
+                for i in range(2, 42):
+                    (temp_path / f"img{i:03d}.jpg").write_text(str(i))
+                (temp_path / "aaa.jpg").write_text("a")
+
+                result = BatchRename().rename_files(
+                    temp_path,
+                    mode="number",
+                    pattern="img",
+                    start_number=3,
+                    interactive=False,
+                    parallel=parallel,
+                )
+                contents = {p.name: p.read_text() for p in temp_path.iterdir()}
+                return (
+                    result.successful_renames,
+                    result.failed_renames,
+                    result.skipped_files,
+                    sorted(contents.items()),
+                )
+
+        serial = run(parallel=False)
+        assert serial[:3] == (2, 0, 39)
+        with (
+            patch("simple_tools.core.batch_rename.ThreadPoolExecutor", make_executor),
+            patch("simple_tools.core.batch_rename.as_completed", run_reversed),
+        ):
+            assert run(parallel=True) == serial
+        assert executors
+
+    def test_group_by_target_keeps_chains_together(self) -> None:
+        """测试链式重命名的项分在同一组并保持计划顺序."""
+        plan = [
+            RenameItem(Path("d/a"), Path("d/b"), "a", "b"),
+            RenameItem(Path("d/x"), Path("d/y"), "x", "y"),
+            RenameItem(Path("d/b"), Path("d/c"), "b", "c"),
+            RenameItem(Path("d/C"), Path("d/e"), "C", "e"),
+        ]
+        groups = BatchRename()._group_by_target(plan)
+        assert groups == [[plan[0], plan[2], plan[3]], [plan[1]]]
+
+    def test_parallel_rename_can_be_disabled(self) -> None:
+        """测试关闭并发后即使文件很多也按顺序重命名."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            count = BatchRename.PARALLEL_MIN_ITEMS + 1
+            for i in range(count):
+                (temp_path / f"img_{i:03d}.jpg").write_text(str(i))
+
+            with patch(
+                "simple_tools.core.batch_rename.ThreadPoolExecutor"
+            ) as mock_executor:
+                result = BatchRename().rename_files(
+                    temp_path,
+                    mode="text",
+                    pattern="img",
+                    replacement="photo",
+                    interactive=False,
+                    parallel=False,
+                )
+            mock_executor.assert_not_called()
+            assert result.successful_renames == count
+            assert (temp_path / "photo_000.jpg").exists()
+
+    def test_invalid_case_mode_generates_no_plan(self) -> None:
+        """测试无效的大小写模式不生成重命名计划."""
+        renamer = BatchRename()
+        files = [Path("a.txt"), Path("b.txt")]
+
+        config = RenameConfig(mode="case", case_mode="unknown")
+        assert renamer._generate_rename_plan(files, config) == []
+
+        config = RenameConfig(mode="case", case_mode="upper")
+        plan = renamer._generate_rename_plan(files, config)
+        assert [item.new_name for item in plan] == ["A.txt", "B.txt"]
+
+    def test_parallel_rename(self) -> None:
+        """测试大量文件并发重命名，目标相同的文件不会互相覆盖."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            count = BatchRename.PARALLEL_MIN_ITEMS + 8
+            for i in range(count):
+                (temp_path / f"img_{i:03d}.jpg").write_text(str(i))
+            # 两个文件去掉数字后都会变成 dup.jpg
+            (temp_path / "dup1.jpg").write_text("first")
+            (temp_path / "dup2.jpg").write_text("second")
+
+            renamer = BatchRename()
+            result = renamer.rename_files(
+                temp_path,
+                mode="regex",
+                pattern=r"^img_(\d+)$|^(dup)\d$",
+                replacement=r"\1\2",
+                interactive=False,
+            )
+            assert result.total_files == count + 2
+            assert result.successful_renames == count + 1
+            assert result.skipped_files == 1
+            assert (temp_path / "005.jpg").read_text() == "5"
+            assert (temp_path / "dup.jpg").read_text() == "first"
+            assert (temp_path / "dup2.jpg").read_text() == "second"
+            assert len(list(temp_path.iterdir())) == count + 2
+
 
 class TestCLICommand:
     """CLI命令测试."""
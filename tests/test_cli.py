@@ -0,0 +1,39 @@
+"""CLI主模块的测试."""
+
+import subprocess
+import sys
+
+import click
+from click.testing import CliRunner
+
+from simple_tools.cli import LAZY_COMMANDS, cli
+
+
+def test_import_cli_does_not_import_subcommands() -> None:
+    """测试导入CLI时不导入子命令模块."""
+    code = (
+        "import sys, simple_tools.cli;"
+        "print(any(m.startswith('simple_tools.core') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_lazy_commands_listed_and_loaded() -> None:
+    """测试延迟导入的命令出现在列表中并能正常执行."""
+    runner = CliRunner()
+    ctx = click.Context(cli)
+    assert set(cli.list_commands(ctx)) == {*LAZY_COMMANDS, "history"}
+
+    result = runner.invoke(cli, ["list", "--help"])
+    assert result.exit_code == 0
+    assert "list" in cli.commands
+
+
+def test_unknown_command_fails() -> None:
+    """测试未知命令给出错误."""
+    result = CliRunner().invoke(cli, ["no-such-command"])
+    assert result.exit_code != 0
+    assert "未知命令" in result.output
@@ -1,5 +1,6 @@
 # tests/test_config_loader.py
 """配置文件加载功能的测试."""
+
 import tempfile
 from pathlib import Path
 from typing import Any
@@ -10,6 +11,7 @@ import yaml
 from simple_tools.utils.config_loader import (
     ConfigLoader,
     ToolConfig,
+    _parse_tools_config,
     find_config_file,
     merge_configs,
 )
@@ -178,6 +180,37 @@ tools:
 
             assert config.duplicates.min_size == 2048
 
+    def test_parsed_config_cached_by_content(
+        self, tmp_path: Path, monkeypatch: Any
+    ) -> None:
+        """测试同一配置内容只解析一次，返回的配置对象互不影响."""
+        config_path = tmp_path / ".simple-tools.yml"
+        config_path.write_text("tools:\n  format: json\n  list:\n    long: true\n")
+
+        calls = []
+        real_safe_load = yaml.safe_load
+
+        def counting_safe_load(content: str) -> Any:
+            calls.append(content)
+            return real_safe_load(content)
+
+        monkeypatch.setattr(yaml, "safe_load", counting_safe_load)
+        _parse_tools_config.cache_clear()
+        loader = ConfigLoader()
+
+        first = loader.load_config(str(config_path))
+        first.verbose = True
+        first.list.long = False
+        second = loader.load_config(str(config_path))
+        assert len(calls) == 1
+        assert second.verbose is False
+        assert second.list.long is True
+
+        # 内容变化后重新解析
+        config_path.write_text("tools:\n  format: csv\n")
+        assert loader.load_config(str(config_path)).format == "csv"
+        assert len(calls) == 2
+
     def test_config_precedence(self) -> None:
         """测试配置优先级：命令行 > 当前目录 > 用户目录."""
         with tempfile.TemporaryDirectory() as tmpdir:
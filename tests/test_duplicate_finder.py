@@ -103,6 +103,20 @@ class TestDuplicateFinder:
         # 验证结果
         assert len(duplicates) == 0
 
+    def test_scan_records_file_stats(self, temp_dir: Path) -> None:
+        """测试扫描时记录文件状态，目录和过小的文件不记录."""
+        (temp_dir / "file1.txt").write_text("Content")
+        (temp_dir / "empty.txt").write_text("")
+        (temp_dir / "subdir").mkdir()
+
+        finder = DuplicateFinder(DuplicateConfig(path=str(temp_dir)))
+        files = finder._scan_files()
+
+        assert [f.path.name for f in files] == ["file1.txt"]
+        assert finder.file_stats == {
+            temp_dir / "file1.txt": (temp_dir / "file1.txt").stat()
+        }
+
     def test_find_duplicates_empty_directory(self, temp_dir: Path) -> None:
         """测试空目录。."""
         config = DuplicateConfig(path=str(temp_dir))
@@ -239,6 +253,80 @@ class TestDuplicateFinder:
         assert hash1 == hash2
         assert len(hash1) == 32  # MD5哈希长度
 
+    def test_compare_same_size_files(self, temp_dir: Path) -> None:
+        """测试逐块比较：内容相同的分到一组，组哈希与完整哈希一致."""
+        chunk = DuplicateFinder.COMPARE_CHUNK_SIZE
+        contents = {
+            "a.bin": b"x" * chunk * 2 + b"tail",
+            "b.bin": b"x" * chunk * 2 + b"tail",
+            "c.bin": b"x" * chunk * 2 + b"TAIL",  # 最后一块才不同
+            "d.bin": b"y" + b"x" * (chunk * 2 + 3),  # 第一块就不同
+            "e.bin": b"y" + b"x" * (chunk * 2 + 3),
+        }
+        for name, data in contents.items():
+            (temp_dir / name).write_bytes(data)
+
+        finder = DuplicateFinder(DuplicateConfig(path=str(temp_dir)))
+        files = [
+            FileInfo(path=temp_dir / name, size=len(data))
+            for name, data in contents.items()
+        ]
+        groups = finder._compare_same_size_files(files)
+
+        assert sorted(
+            sorted(f.path.name for f in group) for group in groups.values()
+        ) == [["a.bin", "b.bin"], ["d.bin", "e.bin"]]
+        for file_hash, group in groups.items():
+            assert file_hash == finder._calculate_file_hash(group[0].path)
+            assert all(f.hash == file_hash for f in group)
+
+    def test_large_size_group_falls_back_to_hashing(
+        self, temp_dir: Path, monkeypatch: Any
+    ) -> None:
+        """测试文件数超过阈值的大小组仍按哈希分组."""
+        monkeypatch.setattr(DuplicateFinder, "COMPARE_MAX_FILES", 2)
+        for i in range(3):
+            (temp_dir / f"file{i}.txt").write_text("same")
+        (temp_dir / "pair1.txt").write_text("pair content")
+        (temp_dir / "pair2.txt").write_text("pair content")
+
+        duplicates = DuplicateFinder(
+            DuplicateConfig(path=str(temp_dir))
+        ).find_duplicates()
+        assert sorted(group.count for group in duplicates) == [2, 3]
+
+    def test_prehash_filters_before_full_hash(
+        self, temp_dir: Path, monkeypatch: Any
+    ) -> None:
+        """测试首尾块预哈希先筛掉不同的文件，再由完整哈希确认."""
+        monkeypatch.setattr(DuplicateFinder, "COMPARE_MAX_FILES", 1)
+        monkeypatch.setattr(DuplicateFinder, "PREHASH_BLOCK_SIZE", 4)
+        contents = {
+            "a.bin": b"head-middle-tail",
+            "b.bin": b"head-middle-tail",
+            "c.bin": b"head-MIDDLE-tail",  # 只有中间不同
+            "d.bin": b"HEAD-middle-tail",
+            "small1.bin": b"1234",
+            "small2.bin": b"5678",
+        }
+        for name, data in contents.items():
+            (temp_dir / name).write_bytes(data)
+
+        finder = DuplicateFinder(DuplicateConfig(path=str(temp_dir)))
+        size_groups: dict[int, list[FileInfo]] = {}
+        for name, data in contents.items():
+            size_groups.setdefault(len(data), []).append(
+                FileInfo(path=temp_dir / name, size=len(data))
+            )
+        filtered = finder._filter_by_prehash(size_groups)
+        assert sorted(f.path.name for f in filtered[16]) == ["a.bin", "b.bin", "c.bin"]
+        assert len(filtered[4]) == 2  # 小文件不做预哈希
+
+        duplicates = finder.find_duplicates()
+        assert [sorted(f.name for f in group.files) for group in duplicates] == [
+            ["a.bin", "b.bin"]
+        ]
+
     def test_potential_save_calculation(self, temp_dir: Path) -> None:
         """测试可节省空间计算。."""
         # 创建3个相同的1KB文件
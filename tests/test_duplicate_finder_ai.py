@@ -1,5 +1,6 @@
 """测试duplicate_finder的AI功能和错误处理."""
 
+import asyncio
 import json
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -127,6 +128,8 @@ class TestDuplicateFinderAI:
         # 模拟AI配置
         ai_config = MagicMock(spec=AIConfig)
         ai_config.enabled = True
+        ai_config.version_cache = False
+        ai_config.version_cache = False
 
         # 模拟VersionAnalyzer
         with patch(
@@ -143,10 +146,14 @@ class TestDuplicateFinderAI:
 
             # 模拟format_analysis_result
             mock_analyzer.format_analysis_result.return_value = "AI分析结果文本"
+            mock_analyzer.ai_client.aclose = AsyncMock()
 
             # 执行测试
             result = await _perform_ai_analysis(duplicate_groups, ai_config)
 
+            # 分析结束后应关闭AI客户端连接池
+            mock_analyzer.ai_client.aclose.assert_awaited_once()
+
             # 验证结果
             assert "abc123" in result
             assert result["abc123"] == "AI分析结果文本"
@@ -170,6 +177,7 @@ class TestDuplicateFinderAI:
 
         ai_config = MagicMock(spec=AIConfig)
         ai_config.enabled = True
+        ai_config.version_cache = False
 
         # 模拟VersionAnalyzer抛出异常
         with patch(
@@ -178,6 +186,7 @@ class TestDuplicateFinderAI:
             mock_analyzer = MagicMock()
             mock_analyzer_class.return_value = mock_analyzer
             mock_analyzer.analyze_with_ai = AsyncMock(side_effect=Exception("AI error"))
+            mock_analyzer.ai_client.aclose = AsyncMock()
 
             # 执行测试
             result = await _perform_ai_analysis(duplicate_groups, ai_config)
@@ -185,6 +194,94 @@ class TestDuplicateFinderAI:
             # 验证结果为空（错误被捕获）
             assert result == {}
 
+    @pytest.mark.asyncio
+    async def test_perform_ai_analysis_concurrent(self) -> None:
+        """测试各组并发分析，并发数受限且结果按分组对应."""
+        duplicate_groups = [
+            DuplicateGroup(
+                hash=f"hash{i}",
+                size=1024,
+                count=2,
+                files=[Path(f"a{i}.txt"), Path(f"b{i}.txt")],
+                potential_save=1024,
+            )
+            for i in range(6)
+        ]
+        running = 0
+        peak = 0
+
+        async def analyze(files: list[Path], stats: object = None) -> MagicMock:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if files[0].name == "a3.txt":
+                raise Exception("AI error")
+            analysis = MagicMock()
+            analysis.recommended_keep = files[0]
+            analysis.confidence = 0.8
+            return analysis
+
+        with patch(
+            "simple_tools.core.duplicate_finder.VersionAnalyzer"
+        ) as mock_analyzer_class:
+            mock_analyzer = mock_analyzer_class.return_value
+            mock_analyzer.analyze_with_ai = AsyncMock(side_effect=analyze)
+            mock_analyzer.format_analysis_result.side_effect = (
+                lambda analysis: f"keep {analysis.recommended_keep.name}"
+            )
+            mock_analyzer.ai_client.aclose = AsyncMock()
+
+            result = await _perform_ai_analysis(
+                duplicate_groups, AIConfig(), max_concurrent=2
+            )
+
+        assert peak == 2
+        assert "hash3" not in result
+        assert result["hash5"] == "keep a5.txt"
+        assert result["hash0_data"]["recommended_keep"] == Path("a0.txt")
+
+    @pytest.mark.asyncio
+    async def test_perform_ai_analysis_version_cache_opt_in(self) -> None:
+        """测试磁盘缓存默认关闭，开启后即使分析被中断也会关闭缓存和客户端."""
+        duplicate_groups = [
+            DuplicateGroup(
+                hash="abc123",
+                size=1024,
+                count=2,
+                files=[Path("file1.txt"), Path("file2.txt")],
+                potential_save=1024,
+            )
+        ]
+
+        with (
+            patch(
+                "simple_tools.core.duplicate_finder.VersionAnalyzer"
+            ) as mock_analyzer_class,
+            patch(
+                "simple_tools.core.duplicate_finder.VersionCache"
+            ) as mock_cache_class,
+        ):
+            mock_analyzer = mock_analyzer_class.return_value
+            mock_analyzer.analyze_with_ai = AsyncMock(
+                side_effect=asyncio.CancelledError
+            )
+            mock_analyzer.ai_client.aclose = AsyncMock()
+
+            with pytest.raises(asyncio.CancelledError):
+                await _perform_ai_analysis(duplicate_groups, AIConfig())
+            mock_cache_class.assert_not_called()
+            assert mock_analyzer_class.call_args.kwargs["cache"] is None
+            mock_analyzer.ai_client.aclose.assert_awaited_once()
+
+            ai_config = AIConfig(version_cache=True, version_cache_ttl=60)
+            with pytest.raises(asyncio.CancelledError):
+                await _perform_ai_analysis(duplicate_groups, ai_config)
+            mock_cache_class.assert_called_once_with(max_age=60)
+            mock_cache_class.return_value.close.assert_called_once()
+            assert mock_analyzer.ai_client.aclose.await_count == 2
+
     def test_duplicates_cmd_with_ai_analyze(
         self, runner: CliRunner, tmp_path: Path
     ) -> None:
@@ -1,7 +1,11 @@
 """文件整理工具测试."""
 
+import asyncio
 from pathlib import Path
 from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 from simple_tools.core.file_organizer import (
     FileCategory,
@@ -160,3 +164,23 @@ class TestFileOrganizerTool:
         assert config.mode == "date"
         assert config.recursive is True
         assert config.dry_run is False
+
+    @pytest.mark.asyncio
+    async def test_ai_plan_closes_client_on_error(self, tmp_path: Path) -> None:
+        """测试AI整理计划中途中断时仍会关闭AI客户端连接池."""
+        (tmp_path / "a.txt").write_text("a")
+        organizer = FileOrganizerTool(OrganizeConfig(path=str(tmp_path)))
+        organizer.ai_classifier = MagicMock()
+        organizer.ai_classifier.client.aclose = AsyncMock()
+
+        with (
+            patch.object(
+                organizer,
+                "classify_file_with_ai",
+                AsyncMock(side_effect=asyncio.CancelledError),
+            ),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await organizer._create_ai_organize_plan([tmp_path / "a.txt"])
+
+        organizer.ai_classifier.client.aclose.assert_awaited_once()
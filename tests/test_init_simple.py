@@ -91,3 +91,58 @@ def test_init_normal_mode() -> None:
 
     finally:
         sys.argv = original_argv
+
+
+def test_is_formatted_output(monkeypatch: Any) -> None:
+    """测试格式化输出模式判断"""
+    from simple_tools import _is_formatted_output
+
+    monkeypatch.delenv("LOGFIRE_CONSOLE", raising=False)
+    assert _is_formatted_output(["tools", "list", "--format", "json"])
+    assert _is_formatted_output(["tools", "--format", "csv"])
+    assert not _is_formatted_output(["tools", "list", "--format", "plain"])
+    assert not _is_formatted_output(["tools", "list", "--format"])
+    assert not _is_formatted_output(["tools"])
+
+    monkeypatch.setenv("LOGFIRE_CONSOLE", "false")
+    assert _is_formatted_output(["tools"])
+
+
+def test_ensure_logfire_configured_once(monkeypatch: Any) -> None:
+    """测试Logfire只在首次调用时配置"""
+    from unittest.mock import patch
+
+    import simple_tools
+
+    monkeypatch.setattr(simple_tools, "_logfire_configured", False)
+    monkeypatch.setattr(sys, "argv", ["tools", "list", "--format", "json"])
+
+    with patch("logfire.configure") as mock_configure:
+        simple_tools._ensure_logfire_configured()
+        simple_tools._ensure_logfire_configured()
+
+    mock_configure.assert_called_once()
+    assert mock_configure.call_args.kwargs["console"] is False
+
+
+def test_library_use_without_config_does_not_warn() -> None:
+    """测试未配置Logfire时以库方式调用不提示警告（由pyproject中的ignore_no_config关闭）"""
+    import subprocess
+    from pathlib import Path
+
+    root = Path(__file__).resolve().parent.parent
+    code = (
+        "import warnings; warnings.simplefilter('error');"
+        "from simple_tools.ai.summarizer import DocumentSummarizer;"
+        "DocumentSummarizer(client=object())"
+    )
+    env = {**os.environ, "PYTHONPATH": str(root / "src")}
+    env.pop("LOGFIRE_IGNORE_NO_CONFIG", None)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
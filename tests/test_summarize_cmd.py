@@ -258,6 +258,16 @@ class TestSummarizeCommand:
             assert "批量生成 3 个文档的摘要" in result.output
             assert "成功: 2 个文件" in result.output
             assert "失败: 1 个文件" in result.output
+            # 默认只同时进行3个请求
+            call = mock_summarizer.summarize_batch.call_args
+            assert call.kwargs["max_concurrent"] == 3
+
+            result = runner.invoke(
+                cli, ["summarize", str(tmp_path), "--batch", "--concurrency", "8"]
+            )
+            assert result.exit_code == 0
+            call = mock_summarizer.summarize_batch.call_args
+            assert call.kwargs["max_concurrent"] == 8
 
     @patch("simple_tools.core.summarize_cmd.asyncio.run")
     @patch("simple_tools.core.summarize_cmd.DocumentSummarizer")
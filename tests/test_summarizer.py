@@ -1,7 +1,9 @@
 """文档摘要功能测试."""
 
+import asyncio
+import threading
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from pydantic import SecretStr
@@ -9,12 +11,48 @@ from pydantic import SecretStr
 from simple_tools.ai.config import AIConfig
 from simple_tools.ai.deepseek_client import DeepSeekClient
 from simple_tools.ai.summarizer import (
+    DocumentInfo,
     DocumentSummarizer,
     SummaryResult,
 )
 from simple_tools.utils.errors import ToolError
 
 
+def _write_text_pdf(path: Path, page_texts: list[str]) -> None:
+    """生成每页包含一行文本的最小PDF文件."""
+    count = len(page_texts)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(data))
+
+
 class TestDocumentSummarizer:
     """文档摘要器测试类."""
 
@@ -81,6 +119,63 @@ class TestDocumentSummarizer:
         assert doc_info.word_count > 0
         assert "测试标题" in doc_info.content
 
+    def test_extract_text_prefix_and_encoding(
+        self, tmp_path: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试大文本只解码开头部分，并保持编码回退和换行处理."""
+        summarizer = DocumentSummarizer(client=mock_deepseek_client)
+
+        # 读取的字节数截在多字节字符中间时不应误判为非UTF-8
+        big_file = tmp_path / "big.txt"
+        big_file.write_bytes(("é中" * 30000).encode("utf-8"))
+        content = summarizer._extract_text_content(big_file)
+        assert content.startswith("é中é中")
+        assert len(content) > summarizer.MAX_CONTENT_LENGTH
+
+        gbk_file = tmp_path / "gbk.txt"
+        gbk_file.write_bytes("中文内容\r\n第二行".encode("gbk"))
+        assert summarizer._extract_text_content(gbk_file) == "中文内容\n第二行"
+
+        empty_file = tmp_path / "empty.txt"
+        empty_file.touch()
+        assert summarizer._extract_text_content(empty_file) == ""
+
+    def test_extract_pdf_stops_after_limit(
+        self, tmp_path: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试PDF提取超过最大长度后不再解析后续页面."""
+        pdf_file = tmp_path / "big.pdf"
+        pdf_file.touch()
+
+        page_text = "a" * 4000
+        pages = [MagicMock() for _ in range(10)]
+        for page in pages:
+            page.extract_text.return_value = page_text
+
+        summarizer = DocumentSummarizer(client=mock_deepseek_client)
+        with patch("simple_tools.ai.summarizer.PdfReader") as mock_reader:
+            mock_reader.return_value.pages = pages
+            doc_info = summarizer.extract_document_content(pdf_file)
+
+        # 3页即超过10000字符，其余页面不会被提取
+        assert sum(page.extract_text.called for page in pages) == 3
+        assert doc_info.content.endswith("...(内容已截断)")
+        assert doc_info.content.startswith(page_text + "\n")
+
+    def test_extract_pdf_many_pages(
+        self, tmp_path: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试页数较多的真实PDF按页面顺序提取，并在超过最大长度后停止."""
+        pdf_file = tmp_path / "many_pages.pdf"
+        _write_text_pdf(pdf_file, [f"{i:04d}" + "b" * 996 for i in range(40)])
+
+        summarizer = DocumentSummarizer(client=mock_deepseek_client)
+        content = summarizer._extract_pdf_content(pdf_file)
+
+        texts = content.split("\n")
+        assert [text[:4] for text in texts] == [f"{i:04d}" for i in range(len(texts))]
+        assert 10 <= len(texts) < 40
+
     def test_file_not_found(self) -> None:
         """测试文件不存在的情况."""
         summarizer = DocumentSummarizer()
@@ -118,6 +213,10 @@ class TestDocumentSummarizer:
         mixed_text = "这是 English 测试"
         assert summarizer._count_words(mixed_text) == 5  # 2中文 + 1英文 + 2中文
 
+        # 标点和下划线作为分隔符，非ASCII字母数字计入单词
+        punct_text = "snake_case, café-2025！中文"
+        assert summarizer._count_words(punct_text) == 6  # 4个单词 + 2中文
+
     @pytest.mark.asyncio
     async def test_summarize_document_success(
         self, test_text_file: Path, mock_deepseek_client: MagicMock
@@ -139,6 +238,26 @@ class TestDocumentSummarizer:
         # 验证调用了AI客户端
         mock_deepseek_client.simple_chat.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_summarize_extracts_off_loop(
+        self, test_text_file: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试文档内容在线程池中提取，不阻塞事件循环."""
+        summarizer = DocumentSummarizer(client=mock_deepseek_client)
+        original_extract = summarizer.extract_document_content
+        extract_threads: list[int] = []
+
+        def extract(file_path: Path) -> DocumentInfo:
+            extract_threads.append(threading.get_ident())
+            return original_extract(file_path)
+
+        summarizer.extract_document_content = extract  # type: ignore[method-assign]
+        result = await summarizer.summarize_document(test_text_file)
+
+        assert not result.error
+        assert extract_threads
+        assert threading.get_ident() not in extract_threads
+
     @pytest.mark.asyncio
     async def test_summarize_with_cache(
         self, test_text_file: Path, mock_deepseek_client: MagicMock
@@ -163,6 +282,60 @@ class TestDocumentSummarizer:
         # 不应该再次调用AI
         assert mock_deepseek_client.simple_chat.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_summary_cache_invalidated_and_bounded(
+        self, tmp_path: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试文件内容变化后缓存失效，且缓存条目数有上限."""
+        summarizer = DocumentSummarizer(client=mock_deepseek_client, cache_maxsize=2)
+        doc = tmp_path / "doc.txt"
+
+        doc.write_text("第一版内容", encoding="utf-8")
+        await summarizer.summarize_document(doc)
+        doc.write_text("第二版内容", encoding="utf-8")
+        result = await summarizer.summarize_document(doc)
+        assert not result.cached
+        assert mock_deepseek_client.simple_chat.call_count == 2
+
+        doc.write_text("第三版内容", encoding="utf-8")
+        await summarizer.summarize_document(doc)
+        assert len(summarizer._summary_cache) == 2
+
+        # 最早的版本已被淘汰
+        doc.write_text("第一版内容", encoding="utf-8")
+        result = await summarizer.summarize_document(doc)
+        assert not result.cached
+        assert mock_deepseek_client.simple_chat.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_summarize_retries_on_rate_limit(
+        self, test_text_file: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试遇到频率限制时退避重试."""
+        mock_deepseek_client.simple_chat.side_effect = [
+            ToolError("API调用频率超限，请稍后重试", "AI_RATE_LIMIT"),
+            "重试后的摘要",
+        ]
+        summarizer = DocumentSummarizer(client=mock_deepseek_client)
+
+        with patch(
+            "simple_tools.ai.summarizer.asyncio.sleep", new=AsyncMock()
+        ) as mock_sleep:
+            result = await summarizer.summarize_document(test_text_file)
+
+        assert result.summary == "重试后的摘要"
+        assert mock_deepseek_client.simple_chat.call_count == 2
+        mock_sleep.assert_awaited_once()
+
+        # 其他错误不重试
+        mock_deepseek_client.simple_chat.reset_mock()
+        mock_deepseek_client.simple_chat.side_effect = ToolError(
+            "认证失败", "AI_AUTH_FAILED"
+        )
+        result = await summarizer.summarize_document(test_text_file, use_cache=False)
+        assert result.error
+        assert mock_deepseek_client.simple_chat.call_count == 1
+
     @pytest.mark.asyncio
     async def test_summarize_batch(
         self, tmp_path: Path, mock_deepseek_client: MagicMock
@@ -185,6 +358,93 @@ class TestDocumentSummarizer:
         assert batch_result.failed == 0
         assert len(batch_result.results) == 3
 
+    @pytest.mark.asyncio
+    async def test_summarize_batch_keeps_input_order(
+        self, tmp_path: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试批量结果按输入顺序返回，与完成顺序无关."""
+        files = []
+        for i in range(3):
+            file_path = tmp_path / f"doc_{i}.txt"
+            file_path.write_text(f"文档编号{i}", encoding="utf-8")
+            files.append(file_path)
+
+        async def respond(prompt: str) -> str:
+            # 编号越小的文档完成得越晚
+            for i in range(3):
+                if f"文档编号{i}" in prompt:
+                    await asyncio.sleep(0.01 * (3 - i))
+                    return f"摘要{i}"
+            return ""
+
+        mock_deepseek_client.simple_chat.side_effect = respond
+        summarizer = DocumentSummarizer(client=mock_deepseek_client)
+        batch_result = await summarizer.summarize_batch(files)
+
+        assert [r.file_path for r in batch_result.results] == files
+        assert [r.summary for r in batch_result.results] == ["摘要0", "摘要1", "摘要2"]
+
+    @pytest.mark.asyncio
+    async def test_summarize_batch_prefetches_documents(
+        self, tmp_path: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试等待API响应期间，后续文档已在提取."""
+        files = []
+        for i in range(5):
+            file_path = tmp_path / f"doc_{i}.txt"
+            file_path.write_text(f"第{i}篇文档", encoding="utf-8")
+            files.append(file_path)
+
+        summarizer = DocumentSummarizer(client=mock_deepseek_client)
+        original_extract = summarizer.extract_document_content
+        extracted: list[Path] = []
+
+        def extract(file_path: Path) -> DocumentInfo:
+            extracted.append(file_path)
+            return original_extract(file_path)
+
+        summarizer.extract_document_content = extract  # type: ignore[method-assign]
+
+        extracted_during_first_call: list[int] = []
+
+        async def respond(prompt: str) -> str:
+            await asyncio.sleep(0.05)
+            extracted_during_first_call.append(len(extracted))
+            return "摘要"
+
+        mock_deepseek_client.simple_chat.side_effect = respond
+        batch_result = await summarizer.summarize_batch(files, max_concurrent=1)
+
+        assert batch_result.success == 5
+        assert [r.file_path for r in batch_result.results] == files
+        # 只有一个请求并发时，第一个请求返回前已提取了后续文档
+        assert extracted_during_first_call[0] >= 3
+
+    @pytest.mark.asyncio
+    async def test_summarize_batch_dedups_identical_content(
+        self, tmp_path: Path, mock_deepseek_client: MagicMock
+    ) -> None:
+        """测试批量中内容相同的文件只调用一次API."""
+        files = []
+        for name in ("a.txt", "b.txt", "c.md"):
+            file_path = tmp_path / name
+            file_path.write_text("同一份模板内容", encoding="utf-8")
+            files.append(file_path)
+
+        async def respond(prompt: str) -> str:
+            await asyncio.sleep(0.01)
+            return "模板摘要"
+
+        mock_deepseek_client.simple_chat.side_effect = respond
+        summarizer = DocumentSummarizer(client=mock_deepseek_client)
+        batch_result = await summarizer.summarize_batch(files)
+
+        assert batch_result.success == 3
+        assert mock_deepseek_client.simple_chat.call_count == 1
+        assert [r.summary for r in batch_result.results] == ["模板摘要"] * 3
+        assert sum(not r.cached for r in batch_result.results) == 1
+        assert not summarizer._pending_summaries
+
     def test_save_summaries_json(self, tmp_path: Path) -> None:
         """测试保存为JSON格式."""
         results = [
@@ -1,8 +1,14 @@
 """文本替换AI分析器的单元测试."""
 
+import asyncio
+import json
+import threading
+
 import pytest
+from pydantic import SecretStr
 
 from simple_tools.ai.config import AIConfig
+from simple_tools.ai.deepseek_client import DeepSeekResponse
 from simple_tools.ai.text_analyzer import (
     ReplaceAnalysis,
     ReplacePattern,
@@ -165,6 +171,90 @@ class TestTextAnalyzer:
         assert analysis.pattern.old_text == "test"
         assert analysis.pattern.new_text == "prod"
 
+    def test_sync_analysis_reuses_loop(self) -> None:
+        """测试多次同步调用复用同一个事件循环."""
+        analyzer = TextAnalyzer(AIConfig(enabled=False, api_key=SecretStr("test-key")))
+        loops = []
+
+        async def record_loop(*args: object) -> ReplaceAnalysis:
+            loops.append(asyncio.get_running_loop())
+            return analyzer._basic_analysis(ReplacePattern(old_text="a", new_text="b"))
+
+        analyzer.analyze_replace_pattern = record_loop  # type: ignore[method-assign]
+        analyzer.analyze_replace_pattern_sync("a", "b")
+        analyzer.analyze_replace_pattern_sync("a", "b")
+
+        assert len(loops) == 2
+        assert loops[0] is loops[1]
+
+    def test_sync_analysis_concurrent_threads(self) -> None:
+        """测试多个线程同时同步调用时各用自己的事件循环."""
+        analyzer = TextAnalyzer(AIConfig(enabled=False, api_key=SecretStr("test-key")))
+        barrier = threading.Barrier(2)
+        loops: list[asyncio.AbstractEventLoop] = []
+        errors: list[BaseException] = []
+
+        async def wait_for_other(*args: object) -> ReplaceAnalysis:
+            loops.append(asyncio.get_running_loop())
+            # 两个线程的事件循环同时处于运行状态
+            await asyncio.to_thread(barrier.wait, 5)
+            return analyzer._basic_analysis(ReplacePattern(old_text="a", new_text="b"))
+
+        def run() -> None:
+            try:
+                analyzer.analyze_replace_pattern_sync("a", "b")
+            except BaseException as e:
+                errors.append(e)
+
+        analyzer.analyze_replace_pattern = wait_for_other  # type: ignore[method-assign]
+        threads = [threading.Thread(target=run) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(loops) == 2
+        assert loops[0] is not loops[1]
+
+    def test_analyzers_share_client(self) -> None:
+        """测试配置相同的分析器共用一个客户端."""
+        config = AIConfig(enabled=False, api_key=SecretStr("shared-key"))
+        first = TextAnalyzer(config)
+        second = TextAnalyzer(config.model_copy())
+        assert first.client is second.client
+
+        other = TextAnalyzer(AIConfig(enabled=False, api_key=SecretStr("other-key")))
+        assert other.client is not first.client
+
+    def test_parse_analysis_response(self) -> None:
+        """测试解析AI响应时补齐风险默认值并校验."""
+        analyzer = TextAnalyzer(AIConfig(enabled=False, api_key=SecretStr("test-key")))
+        pattern = ReplacePattern(old_text="bug", new_text="issue")
+        content = json.dumps(
+            {
+                "risks": [
+                    {"level": "high", "reason": "子串", "example": "debug"},
+                    {"suggestion": "加边界"},
+                ],
+                "confidence": 0.9,
+            }
+        )
+        response = DeepSeekResponse(content=content, usage={}, model="test")
+
+        analysis = analyzer._parse_analysis_response(pattern, response)
+        assert [r.level for r in analysis.risks] == ["high", "medium"]
+        assert analysis.risks[1].reason == "未知风险"
+        assert analysis.risks[1].suggestion == "加边界"
+        assert analysis.confidence == 0.9
+
+        # 风险字段类型不合法时回退到基础分析
+        bad = DeepSeekResponse(
+            content=json.dumps({"risks": [{"reason": 1}]}), usage={}, model="test"
+        )
+        analysis = analyzer._parse_analysis_response(pattern, bad)
+        assert analysis.confidence == 0.7
+
     @pytest.mark.asyncio
     async def test_async_analysis_no_ai(self) -> None:
         """测试异步分析（AI未启用）."""
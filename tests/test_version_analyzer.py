@@ -1,6 +1,10 @@
 """测试文件版本分析器功能."""
 
+import json
+from dataclasses import FrozenInstanceError
+from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -45,6 +49,51 @@ class TestFileVersion:
         )
         assert backup_version.version_score < v2_version.version_score
 
+    def test_version_score_precomputed(self) -> None:
+        """测试版本评分在构造时计算一次且对象不可修改."""
+        version = FileVersion(
+            path=Path("report_v2.doc"),
+            size=1024,
+            modified_time=1000000000,
+            version_indicator="v2",
+        )
+        assert version.version_score == version._compute_version_score()
+        assert not hasattr(version, "__dict__")
+
+        with pytest.raises(FrozenInstanceError):
+            version.version_indicator = "final"  # type: ignore[misc]
+
+    def test_serialized_fields(self) -> None:
+        """测试分析结果序列化时保留修改时间和版本评分."""
+        version = FileVersion(
+            path=Path("report_v2.doc"),
+            size=1024,
+            modified_time=1000000000,
+            version_indicator="v2",
+        )
+        analysis = VersionAnalysis(
+            files=[version], similarity_score=1.0, has_version_relation=False
+        )
+
+        dumped = analysis.model_dump()["files"][0]
+        assert list(dumped) == [
+            "path",
+            "size",
+            "modified_time",
+            "name_pattern",
+            "version_indicator",
+            "content_preview",
+            "modified_datetime",
+            "version_score",
+        ]
+        assert dumped["modified_datetime"] == datetime.fromtimestamp(1000000000)
+        assert dumped["version_score"] == version.version_score
+
+        loaded = json.loads(analysis.model_dump_json())["files"][0]
+        assert loaded["path"] == "report_v2.doc"
+        assert loaded["modified_datetime"] == version.modified_datetime.isoformat()
+        assert loaded["version_score"] == version.version_score
+
 
 class TestVersionAnalyzer:
     """测试版本分析器."""
@@ -61,6 +110,10 @@ class TestVersionAnalyzer:
         # 测试特殊标识
         assert analyzer._extract_version_indicator("report_final.doc") == "final"
         assert analyzer._extract_version_indicator("backup_data.txt") == "backup"
+        # 多个标识同时出现时按优先级返回，而不是按出现位置
+        assert analyzer._extract_version_indicator("new_final.doc") == "final"
+        assert analyzer._extract_version_indicator("Copy of 最新报告.doc") == "最新"
+        assert analyzer._extract_version_indicator("readme.md") is None
 
     def test_string_similarity(self) -> None:
         """测试字符串相似度计算."""
@@ -77,6 +130,23 @@ class TestVersionAnalyzer:
         similarity = analyzer._string_similarity("abc", "xyz")
         assert similarity < 0.5
 
+    def test_name_similarity_matches_pairwise_average(self) -> None:
+        """测试整组相似度等于两两字符串相似度的平均值."""
+        analyzer = VersionAnalyzer()
+        patterns = ["report.doc", "Report.doc", "", "", "notes.txt", "report.doc"]
+        versions = [
+            FileVersion(path=Path(f"f{i}"), size=1, modified_time=0, name_pattern=p)
+            for i, p in enumerate(patterns)
+        ]
+
+        pairs = [
+            analyzer._string_similarity(a, b)
+            for i, a in enumerate(patterns)
+            for b in patterns[i + 1 :]
+        ]
+        expected = sum(pairs) / len(pairs)
+        assert analyzer._calculate_name_similarity(versions) == pytest.approx(expected)
+
     def test_analyze_file_group_basic(self, tmp_path: Path) -> None:
         """测试基础文件组分析."""
         # 创建测试文件
@@ -95,6 +165,15 @@ class TestVersionAnalyzer:
         assert analysis.has_version_relation
         assert analysis.recommended_keep is not None
 
+    def test_basic_recommendation_picks_first_highest_score(self) -> None:
+        """测试推荐分数最高的文件，并列时取靠前的."""
+        analyzer = VersionAnalyzer()
+        versions = [
+            FileVersion(path=Path(name), size=1, modified_time=0, version_indicator=v)
+            for name, v in [("a_old", "old"), ("b_v2", "v2"), ("c_v2", "v2")]
+        ]
+        assert analyzer._generate_basic_recommendation(versions) == Path("b_v2")
+
     def test_identify_version_relation(self, tmp_path: Path) -> None:
         """测试版本关系识别."""
         # 创建有版本关系的文件
@@ -139,6 +218,21 @@ class TestVersionAnalyzer:
         assert "基础文件: report_final.doc" in formatted
         assert "置信度: 90%" in formatted
 
+    def test_collect_file_info_uses_given_stats(self, tmp_path: Path) -> None:
+        """测试提供文件状态时不再重复stat."""
+        known = tmp_path / "report_v1.txt"
+        known.write_text("v1")
+        other = tmp_path / "report_v2.txt"
+        other.write_text("v2")
+        stats = {known: known.stat()}
+
+        analyzer = VersionAnalyzer()
+        with patch.object(Path, "stat", autospec=True, side_effect=Path.stat) as stat:
+            versions = analyzer._collect_file_info([known, other], stats)
+
+        assert [call.args[0] for call in stat.call_args_list] == [other]
+        assert {v.path for v in versions} == {known, other}
+
     @pytest.mark.asyncio
     async def test_analyze_with_ai_no_client(self, tmp_path: Path) -> None:
         """测试无AI客户端时的分析."""
@@ -156,6 +250,33 @@ class TestVersionAnalyzer:
         assert isinstance(analysis, VersionAnalysis)
         assert analysis.ai_suggestion is None  # 没有AI建议
 
+    @pytest.mark.asyncio
+    async def test_prepare_ai_files_info_previews(self, tmp_path: Path) -> None:
+        """测试并发读取的预览按文件顺序对应."""
+        notes = tmp_path / "notes_v1.txt"
+        notes.write_text("笔记" * 200, encoding="utf-8")
+        image = tmp_path / "photo_v1.png"
+        image.write_bytes(b"\x89PNG")
+        binary = tmp_path / "data_v1.md"
+        binary.write_bytes(b"\xff\xfe\x00")
+        readme = tmp_path / "readme_v2.md"
+        readme.write_text("# 标题", encoding="utf-8")
+
+        analyzer = VersionAnalyzer(AIConfig(enabled=False))
+        versions = analyzer._collect_file_info([notes, image, binary, readme])
+        by_name = {
+            info["name"]: info
+            for info in await analyzer._prepare_ai_files_info(versions)
+        }
+
+        assert by_name["notes_v1.txt"]["preview"] == "笔记" * 100
+        assert "preview" not in by_name["photo_v1.png"]
+        assert "preview" not in by_name["data_v1.md"]
+        assert by_name["readme_v2.md"]["preview"] == "# 标题"
+        assert by_name["readme_v2.md"]["modified"] == (
+            datetime.fromtimestamp(readme.stat().st_mtime).isoformat("T", "seconds")
+        )
+
 
 class TestIntegration:
     """集成测试."""
@@ -1,5 +1,6 @@
 """测试版本分析器的AI功能."""
 
+import os
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -80,6 +81,8 @@ class TestVersionAnalyzerAI:
         # 创建测试文件
         test_file = tmp_path / "test.txt"
         test_file.write_text("这是一个测试文档的内容" * 20)  # 创建较长内容
+        other_file = tmp_path / "other.txt"
+        other_file.write_text("other")
 
         # Mock prompt_manager
         with patch(
@@ -98,7 +101,7 @@ class TestVersionAnalyzerAI:
             mock_ai_client.chat_completion.return_value = ai_response
 
             # 执行分析
-            await analyzer_with_ai.analyze_with_ai([test_file])
+            await analyzer_with_ai.analyze_with_ai([test_file, other_file])
 
             # 验证prompt_manager被调用
             mock_prompt_manager.format.assert_called_once()
@@ -106,9 +109,9 @@ class TestVersionAnalyzerAI:
 
             # 验证文件信息中包含预览
             files_info = call_args.kwargs["files"]
-            assert len(files_info) == 1
-            assert "preview" in files_info[0]
-            assert len(files_info[0]["preview"]) == 200  # 只读取前200个字符
+            assert len(files_info) == 2
+            info = next(f for f in files_info if f["name"] == "test.txt")
+            assert len(info["preview"]) == 200  # 只读取前200个字符
 
     @pytest.mark.asyncio
     async def test_analyze_with_ai_read_error(
@@ -121,6 +124,8 @@ class TestVersionAnalyzerAI:
         # 创建测试文件
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
+        other_file = tmp_path / "other.txt"
+        other_file.write_text("other")
 
         # Mock文件读取失败
         with patch("builtins.open", side_effect=Exception("Read error")):
@@ -139,7 +144,7 @@ class TestVersionAnalyzerAI:
                 mock_ai_client.chat_completion.return_value = ai_response
 
                 # 执行分析
-                result = await analyzer_with_ai.analyze_with_ai([test_file])
+                result = await analyzer_with_ai.analyze_with_ai([test_file, other_file])
 
                 # 验证即使读取失败也能继续分析
                 assert result.recommended_keep.name == "test.txt"
@@ -159,12 +164,14 @@ class TestVersionAnalyzerAI:
         # 创建测试文件
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
+        other_file = tmp_path / "other.txt"
+        other_file.write_text("other")
 
         # 设置AI调用失败
         mock_ai_client.chat_completion.side_effect = Exception("API error")
 
         # 执行分析
-        result = await analyzer_with_ai.analyze_with_ai([test_file])
+        result = await analyzer_with_ai.analyze_with_ai([test_file, other_file])
 
         # 验证返回基础分析结果
         assert result.ai_suggestion is None  # 没有AI建议
@@ -182,6 +189,9 @@ class TestVersionAnalyzerAI:
         # 创建测试文件
         test_file = tmp_path / "test.txt"
         test_file.write_text("content")
+        other_file = tmp_path / "other.txt"
+        other_file.write_text("other")
+        os.utime(other_file, (0, 0))  # 较旧的文件不会被基础推荐选中
 
         # AI响应中没有recommended_file
         mock_ai_client.chat_completion.return_value = {
@@ -189,12 +199,36 @@ class TestVersionAnalyzerAI:
         }
 
         # 执行分析
-        result = await analyzer_with_ai.analyze_with_ai([test_file])
+        result = await analyzer_with_ai.analyze_with_ai([test_file, other_file])
 
         # 验证使用基础推荐
         assert result.recommended_keep.name == "test.txt"  # 使用基础推荐
         assert result.ai_suggestion == "无法确定最佳版本"
 
+    @pytest.mark.asyncio
+    async def test_analyze_with_ai_single_file(
+        self,
+        analyzer_with_ai: VersionAnalyzer,
+        mock_ai_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """测试单个文件直接返回，不请求AI."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+
+        result = await analyzer_with_ai.analyze_with_ai([test_file])
+
+        assert result.recommended_keep == test_file
+        assert result.confidence == 1.0
+        assert result.similarity_score == 0.0
+        assert not result.has_version_relation
+        mock_ai_client.chat_completion.assert_not_called()
+
+        # 文件全部无法访问时同样直接返回
+        empty = await analyzer_with_ai.analyze_with_ai([tmp_path / "missing.txt"])
+        assert empty.files == []
+        assert empty.recommended_keep is None
+
     @pytest.mark.asyncio
     async def test_analyze_with_ai_binary_file(
         self,
@@ -0,0 +1,134 @@
+"""测试版本分析磁盘缓存."""
+
+import os
+import sqlite3
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from simple_tools.ai.config import AIConfig
+from simple_tools.ai.version_analyzer import VersionAnalyzer
+from simple_tools.utils.version_cache import VersionCache
+
+
+class TestVersionCache:
+    """测试VersionCache."""
+
+    def test_preview_keyed_by_size_and_mtime(self, tmp_path: Path) -> None:
+        """测试文件大小或修改时间变化后预览缓存失效."""
+        cache = VersionCache(tmp_path / "cache.db")
+        path = tmp_path / "notes.txt"
+
+        cache.set_preview(path, 10, 100.5, "预览")
+        assert cache.get_preview(path, 10, 100.5) == "预览"
+        assert cache.get_preview(path, 11, 100.5) is None
+        assert cache.get_preview(path, 10, 200.0) is None
+
+        # 重新打开后仍然有效
+        cache.close()
+        assert (
+            VersionCache(tmp_path / "cache.db").get_preview(path, 10, 100.5) == "预览"
+        )
+
+    def test_ai_result_roundtrip(self, tmp_path: Path) -> None:
+        """测试AI结果缓存及与顺序无关的分组键."""
+        cache = VersionCache(tmp_path / "cache.db")
+        entries = [(Path("a.txt"), 1, 1.0), (Path("b.txt"), 2, 2.0)]
+        key = VersionCache.group_key(entries, salt="model")
+
+        assert key == VersionCache.group_key(reversed(entries), salt="model")
+        assert key != VersionCache.group_key(entries, salt="other-model")
+        assert cache.get_ai_result(key) is None
+
+        cache.set_ai_result(key, {"recommended_file": "b.txt", "confidence": 0.9})
+        assert cache.get_ai_result(key) == {
+            "recommended_file": "b.txt",
+            "confidence": 0.9,
+        }
+
+    def test_unavailable_database_is_a_miss(self, tmp_path: Path) -> None:
+        """测试数据库无法打开时按未命中处理."""
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        cache = VersionCache(blocker / "cache.db")
+
+        cache.set_preview(Path("a.txt"), 1, 1.0, "预览")
+        assert cache.get_preview(Path("a.txt"), 1, 1.0) is None
+
+    def test_expired_entries_are_misses(self, tmp_path: Path) -> None:
+        """测试超过有效期的记录按未命中处理，并在重新打开时被清理."""
+        cache = VersionCache(tmp_path / "cache.db", max_age=60)
+        with patch("simple_tools.utils.version_cache.time.time", return_value=1000.0):
+            cache.set_preview(Path("a.txt"), 1, 1.0, "预览")
+            cache.set_ai_result("key", {"confidence": 0.9})
+            assert cache.get_preview(Path("a.txt"), 1, 1.0) == "预览"
+
+        with patch("simple_tools.utils.version_cache.time.time", return_value=1061.0):
+            assert cache.get_preview(Path("a.txt"), 1, 1.0) is None
+            assert cache.get_ai_result("key") is None
+            cache.close()
+
+        conn = sqlite3.connect(tmp_path / "cache.db")
+        assert conn.execute("SELECT COUNT(*) FROM previews").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM ai_results").fetchone()[0] == 0
+        conn.close()
+
+    def test_keeps_most_recent_entries(self, tmp_path: Path) -> None:
+        """测试每张表只保留最近写入的 max_entries 条记录."""
+        with patch("simple_tools.utils.version_cache.time.time") as mock_time:
+            cache = VersionCache(tmp_path / "cache.db", max_entries=2)
+            for i in range(3):
+                mock_time.return_value = 1000.0 + i
+                cache.set_preview(Path(f"{i}.txt"), 1, 1.0, f"预览{i}")
+            cache.close()
+
+            cache = VersionCache(tmp_path / "cache.db", max_entries=2)
+            assert cache.get_preview(Path("0.txt"), 1, 1.0) is None
+            assert cache.get_preview(Path("1.txt"), 1, 1.0) == "预览1"
+            assert cache.get_preview(Path("2.txt"), 1, 1.0) == "预览2"
+
+    def test_rebuilds_old_schema(self, tmp_path: Path) -> None:
+        """测试旧版本的缓存表被丢弃重建."""
+        conn = sqlite3.connect(tmp_path / "cache.db")
+        conn.execute(
+            "CREATE TABLE previews (path TEXT PRIMARY KEY, size INTEGER, "
+            "mtime REAL, preview TEXT)"
+        )
+        conn.execute("INSERT INTO previews VALUES ('a.txt', 1, 1.0, '旧预览')")
+        conn.commit()
+        conn.close()
+
+        cache = VersionCache(tmp_path / "cache.db")
+        assert cache.get_preview(Path("a.txt"), 1, 1.0) is None
+        cache.set_preview(Path("a.txt"), 1, 1.0, "预览")
+        assert cache.get_preview(Path("a.txt"), 1, 1.0) == "预览"
+
+
+@pytest.mark.asyncio
+async def test_analyzer_reuses_cached_ai_result(tmp_path: Path) -> None:
+    """测试文件未变化时第二次分析不再请求AI."""
+    files = []
+    for i in range(2):
+        file_path = tmp_path / f"report_v{i}.txt"
+        file_path.write_text(f"Version {i}")
+        files.append(file_path)
+
+    client = MagicMock()
+    client.chat_completion = AsyncMock(
+        return_value={"analysis": {"recommended_file": "report_v0.txt"}}
+    )
+    analyzer = VersionAnalyzer(
+        AIConfig(enabled=False), cache=VersionCache(tmp_path / "cache.db")
+    )
+    analyzer.ai_client = client
+
+    first = await analyzer.analyze_with_ai(files)
+    second = await analyzer.analyze_with_ai(files)
+    assert first.recommended_keep == second.recommended_keep == files[0]
+    client.chat_completion.assert_called_once()
+
+    # 文件被修改后重新请求AI
+    os.utime(files[1], (0, 12345))
+    await analyzer.analyze_with_ai(files)
+    assert client.chat_completion.call_count == 2